@@ -0,0 +1,310 @@
+"""Headless entry point, run as `python -m app <command>`.
+
+`fetch` runs the same pipeline as the GUI workers on the asyncio FetchEngine
+and fills the same caches, e.g. from cron:
+
+    python -m app fetch --channels channels.txt --subreddits popular python
+
+`serve` exposes those caches read-only over HTTP (see app.server), `search`
+looks them up through the full-text index (see app.logic.search_index), and
+`standin` runs a local fake of the YouTube and Reddit APIs (see app.standin).
+
+Nothing here imports Qt, so it starts quickly and stays small.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from .logic.cache_store import (COMMENTS_CACHE_FILE, REDDIT_CACHE_FILE, YOUTUBE_CACHE_FILE,
+                                YOUTUBE_FOLDER, read_json, read_reddit_cache, reddit_ttl,
+                                store_comments, store_posts, store_videos, write_json, youtube_ttl)
+from .logic.channels import channel_cache_key
+from .logic.env import load_env
+from .logic.fetch_engine import FetchEngine
+from .logic.metrics import METRICS
+from .logic.profiler import OPERATIONS, SamplingProfiler
+
+
+def read_channel_list(path):
+    """Channel URLs from a file, one per line; blank lines and # comments are skipped"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def result(source, target, status, started, entry=None, items_key=None, error=None):
+    """Summary line for one channel or subreddit"""
+    summary = {
+        'source': source,
+        'target': target,
+        'status': status,
+        'seconds': round(time.monotonic() - started, 3)
+    }
+    if entry is not None:
+        summary['items'] = len(entry.get(items_key, []))
+        summary['ttl_seconds'] = entry.get('ttl', {}).get('seconds')
+        summary['ttl_reason'] = entry.get('ttl', {}).get('reason')
+    if error is not None:
+        summary['error'] = error
+    return summary
+
+
+async def fetch_channel(engine, cache, updates, channel_url, args):
+    started = time.monotonic()
+    cache_key = channel_cache_key(channel_url)
+    entry = cache.get(cache_key, {})
+    if entry and not args.force and youtube_ttl().is_fresh(entry):
+        METRICS.count_cache('youtube', 'hit')
+        return result('youtube', channel_url, 'fresh', started, entry, 'videos')
+    METRICS.count_cache('youtube', 'stale' if entry else 'miss')
+
+    try:
+        with OPERATIONS.tag(f"YouTube load channel {channel_url}"):
+            videos = await engine.channel_videos(channel_url, thumbnails=not args.no_thumbnails)
+    except Exception as e:
+        return result('youtube', channel_url, 'failed', started, error=str(e))
+
+    updates[cache_key] = store_videos(cache, cache_key, channel_url, videos)
+    return result('youtube', channel_url, 'refreshed', started, updates[cache_key], 'videos')
+
+
+async def fetch_subreddit(engine, cache, updates, subreddit, args):
+    started = time.monotonic()
+    entry = cache.get(subreddit, {})
+    if 'last_fetch' in entry and not args.force and reddit_ttl().is_fresh(entry):
+        METRICS.count_cache('reddit', 'hit')
+        return result('reddit', subreddit, 'fresh', started, entry, 'last_fetch')
+    METRICS.count_cache('reddit', 'stale' if 'last_fetch' in entry else 'miss')
+
+    try:
+        with OPERATIONS.tag(f"Reddit load r/{subreddit}"):
+            posts = await engine.reddit_listing(subreddit, limit=10)
+    except Exception as e:
+        return result('reddit', subreddit, 'failed', started, error=str(e))
+
+    updates[subreddit] = store_posts(cache, subreddit, posts, 'json_api')
+    return result('reddit', subreddit, 'refreshed', started, updates[subreddit], 'last_fetch')
+
+
+async def fetch_comments(engine, cache, updates, subreddit_entry, count):
+    """Comment threads of a subreddit's top `count` posts, unless already cached
+    since the listing was fetched"""
+    for post in subreddit_entry.get('last_fetch', [])[:count]:
+        if cache.get(post['id'], {}).get('timestamp', 0) >= subreddit_entry.get('timestamp', 0):
+            continue
+        try:
+            with OPERATIONS.tag(f"open post {post['id']}"):
+                details, comments = await engine.reddit_comments(post['id'])
+        except Exception as e:
+            print(f"Error fetching comments for {post['id']}: {e}")
+            continue
+        updates[post['id']] = store_comments(cache, post['id'], details, comments)
+
+
+def merge_into_cache(read, cache_file, updates):
+    """Write refreshed entries, re-reading the file first so entries saved by
+    the GUI in the meantime are kept"""
+    if updates:
+        cache = read(cache_file)
+        cache.update(updates)
+        write_json(cache_file, cache)
+
+
+async def fetch_once(engine, channels, subreddits, args):
+    """One pass over every target, at most `args.concurrency` at a time"""
+    youtube_cache = read_json(YOUTUBE_CACHE_FILE)
+    reddit_cache = read_reddit_cache()
+    youtube_updates, reddit_updates = {}, {}
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def limited(coro):
+        async with limit:
+            return await coro
+
+    jobs = [fetch_channel(engine, youtube_cache, youtube_updates, url, args) for url in channels]
+    jobs += [fetch_subreddit(engine, reddit_cache, reddit_updates, name, args) for name in subreddits]
+    results = []
+    for finished in asyncio.as_completed([limited(job) for job in jobs]):
+        summary = await finished
+        results.append(summary)
+        line = f"[{summary['source']}] {summary['target']}: {summary['status']} ({summary['seconds']:.1f}s)"
+        if 'error' in summary:
+            line += f" - {summary['error']}"
+        elif 'items' in summary:
+            line += f", {summary['items']} items"
+        print(line, flush=True)
+
+    if args.comments:
+        comments_cache = read_json(COMMENTS_CACHE_FILE)
+        comment_updates = {}
+        await asyncio.gather(*[
+            limited(fetch_comments(engine, comments_cache, comment_updates, reddit_cache[name], args.comments))
+            for name in subreddits if name in reddit_cache
+        ])
+        merge_into_cache(read_json, COMMENTS_CACHE_FILE, comment_updates)
+
+    merge_into_cache(read_json, YOUTUBE_CACHE_FILE, youtube_updates)
+    merge_into_cache(read_reddit_cache, REDDIT_CACHE_FILE, reddit_updates)
+    return results
+
+
+def write_summary(path, started_at, results):
+    summary = {
+        'started_at': started_at,
+        'finished_at': time.time(),
+        'counts': {status: sum(1 for r in results if r['status'] == status)
+                   for status in ('refreshed', 'fresh', 'failed')},
+        'results': results
+    }
+    print(f"Done: {summary['counts']['refreshed']} refreshed, {summary['counts']['fresh']} fresh, "
+          f"{summary['counts']['failed']} failed", flush=True)
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+async def run_fetch(args):
+    channels = list(args.channel or [])
+    if args.channels:
+        channels += read_channel_list(args.channels)
+    subreddits = args.subreddits or []
+    if not channels and not subreddits:
+        print("Nothing to fetch: pass --channels/--channel and/or --subreddits")
+        return 2
+
+    load_env()
+    metrics_path = args.metrics or os.getenv('METRICS_FILE')
+    engine = FetchEngine(api_key=os.getenv('YOUTUBE_KEY'), concurrency=args.max_requests,
+                         thumbnail_folder=YOUTUBE_FOLDER)
+    async with engine:
+        while True:
+            started_at = time.time()
+            results = await fetch_once(engine, channels, subreddits, args)
+            write_summary(args.summary, started_at, results)
+            if metrics_path:
+                # Counters keep adding up across passes, like a scrape target
+                METRICS.write(metrics_path)
+            if not args.every:
+                return 1 if any(r['status'] == 'failed' for r in results) else 0
+            await asyncio.sleep(args.every)
+
+
+def fetch_command(args):
+    if not args.profile:
+        return asyncio.run(run_fetch(args))
+    profiler = SamplingProfiler().start()
+    try:
+        return asyncio.run(run_fetch(args))
+    finally:
+        # Also reached on Ctrl+C, which is how --every runs end
+        profiler.stop().write(args.profile)
+        print(f"Wrote {profiler.samples} profile samples to {args.profile}", flush=True)
+
+
+def search_command(args):
+    from .logic.search_index import SEARCH_INDEX
+    if args.reindex:
+        SEARCH_INDEX.index_caches()
+        print(f"{SEARCH_INDEX.count()} items indexed")
+    started = time.perf_counter()
+    videos = SEARCH_INDEX.search_videos(args.query, args.limit)
+    posts = SEARCH_INDEX.search_posts(args.query, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    for video in videos:
+        print(f"[youtube] {video['title']} ({video.get('channel_title', '')}) https://youtu.be/{video['id']}")
+    for post in posts:
+        print(f"[reddit] {post['title']} (r/{post['subreddit']}, {post['score_formatted']} points) "
+              f"https://redd.it/{post['id']}")
+    print(f"{len(videos)} videos, {len(posts)} posts in {elapsed:.1f} ms")
+    return 0 if videos or posts else 1
+
+
+def serve_command(args):
+    from .server import serve
+    serve(args.host, args.port)
+    return 0
+
+
+def standin_command(args):
+    from .standin import Fixtures, standin_environment, start_standin
+    if args.synthetic:
+        fixtures = Fixtures.synthetic(args.channels, args.videos, args.subreddits, args.posts)
+    else:
+        fixtures = Fixtures.from_cache()
+    server = start_standin(fixtures, args.host, args.port, args.latency, args.jitter,
+                           args.error_rate, args.error_status, args.seed)
+    print(f"Stand-in API on {server.base_url}, use:")
+    for name, value in standin_environment(server.base_url).items():
+        print(f"  {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    finally:
+        server.shutdown()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app', description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('fetch', help='Refresh the YouTube and Reddit caches without the GUI')
+    fetch.add_argument('--channels', metavar='FILE', help='File with one channel URL per line')
+    fetch.add_argument('--channel', action='append', metavar='URL', help='Channel URL (repeatable)')
+    fetch.add_argument('--subreddits', nargs='+', metavar='NAME', help='Subreddits to refresh')
+    fetch.add_argument('--concurrency', type=int, default=8,
+                       help='Channels/subreddits fetched at the same time (default 8)')
+    fetch.add_argument('--max-requests', type=int, default=32,
+                       help='Open HTTP requests at the same time (default 32)')
+    fetch.add_argument('--force', action='store_true', help='Refetch even if the cache is still fresh')
+    fetch.add_argument('--no-thumbnails', action='store_true', help='Skip thumbnail downloads')
+    fetch.add_argument('--comments', type=int, default=0, metavar='N',
+                       help='Also cache the comment threads of each subreddit\'s top N posts')
+    fetch.add_argument('--summary', metavar='FILE', help='Write a JSON summary of the run to FILE')
+    fetch.add_argument('--metrics', metavar='FILE',
+                       help='Write timing spans and request/cache counters to FILE after every pass '
+                            '(Prometheus text for .prom/.txt, JSON otherwise; default $METRICS_FILE)')
+    fetch.add_argument('--every', type=float, metavar='SECONDS',
+                       help='Keep running, starting a new pass every SECONDS')
+    fetch.add_argument('--profile', metavar='FILE',
+                       help='Sample all threads while running and write folded stacks '
+                            '(for flamegraph.pl or speedscope) to FILE')
+    fetch.set_defaults(handler=fetch_command)
+
+    serve = commands.add_parser('serve', help='Serve the cached feeds as a read-only JSON API')
+    serve.add_argument('--host', default='127.0.0.1', help='Address to bind (default 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='Port to listen on (default 8765)')
+    serve.set_defaults(handler=serve_command)
+
+    search = commands.add_parser('search', help='Search the cached videos, posts and comments')
+    search.add_argument('query', help='Words to look for; the last one may be a prefix')
+    search.add_argument('--limit', type=int, default=20, help='Results per feed (default 20)')
+    search.add_argument('--reindex', action='store_true',
+                        help='Add everything in the cache files to the index first')
+    search.set_defaults(handler=search_command)
+
+    standin = commands.add_parser('standin', help='Run a local stand-in for the YouTube and Reddit APIs')
+    standin.add_argument('--host', default='127.0.0.1', help='Address to bind (default 127.0.0.1)')
+    standin.add_argument('--port', type=int, default=8766, help='Port to listen on (default 8766)')
+    standin.add_argument('--synthetic', action='store_true',
+                         help='Serve generated data instead of the cached feeds')
+    standin.add_argument('--channels', type=int, default=1, help='Synthetic channels (default 1)')
+    standin.add_argument('--videos', type=int, default=20, help='Videos per synthetic channel (default 20)')
+    standin.add_argument('--subreddits', type=int, default=1, help='Synthetic subreddits (default 1)')
+    standin.add_argument('--posts', type=int, default=10, help='Posts per synthetic subreddit (default 10)')
+    standin.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    standin.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+    standin.add_argument('--error-rate', type=float, default=0.0, help='Share of requests that fail (0-1)')
+    standin.add_argument('--error-status', type=int, default=503, help='Status of injected failures')
+    standin.add_argument('--seed', type=int, default=0, help='Seed for jitter and error injection')
+    standin.set_defaults(handler=standin_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        sys.exit(args.handler(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -0,0 +1,211 @@
+"""On-disk caches of the YouTube and Reddit feeds.
+
+Shared by the Qt workers and the headless CLI, so nothing here imports Qt.
+Everything stored is also added to the full-text search index.
+"""
+import json
+import os
+import time
+from functools import lru_cache
+from .env import load_env
+from .metrics import METRICS
+from .normalize import Post, Video, VideoDetails, list_to_cache
+from .search_index import SEARCH_INDEX
+from .ttl_policy import AdaptiveTTL
+
+YOUTUBE_FOLDER = "youtube_data"
+YOUTUBE_CACHE_FILE = os.path.join(YOUTUBE_FOLDER, "cache.json")
+LAST_VIEWED_FILE = os.path.join(YOUTUBE_FOLDER, "last_viewed.json")
+# One file per video, like the thumbnails next to it
+DETAILS_FOLDER = os.path.join(YOUTUBE_FOLDER, "details")
+
+REDDIT_FOLDER = "reddit_data"
+REDDIT_CACHE_FILE = os.path.join(REDDIT_FOLDER, "cache.json")
+COMMENTS_CACHE_FILE = os.path.join(REDDIT_FOLDER, "comments.json")
+
+# Likes and views move slowly enough to reuse a video's details this long
+DETAILS_MAX_AGE = 24 * 3600
+
+# Posts whose comments are kept; the oldest fetches are dropped first
+MAX_CACHED_COMMENT_THREADS = 200
+
+
+@lru_cache(maxsize=None)
+def youtube_ttl():
+    """Freshness window per channel, learned from how often uploads appear"""
+    load_env()
+    return AdaptiveTTL.from_env('YOUTUBE', default=3600, minimum=900, maximum=7 * 24 * 3600)
+
+
+@lru_cache(maxsize=None)
+def reddit_ttl():
+    """Freshness window per subreddit, learned from how often new posts appear"""
+    load_env()
+    return AdaptiveTTL.from_env('REDDIT', default=600, minimum=120, maximum=6 * 3600)
+
+
+def read_json(path):
+    """Contents of a JSON cache file, or {} if it is missing or unreadable"""
+    if os.path.exists(path):
+        try:
+            with METRICS.span('cache.read'), open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading cache: {e}")
+    return {}
+
+
+def add_to_search_index(add, *args):
+    """Index freshly stored items; a broken index never stops caching"""
+    try:
+        with METRICS.span('search.index'):
+            add(*args)
+    except Exception as e:
+        print(f"Error updating search index: {e}")
+
+
+def write_json(path, data):
+    """Replace a JSON cache file atomically, so readers never see half a file"""
+    try:
+        with METRICS.span('cache.write'):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, path)
+    except Exception as e:
+        print(f"Error saving cache: {e}")
+
+
+# YouTube
+
+def attach_thumbnails(videos, data_folder=YOUTUBE_FOLDER):
+    """Point cached videos at thumbnails that still exist on disk"""
+    for video in videos:
+        thumbnail_path = os.path.join(data_folder, f"{video['id']}.jpg")
+        if os.path.exists(thumbnail_path):
+            video['thumbnail_path'] = thumbnail_path
+    return videos
+
+
+def store_videos(cache, cache_key, channel_url, videos, now=None):
+    """Put a fresh channel fetch into `cache`, adjusting the entry's learned TTL"""
+    now = time.time() if now is None else now
+    previous = cache.get(cache_key, {})
+    entry = {
+        'videos': list_to_cache(videos),
+        'timestamp': now,
+        'channel_url': channel_url
+    }
+    if 'ttl' in previous:
+        entry['ttl'] = previous['ttl']
+    youtube_ttl().record_refresh(entry, previous.get('videos', []), videos, now)
+    cache[cache_key] = entry
+    add_to_search_index(SEARCH_INDEX.add_videos, videos, cache_key)
+    return entry
+
+
+def load_last_viewed_channel():
+    """Return (channel_url, videos) of the most recently viewed channel from disk only"""
+    try:
+        with open(LAST_VIEWED_FILE, 'r', encoding='utf-8') as f:
+            cache_key = json.load(f)['cache_key']
+        with open(YOUTUBE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            entry = json.load(f).get(cache_key)
+        if entry:
+            return entry.get('channel_url', ''), attach_thumbnails(Video.list_from_cache(entry.get('videos', [])))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading last viewed channel: {e}")
+    return None, []
+
+
+def details_path(video_id):
+    return os.path.join(DETAILS_FOLDER, f"{video_id}.json")
+
+
+def load_video_details(video_id, now=None):
+    """Cached VideoDetails of a video while they are fresh, otherwise None"""
+    now = time.time() if now is None else now
+    entry = read_json(details_path(video_id))
+    if entry and now - entry.get('timestamp', 0) < DETAILS_MAX_AGE:
+        return VideoDetails.from_cache(entry['details'])
+    return None
+
+
+def store_video_details(details, now=None):
+    """Keep fetched VideoDetails, each in its own file"""
+    now = time.time() if now is None else now
+    for item in details:
+        write_json(details_path(item['id']), {'details': item.to_cache(), 'timestamp': now})
+
+
+# Reddit
+
+def read_reddit_cache(cache_file=REDDIT_CACHE_FILE):
+    """Read the Reddit cache from disk, keyed by subreddit"""
+    cache = read_json(cache_file)
+
+    # Older caches held a single r/popular fetch at the top level
+    if 'last_fetch' in cache:
+        cache = {'popular': cache}
+    return cache
+
+
+def store_posts(cache, subreddit, posts, method, now=None):
+    """Put a fresh subreddit fetch into `cache`, adjusting the entry's learned TTL"""
+    now = time.time() if now is None else now
+    previous = cache.get(subreddit, {})
+    entry = {
+        'last_fetch': list_to_cache(posts),
+        'timestamp': now,
+        'method': method
+    }
+    if 'ttl' in previous:
+        entry['ttl'] = previous['ttl']
+    reddit_ttl().record_refresh(entry, previous.get('last_fetch', []), posts, now)
+    cache[subreddit] = entry
+    add_to_search_index(SEARCH_INDEX.add_posts, posts)
+    return entry
+
+
+def update_post_counts(cache, subreddit, counts):
+    """Write refreshed counts into a subreddit's cached posts; returns {id: Post} of the posts that changed.
+
+    The listing's own timestamp stays as it is, so new posts still come
+    with the next full fetch once its TTL runs out.
+    """
+    entry = cache.get(subreddit)
+    if not entry:
+        return {}
+    changed = {}
+    for post in entry.get('last_fetch', []):
+        fields = counts.get(post['id'])
+        if fields and any(post.get(field) != value for field, value in fields.items()):
+            post.update(fields)
+            # The stored display strings follow the new numbers
+            changed[post['id']] = Post.from_cache(post)
+            post.update(changed[post['id']].to_cache())
+    return changed
+
+
+def load_cached_posts(subreddit='popular'):
+    """Return the last fetched posts for a subreddit without touching the network"""
+    return Post.list_from_cache(read_reddit_cache().get(subreddit, {}).get('last_fetch', []))
+
+
+def store_comments(cache, post_id, post, comments, now=None):
+    """Put a post's details and top comments into `cache`, keeping it bounded"""
+    cache[post_id] = {
+        'post': post.to_cache() if isinstance(post, Post) else post,
+        'comments': list_to_cache(comments),
+        'timestamp': time.time() if now is None else now
+    }
+    if len(cache) > MAX_CACHED_COMMENT_THREADS:
+        oldest = sorted(cache, key=lambda key: cache[key].get('timestamp', 0))
+        for key in oldest[:len(cache) - MAX_CACHED_COMMENT_THREADS]:
+            del cache[key]
+    add_to_search_index(SEARCH_INDEX.add_posts, [post])
+    add_to_search_index(SEARCH_INDEX.add_comments, post_id, comments)
+    return cache[post_id]
@@ -0,0 +1,30 @@
+import hashlib
+
+def extract_channel_info(url):
+    """Extract channel information from various YouTube URL formats"""
+    try:
+        if '/channel/' in url:
+            channel_id = url.split('/channel/')[-1].split('/')[0].split('?')[0]
+            return {'type': 'channel_id', 'id': channel_id}
+        elif '/@' in url:
+            handle = url.split('/@')[-1].split('/')[0].split('?')[0]
+            return {'type': 'handle', 'id': handle}
+        elif '/c/' in url:
+            custom_name = url.split('/c/')[-1].split('/')[0].split('?')[0]
+            return {'type': 'custom', 'id': custom_name}
+        elif '/user/' in url:
+            username = url.split('/user/')[-1].split('/')[0].split('?')[0]
+            return {'type': 'username', 'id': username}
+        else:
+            # Try to extract from general youtube.com URL
+            if 'youtube.com' in url:
+                return {'type': 'hash', 'id': hashlib.md5(url.encode()).hexdigest()}
+    except Exception as e:
+        print(f"Error extracting channel info: {e}")
+
+    return {'type': 'hash', 'id': hashlib.md5(url.encode()).hexdigest()}
+
+def channel_cache_key(url):
+    """Cache (and in-flight) key for a channel URL"""
+    channel_info = extract_channel_info(url)
+    return f"{channel_info['type']}_{channel_info['id']}"
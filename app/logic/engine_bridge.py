@@ -0,0 +1,64 @@
+"""Runs the asyncio FetchEngine on a background event loop for the Qt workers.
+
+The workers stay thin: they call `run_on_engine()` from a pool thread and
+re-emit the result through their existing progress/finished/error signals.
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+from .env import load_env
+from .fetch_engine import FetchEngine
+from .profiler import OPERATIONS
+from .scheduler import USER, request_priority
+
+_lock = threading.Lock()
+_loop = None
+_engine = None
+
+
+def engine_loop():
+    """The shared event loop, started on a daemon thread on first use"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="fetch-engine", daemon=True).start()
+        return _loop
+
+
+def shared_engine():
+    """The process-wide FetchEngine used by the GUI workers"""
+    global _engine
+    with _lock:
+        if _engine is None:
+            load_env()
+            _engine = FetchEngine(api_key=os.getenv('YOUTUBE_KEY'))
+        return _engine
+
+
+async def with_priority(coro, priority, operation):
+    request_priority.set(priority)
+    with OPERATIONS.tag(operation):
+        return await coro
+
+
+def run_on_engine(make_coro, job=None):
+    """Run `make_coro(engine)` on the engine loop and wait for its result.
+
+    Called from a worker thread. If `job` gets cancelled while waiting, the
+    coroutine is cancelled too and the job's cancellation error is raised.
+    """
+    priority = getattr(job, 'priority', USER)
+    operation = job.operation_name() if job is not None else 'engine request'
+    future = asyncio.run_coroutine_threadsafe(
+        with_priority(make_coro(shared_engine()), priority, operation), engine_loop()
+    )
+    while True:
+        try:
+            return future.result(timeout=0.25)
+        except concurrent.futures.TimeoutError:
+            if job is not None and job.is_cancelled():
+                future.cancel()
+                job.raise_if_cancelled()
+
@@ -0,0 +1,9 @@
+_loaded = False
+
+def load_env():
+    """Load variables from .env once, the first time any code needs them"""
+    global _loaded
+    if not _loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _loaded = True
@@ -0,0 +1,128 @@
+"""Client-side sorting and filtering of a loaded feed.
+
+A FeedView holds the items a tab has cards for. Each sort order is worked
+out once per load and kept, and every filterable field is grouped by
+value, so switching the sort or a filter is a lookup and one pass over the
+ids, even for thousands of items:
+
+    view = FeedView(POST_SORTS, POST_FILTERS)
+    view.set_items(posts)
+    view.visible_ids('score', {'subreddit': 'python', 'nsfw': False})
+
+The tabs then move their existing cards into that order; nothing is
+fetched again and no card is rebuilt.
+"""
+import calendar
+from .normalize import MONTHS, Video
+
+MONTH_NUMBERS = {name: number for number, name in enumerate(MONTHS, 1)}
+
+# Sort order that keeps the feed as the API returned it
+AS_LOADED = 'as_loaded'
+
+
+def published_key(text):
+    """Sortable (year, month, day) of a video's 'Jan 02, 2025' date"""
+    try:
+        month, day, year = text.replace(',', '').split()
+        return int(year), MONTH_NUMBERS[month], int(day)
+    except (AttributeError, ValueError, KeyError):
+        return 0, 0, 0
+
+
+def item_time(item):
+    """Unix time a video was published or a post created, 0 if unknown"""
+    if isinstance(item, Video):
+        published = item.get('published_utc')
+        if published is None:
+            # Videos cached before published_utc existed only know the day
+            year, month, day = published_key(item.get('published_at'))
+            published = calendar.timegm((year, month, day, 0, 0, 0)) if year else 0
+        return published
+    return item.get('created_utc') or 0
+
+
+def numeric(field):
+    def key(item):
+        value = item.get(field)
+        return value if isinstance(value, (int, float)) else 0
+    return key
+
+
+# sort name -> (label, key of an item, descending)
+VIDEO_SORTS = {
+    AS_LOADED: ("Newest uploads", None, False),
+    'views': ("Most viewed", numeric('view_count'), True),
+    'oldest': ("Oldest first", item_time, False),
+    'title': ("Title A-Z", lambda video: video.get('title', '').casefold(), False),
+}
+
+POST_SORTS = {
+    AS_LOADED: ("Hot", None, False),
+    'score': ("Top score", numeric('score'), True),
+    'comments': ("Most comments", numeric('num_comments'), True),
+    'newest': ("Newest", numeric('created_utc'), True),
+    'upvote_ratio': ("Best upvote ratio", numeric('upvote_ratio'), True),
+}
+
+# field -> (label of the "any value" choice, label of one value)
+VIDEO_FILTERS = {
+    'channel_title': ("All channels", str),
+}
+
+POST_FILTERS = {
+    'subreddit': ("All subreddits", lambda name: f"r/{name}"),
+    'domain': ("All domains", str),
+    'post_type': ("Text and links", lambda kind: "Text posts" if kind == 'text' else "Links"),
+    'nsfw': ("NSFW shown", lambda nsfw: "NSFW only" if nsfw else "NSFW hidden"),
+}
+
+
+class FeedView:
+    """Sort orders and filter groups of one loaded feed, computed as needed and kept until the next load"""
+
+    def __init__(self, sorts, filters):
+        self.sorts = sorts
+        self.filters = filters
+        self.set_items([])
+
+    def set_items(self, items):
+        self.items = {item['id']: item for item in items}
+        # sort name -> ids in that order
+        self.orders = {AS_LOADED: list(self.items)}
+        # field -> {value: set of ids}
+        self.groups = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def order(self, sort):
+        ids = self.orders.get(sort)
+        if ids is None:
+            _, key, descending = self.sorts[sort]
+            keys = {item_id: key(item) for item_id, item in self.items.items()}
+            # Stable, so ties keep the order the feed came in
+            ids = self.orders[sort] = sorted(self.items, key=keys.__getitem__, reverse=descending)
+        return ids
+
+    def group(self, field):
+        groups = self.groups.get(field)
+        if groups is None:
+            groups = self.groups[field] = {}
+            for item_id, item in self.items.items():
+                groups.setdefault(item.get(field), set()).add(item_id)
+        return groups
+
+    def values(self, field):
+        """Values of `field` present in the feed, for the filter choices"""
+        return sorted((value for value in self.group(field) if value is not None),
+                      key=lambda value: str(value).casefold())
+
+    def visible_ids(self, sort=AS_LOADED, filters=None):
+        """Ids in `sort` order of the items whose fields equal every value in `filters` (None = any)"""
+        ids = self.order(sort)
+        for field, value in (filters or {}).items():
+            if value is not None:
+                allowed = self.group(field).get(value, set())
+                ids = [item_id for item_id in ids if item_id in allowed]
+        return ids
@@ -0,0 +1,364 @@
+"""Qt-independent asyncio fetch core for YouTube and Reddit.
+
+All I/O is non-blocking (aiohttp), goes through the shared RequestScheduler
+for per-host rate limits, and retries transient failures. The transport is
+pluggable (app.logic.transport), so fetches can be recorded and replayed. One FetchEngine
+can run hundreds of fetches concurrently on a single event loop; the GUI
+reaches it through app.logic.engine_bridge, headless tools use it directly.
+"""
+import asyncio
+import json
+import os
+from . import normalize
+from .channels import extract_channel_info
+from .metrics import METRICS
+from .resilience import retry_async
+from .scheduler import host_of
+from .transport import transport_from_env
+
+YOUTUBE_API = "https://www.googleapis.com/youtube/v3"
+REDDIT_API = "https://www.reddit.com"
+
+# The videos endpoint accepts at most 50 IDs per call
+STATS_BATCH_SIZE = 50
+# Detail lookups asked for within this many seconds of each other share a call
+DETAILS_BATCH_DELAY = 0.05
+# Reddit listings return at most 100 posts per page
+REDDIT_PAGE_SIZE = 100
+# /api/info looks up at most 100 fullnames per call
+INFO_BATCH_SIZE = 100
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, reason, url):
+        super().__init__(f"HTTP {status_code}: {reason}")
+        self.status_code = status_code
+        self.url = url
+
+
+class BatchedLookup:
+    """Merges lookups by ID from concurrent callers into batched calls.
+
+    IDs asked for within `delay` seconds of each other, and IDs that are
+    already being fetched, share `fetch_batch(ids)` calls of at most
+    `batch_size` IDs. `fetch_batch` returns {id: result}; IDs it leaves out
+    come back as None. Lives on the engine's event loop.
+    """
+
+    def __init__(self, fetch_batch, batch_size, delay):
+        self.fetch_batch = fetch_batch
+        self.batch_size = batch_size
+        self.delay = delay
+        # id -> future of its result, until its batch returns
+        self.pending = {}
+        self.queued = []
+        self.flush_handle = None
+        # Running batches; the loop only keeps weak references to tasks
+        self.tasks = set()
+
+    async def get(self, ids):
+        """{id: result} for `ids`"""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item_id in ids:
+            future = self.pending.get(item_id)
+            if future is None:
+                future = self.pending[item_id] = loop.create_future()
+                self.queued.append(item_id)
+            futures.append(future)
+
+        if len(self.queued) >= self.batch_size:
+            self.flush()
+        elif self.queued and self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.delay, self.flush)
+
+        # A caller that gives up must not cancel a lookup other callers share
+        results = await asyncio.gather(*[asyncio.shield(future) for future in futures])
+        return dict(zip(ids, results))
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        queued, self.queued = self.queued, []
+        for start in range(0, len(queued), self.batch_size):
+            ids = queued[start:start + self.batch_size]
+            task = asyncio.ensure_future(self.run_batch(ids))
+            self.tasks.add(task)
+            task.add_done_callback(lambda task, ids=ids: self.batch_done(task, ids))
+
+    async def run_batch(self, ids):
+        results = await self.fetch_batch(ids)
+        for item_id in ids:
+            self.pending.pop(item_id).set_result(results.get(item_id))
+
+    def batch_done(self, task, ids):
+        """Settle what a failed or cancelled batch left, or later lookups of its IDs would wait forever"""
+        self.tasks.discard(task)
+        # A batch cancelled before it started never ran, so this is the one place that sees every exit
+        error = None if task.cancelled() else task.exception()
+        for item_id in ids:
+            future = self.pending.get(item_id)
+            if future is None or future.done():
+                continue
+            del self.pending[item_id]
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+                # Callers that gave up never read it, which asyncio would log
+                future.exception()
+
+
+class FetchEngine:
+    """Async fetches for channel resolution, playlist paging, stats,
+    thumbnails, Reddit listings and comments.
+
+    Use as `async with FetchEngine(api_key) as engine:` or call `close()`
+    when done. `concurrency` caps simultaneous open requests.
+    """
+
+    def __init__(self, api_key=None, concurrency=32, thumbnail_folder="youtube_data",
+                 transport=None, youtube_api=None, reddit_api=None):
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.thumbnail_folder = thumbnail_folder
+        self.transport = transport or transport_from_env(concurrency)
+        # Base URLs can point at a local stand-in server (see app.standin)
+        self.youtube_api = youtube_api or os.getenv('YOUTUBE_API_URL', YOUTUBE_API)
+        self.reddit_api = reddit_api or os.getenv('REDDIT_API_URL', REDDIT_API)
+        # channel URL -> (uploads playlist ID, channel title), resolved once
+        self.uploads = {}
+        self.details = BatchedLookup(self.details_batch, STATS_BATCH_SIZE, DETAILS_BATCH_DELAY)
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        await self.transport.open()
+
+    async def close(self):
+        await self.transport.close()
+
+    async def request(self, url, params=None):
+        """GET `url` once; returns (status, reason, headers, body bytes)"""
+        response = await self.transport.request(url, params)
+        METRICS.count_request(host_of(url), len(response[3]))
+        return response
+
+    async def get_bytes(self, url, params=None):
+        """GET with retries for transient failures; raises HTTPError otherwise"""
+        async def attempt():
+            status, reason, _, body = await self.request(url, params)
+            if status != 200:
+                raise HTTPError(status, reason, url)
+            return body
+        return await retry_async(attempt)
+
+    async def get_json(self, url, params=None):
+        return json.loads(await self.get_bytes(url, params))
+
+    # YouTube
+
+    async def youtube(self, endpoint, **params):
+        if not self.api_key:
+            raise Exception("YouTube API key not found. Please add YOUTUBE_KEY to your .env file.")
+        params['key'] = self.api_key
+        return await self.get_json(f"{self.youtube_api}/{endpoint}", params)
+
+    async def resolve_channel(self, channel_url):
+        """Channel ID for any supported channel URL, or None if not found"""
+        with METRICS.span('youtube.resolve'):
+            return await self.lookup_channel_id(channel_url)
+
+    async def lookup_channel_id(self, channel_url):
+        channel_info = extract_channel_info(channel_url)
+        if channel_info['type'] == 'channel_id':
+            return channel_info['id']
+
+        if channel_info['type'] == 'handle':
+            # Search for channel by handle
+            data = await self.youtube('search', part='snippet', q=f"@{channel_info['id']}",
+                                      type='channel', maxResults=1)
+            if data.get('items'):
+                return data['items'][0]['snippet']['channelId']
+
+        elif channel_info['type'] in ['custom', 'username']:
+            # Try to get channel by username/custom name
+            lookup = 'forUsername' if channel_info['type'] == 'username' else 'forHandle'
+            data = await self.youtube('channels', part='id', **{lookup: channel_info['id']})
+            if data.get('items'):
+                return data['items'][0]['id']
+
+        return None
+
+    async def uploads_playlist(self, channel_url):
+        """(uploads playlist ID, channel title) for a channel URL, resolved once per engine"""
+        if channel_url not in self.uploads:
+            channel_id = await self.resolve_channel(channel_url)
+            if not channel_id:
+                raise Exception("Could not find channel. Please check the URL.")
+            self.uploads[channel_url] = await self.channel_uploads(channel_id)
+        return self.uploads[channel_url]
+
+    async def channel_uploads(self, channel_id):
+        """(uploads playlist ID, channel title) for a channel"""
+        with METRICS.span('youtube.channel'):
+            data = await self.youtube('channels', part='contentDetails,snippet', id=channel_id)
+        if not data.get('items'):
+            raise Exception("Channel not found")
+        item = data['items'][0]
+        return item['contentDetails']['relatedPlaylists']['uploads'], item['snippet']['title']
+
+    async def playlist_page(self, playlist_id, page_token=None, max_results=20, channel_title=''):
+        """One page of a playlist as video dicts, plus the next page token"""
+        params = {'part': 'snippet,contentDetails', 'playlistId': playlist_id, 'maxResults': max_results}
+        if page_token:
+            params['pageToken'] = page_token
+        with METRICS.span('youtube.playlist_page'):
+            data = await self.youtube('playlistItems', **params)
+            videos = normalize.videos_from_playlist_page(data.get('items', []), channel_title)
+        return videos, data.get('nextPageToken')
+
+    async def video_stats(self, video_ids):
+        """Statistics per video ID, fetched in concurrent batches of 50"""
+        batches = [video_ids[i:i + STATS_BATCH_SIZE] for i in range(0, len(video_ids), STATS_BATCH_SIZE)]
+        responses = await asyncio.gather(*[self.stats_batch(batch) for batch in batches])
+        return {item['id']: item['statistics'] for data in responses for item in data.get('items', [])}
+
+    async def stats_batch(self, video_ids):
+        with METRICS.span('youtube.stats_batch'):
+            return await self.youtube('videos', part='statistics', id=','.join(video_ids))
+
+    async def video_details(self, video_ids):
+        """VideoDetails per video ID (None if not found); lookups made at the same time share calls"""
+        return await self.details.get(video_ids)
+
+    async def details_batch(self, video_ids):
+        with METRICS.span('youtube.details_batch'):
+            data = await self.youtube('videos', part='snippet,contentDetails,statistics', id=','.join(video_ids))
+        return {item['id']: normalize.video_details_from_json(item) for item in data.get('items', [])}
+
+    async def download_thumbnail(self, video_id, thumbnail_url):
+        """Save a thumbnail next to the cache; returns its path or None"""
+        path = os.path.join(self.thumbnail_folder, f"{video_id}.jpg")
+        if os.path.exists(path):
+            METRICS.count_cache('thumbnail', 'hit')
+            return path
+        METRICS.count_cache('thumbnail', 'miss')
+        if not thumbnail_url:
+            return None
+        try:
+            with METRICS.span('youtube.thumbnail'):
+                content = await self.get_bytes(thumbnail_url)
+                await asyncio.to_thread(write_file, path, content)
+            return path
+        except Exception as e:
+            print(f"Error downloading thumbnail for {video_id}: {e}")
+            return None
+
+    async def channel_videos(self, channel_url, max_videos=20, thumbnails=True, progress=None):
+        """Full channel load: resolve, page uploads, attach stats and thumbnails"""
+        progress = progress or (lambda message: None)
+
+        progress("Getting channel information...")
+        uploads_playlist_id, channel_title = await self.uploads_playlist(channel_url)
+        progress(f"Found channel: {channel_title}")
+
+        progress("Fetching videos...")
+        videos, page_token = [], None
+        while len(videos) < max_videos:
+            page, page_token = await self.playlist_page(
+                uploads_playlist_id, page_token, min(50, max_videos - len(videos)), channel_title
+            )
+            videos.extend(page)
+            if not page_token:
+                break
+
+        await self.add_video_details(videos, thumbnails, progress)
+        return videos
+
+    async def channel_page(self, channel_url, page_token=None, max_results=50, thumbnails=True):
+        """One page of a channel's uploads with stats and thumbnails, plus the next page token"""
+        uploads_playlist_id, channel_title = await self.uploads_playlist(channel_url)
+        videos, page_token = await self.playlist_page(uploads_playlist_id, page_token, max_results, channel_title)
+        await self.add_video_details(videos, thumbnails)
+        return videos, page_token
+
+    async def add_video_details(self, videos, thumbnails=True, progress=None):
+        """Attach view counts and, if `thumbnails`, downloaded thumbnail paths to `videos`"""
+        progress = progress or (lambda message: None)
+
+        # Get additional video details (view count, etc.)
+        if videos:
+            try:
+                stats = await self.video_stats([video['id'] for video in videos])
+                for video in videos:
+                    video['view_count'] = int(stats.get(video['id'], {}).get('viewCount', 0))
+            except Exception as e:
+                print(f"Error fetching video stats: {e}")
+
+        if thumbnails and videos:
+            progress(f"Downloading {len(videos)} thumbnails...")
+            os.makedirs(self.thumbnail_folder, exist_ok=True)
+            paths = await asyncio.gather(*[
+                self.download_thumbnail(video['id'], video.get('thumbnail_url', '')) for video in videos
+            ])
+            for video, path in zip(videos, paths):
+                if path:
+                    video['thumbnail_path'] = path
+
+    # Reddit (public JSON API)
+
+    async def reddit_listing(self, subreddit='popular', limit=10, after=None, sort='hot'):
+        """Posts of a subreddit listing as post records, paging past 100 when needed"""
+        posts = []
+        while len(posts) < limit:
+            page, after = await self.reddit_page(subreddit, min(REDDIT_PAGE_SIZE, limit - len(posts)), after, sort)
+            posts.extend(page)
+            if not after or not page:
+                break
+        return posts[:limit]
+
+    async def reddit_page(self, subreddit='popular', limit=REDDIT_PAGE_SIZE, after=None, sort='hot'):
+        """One page of a subreddit listing ('hot', 'new', ...), plus the `after` of the next page"""
+        params = {'limit': limit}
+        if after:
+            params['after'] = after
+        with METRICS.span('reddit.listing_page'):
+            data = await self.get_json(f"{self.reddit_api}/r/{subreddit}/{sort}.json", params)
+            posts = normalize.posts_from_listing(data['data']['children'])
+        return posts, data['data'].get('after')
+
+    async def reddit_counts(self, post_ids):
+        """Current score, comment count and upvote ratio per post ID; deleted posts are left out"""
+        batches = [post_ids[start:start + INFO_BATCH_SIZE] for start in range(0, len(post_ids), INFO_BATCH_SIZE)]
+        counts = {}
+        for batch in await asyncio.gather(*[self.reddit_info(batch) for batch in batches]):
+            counts.update(batch)
+        return counts
+
+    async def reddit_info(self, post_ids):
+        fullnames = ','.join(f"t3_{post_id}" for post_id in post_ids)
+        with METRICS.span('reddit.info_batch'):
+            data = await self.get_json(f"{self.reddit_api}/api/info.json", {'id': fullnames})
+            return normalize.post_counts_from_info(data['data']['children'])
+
+    async def reddit_comments(self, post_id, limit=5, replies=2):
+        """(post details, top comments with replies) for a post"""
+        with METRICS.span('reddit.comment_page'):
+            data = await self.get_json(f"{self.reddit_api}/comments/{post_id}.json", {'limit': limit * 4})
+            post = data[0]['data']['children'][0]['data']
+            comments = normalize.comment_tree_from_json(
+                data[1]['data']['children'], post.get('author'), limit, replies
+            )
+        return normalize.post_details_from_json(post), comments
+
+
+def write_file(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
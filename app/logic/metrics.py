@@ -0,0 +1,233 @@
+"""Process-wide timing spans and counters for every fetch.
+
+Nothing here imports Qt, so the workers, the fetch engine and the CLI all
+record into the same METRICS registry:
+
+    with METRICS.span('youtube.resolve'):
+        ...
+    METRICS.count_request(host, len(body))
+    METRICS.count_cache('youtube', 'hit')
+
+`snapshot()` returns everything as plain data, `to_prometheus()` renders it
+in the Prometheus text format and `write(path)` saves either one, picked by
+the file extension. The GUI shows the same data in Debug > Metrics, and
+METRICS_FILE=<path> saves it when the process exits.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from .env import load_env
+
+# Durations kept per span for the percentiles; totals cover every sample
+RECENT_SAMPLES = 512
+CACHE_RESULTS = ('hit', 'stale', 'miss')
+PROMETHEUS_QUANTILES = (0.5, 0.95)
+
+
+def quantile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class SpanStats:
+    """Durations recorded for one span name"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds, failed):
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self):
+        ordered = sorted(self.recent)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total * 1000 / self.count if self.count else 0.0,
+            'p50_ms': quantile(ordered, 0.5) * 1000,
+            'p95_ms': quantile(ordered, 0.95) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class Span:
+    """Times a `with` block; an exception leaving the block counts as an error"""
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        self.metrics.record_span(self.name, time.perf_counter() - self.start, failed)
+
+
+class Metrics:
+    """Thread-safe registry of spans, per-host traffic and cache lookups"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.spans = {}
+            # host -> [requests, response bytes]
+            self.hosts = {}
+            # cache name -> {'hit': n, 'stale': n, 'miss': n}
+            self.caches = {}
+
+    def span(self, name):
+        return Span(self, name)
+
+    def record_span(self, name, seconds, failed=False):
+        with self.lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.add(seconds, failed)
+
+    def count_request(self, host, size):
+        with self.lock:
+            counts = self.hosts.setdefault(host, [0, 0])
+            counts[0] += 1
+            counts[1] += size
+
+    def count_cache(self, cache, result):
+        """Record a lookup in `cache` as 'hit', 'stale' (served, then refreshed) or 'miss'"""
+        with self.lock:
+            counts = self.caches.setdefault(cache, dict.fromkeys(CACHE_RESULTS, 0))
+            counts[result] += 1
+
+    def snapshot(self):
+        """Everything recorded so far as plain JSON-ready data"""
+        with self.lock:
+            spans = {name: stats.summary() for name, stats in self.spans.items()}
+            hosts = {host: {'requests': requests, 'bytes': size}
+                     for host, (requests, size) in self.hosts.items()}
+            caches = {name: dict(counts) for name, counts in self.caches.items()}
+            started = self.started
+
+        for counts in caches.values():
+            lookups = sum(counts[result] for result in CACHE_RESULTS)
+            counts['hit_ratio'] = counts['hit'] / lookups if lookups else 0.0
+        return {
+            'started_at': started,
+            'uptime_seconds': time.time() - started,
+            'spans': spans,
+            'hosts': hosts,
+            'caches': caches
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """The snapshot in the Prometheus text exposition format"""
+        with self.lock:
+            spans = {name: (stats.count, stats.errors, stats.total, sorted(stats.recent))
+                     for name, stats in self.spans.items()}
+            hosts = {host: tuple(counts) for host, counts in self.hosts.items()}
+            caches = {name: dict(counts) for name, counts in self.caches.items()}
+
+        lines = [
+            '# HELP app_span_seconds Time spent per fetch stage',
+            '# TYPE app_span_seconds summary'
+        ]
+        for name, (count, _, total, ordered) in sorted(spans.items()):
+            label = f'span="{escape_label(name)}"'
+            for q in PROMETHEUS_QUANTILES:
+                lines.append(f'app_span_seconds{{{label},quantile="{q}"}} {quantile(ordered, q):.6f}')
+            lines.append(f'app_span_seconds_sum{{{label}}} {total:.6f}')
+            lines.append(f'app_span_seconds_count{{{label}}} {count}')
+
+        lines += ['# HELP app_span_errors_total Stages that ended with an error',
+                  '# TYPE app_span_errors_total counter']
+        lines += [f'app_span_errors_total{{span="{escape_label(name)}"}} {errors}'
+                  for name, (_, errors, _, _) in sorted(spans.items())]
+
+        lines += ['# HELP app_http_requests_total HTTP requests sent per host',
+                  '# TYPE app_http_requests_total counter']
+        lines += [f'app_http_requests_total{{host="{escape_label(host)}"}} {requests}'
+                  for host, (requests, _) in sorted(hosts.items())]
+        lines += ['# HELP app_http_response_bytes_total Response body bytes received per host',
+                  '# TYPE app_http_response_bytes_total counter']
+        lines += [f'app_http_response_bytes_total{{host="{escape_label(host)}"}} {size}'
+                  for host, (_, size) in sorted(hosts.items())]
+
+        lines += ['# HELP app_cache_lookups_total Cache lookups by result',
+                  '# TYPE app_cache_lookups_total counter']
+        for name, counts in sorted(caches.items()):
+            for result in CACHE_RESULTS:
+                lines.append(f'app_cache_lookups_total{{cache="{escape_label(name)}",result="{result}"}} '
+                             f'{counts[result]}')
+        return '\n'.join(lines) + '\n'
+
+    def report(self):
+        """Plain-text tables for the debug panel and the terminal"""
+        snapshot = self.snapshot()
+        lines = [f"Recording for {snapshot['uptime_seconds']:.0f}s", '',
+                 f"{'Stage':28s} {'count':>6s} {'errors':>6s} {'mean ms':>9s} {'p50 ms':>9s} "
+                 f"{'p95 ms':>9s} {'max ms':>9s} {'total ms':>10s}"]
+        for name, stats in sorted(snapshot['spans'].items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"{name:28s} {stats['count']:6d} {stats['errors']:6d} {stats['mean_ms']:9.1f} "
+                         f"{stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['max_ms']:9.1f} "
+                         f"{stats['total_ms']:10.1f}")
+
+        lines += ['', f"{'Host':28s} {'requests':>8s} {'bytes':>12s}"]
+        for host, counts in sorted(snapshot['hosts'].items()):
+            lines.append(f"{host:28s} {counts['requests']:8d} {counts['bytes']:12,d}")
+
+        lines += ['', f"{'Cache':28s} {'hit':>6s} {'stale':>6s} {'miss':>6s} {'hit ratio':>10s}"]
+        for name, counts in sorted(snapshot['caches'].items()):
+            lines.append(f"{name:28s} {counts['hit']:6d} {counts['stale']:6d} {counts['miss']:6d} "
+                         f"{counts['hit_ratio']:10.0%}")
+        return '\n'.join(lines)
+
+    def write(self, path):
+        """Save the metrics to `path`: Prometheus text for .prom/.txt, JSON otherwise"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_on_exit(path=None):
+    """Save the metrics to `path` (or METRICS_FILE) when the process exits"""
+    atexit.register(write_at_exit, path)
+
+
+def write_at_exit(path):
+    # .env is only read here, so startup never waits for it
+    if path is None:
+        load_env()
+        path = os.getenv('METRICS_FILE')
+    if path:
+        METRICS.write(path)
+
+
+# Shared by every worker and the fetch engine
+METRICS = Metrics()
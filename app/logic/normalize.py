@@ -0,0 +1,382 @@
+"""Conversion of raw API responses into the records stored in the caches.
+
+Everything here is plain Python so the fetch engine, the Qt workers and
+headless tools share one definition of the video, post and comment schema.
+Videos, posts and comments are slotted records that read like the dicts
+they replace (`post['title']`, `post.get('thumbnail')`), and convert to and
+from the cache's dicts with `to_cache()` and `from_cache()`.
+"""
+import re
+from collections.abc import Mapping
+from datetime import date, datetime
+from functools import lru_cache
+
+
+# Reddit's 'thumbnail' values that are not images
+PLACEHOLDER_THUMBNAILS = frozenset(('self', 'default', 'nsfw', ''))
+
+# ISO 8601 duration of a video, like 'PT1H2M3S'
+DURATION_PATTERN = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+@lru_cache(maxsize=65536)
+def format_minute(minute):
+    """Readable local date for a Unix time in whole minutes"""
+    return datetime.fromtimestamp(minute * 60).strftime('%b %d, %Y at %H:%M')
+
+
+def format_timestamp(timestamp):
+    """Format Unix timestamp to readable date"""
+    # Only minutes are shown, so posts from the same minute share one strftime
+    try:
+        return format_minute(int(timestamp) // 60)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return "Unknown date"
+
+
+def format_number(num):
+    """Format large numbers with K, M suffixes"""
+    try:
+        num = int(num)
+    except (TypeError, ValueError):
+        return "0"
+    if num >= 1000000:
+        return f"{num/1000000:.1f}M"
+    elif num >= 1000:
+        return f"{num/1000:.1f}K"
+    return str(num)
+
+
+@lru_cache(maxsize=16384)
+def format_date(date_string):
+    """Format ISO date string to readable format"""
+    # Fast path for the API's 'YYYY-MM-DDTHH:MM:SSZ'; the date is shown in UTC
+    try:
+        if date_string[4] == '-' and date_string[7] == '-':
+            day = date(int(date_string[:4]), int(date_string[5:7]), int(date_string[8:10]))
+            return f"{MONTHS[day.month - 1]} {date_string[8:10]}, {date_string[:4]}"
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+        return dt.strftime('%b %d, %Y')
+    except (TypeError, ValueError, AttributeError):
+        return date_string
+
+
+def format_duration(duration):
+    """'1:02:03', or '4:05' under an hour, for an ISO 8601 duration"""
+    match = DURATION_PATTERN.fullmatch(duration) if isinstance(duration, str) else None
+    if not match or duration == 'P':
+        return ""
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    hours += days * 24
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+# Value of a record field that was never set; the field reads as absent
+MISSING = object()
+
+
+def iso_timestamp(date_string):
+    """Unix time of an ISO timestamp like the API's 'YYYY-MM-DDTHH:MM:SSZ', or MISSING"""
+    try:
+        return datetime.fromisoformat(date_string.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError, AttributeError):
+        return MISSING
+
+
+class Record(Mapping):
+    """Item with a fixed set of fields in __slots__, read like a dict.
+
+    Unset fields are left out, as they would be from a dict. Display strings
+    in DERIVED are computed from the stored fields when read instead of being
+    kept next to them, so they stay right when a field changes. The cache
+    format still has them, so other readers of the cache files see no
+    difference.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    # display field -> function of the record
+    DERIVED = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.NAMES = frozenset(cls.FIELDS)
+
+    def __init__(self, **values):
+        for name in self.FIELDS:
+            setattr(self, name, values.pop(name, MISSING))
+        if values:
+            raise TypeError(f"{type(self).__name__} has no field(s) {', '.join(values)}")
+
+    @classmethod
+    def from_cache(cls, data):
+        """Record for a cached dict; stored display strings are dropped"""
+        if isinstance(data, cls):
+            return data
+        record = cls.__new__(cls)
+        get = data.get
+        for name in cls.FIELDS:
+            setattr(record, name, get(name, MISSING))
+        return record
+
+    @classmethod
+    def list_from_cache(cls, items):
+        convert = cls.from_cache
+        return [convert(item) for item in items]
+
+    def to_cache(self):
+        """Dict as stored in the JSON caches, display strings included"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not MISSING:
+                data[name] = value
+        for name, derive in self.DERIVED.items():
+            data[name] = derive(self)
+        return data
+
+    def __getitem__(self, key):
+        derive = self.DERIVED.get(key)
+        if derive is not None:
+            return derive(self)
+        if key in self.NAMES:
+            value = getattr(self, key)
+            if value is not MISSING:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.NAMES:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if getattr(self, name) is not MISSING:
+                yield name
+        yield from self.DERIVED
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+        return super().__eq__(other)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS
+                           if getattr(self, name) is not MISSING)
+        return f"{type(self).__name__}({fields})"
+
+
+def list_to_cache(items):
+    """Cache dicts for a list of records (dicts are kept as they are)"""
+    return [item.to_cache() if isinstance(item, Record) else item for item in items]
+
+
+class Video(Record):
+    FIELDS = ('id', 'title', 'description', 'published_at', 'published_utc', 'thumbnail_url', 'channel_title',
+              'view_count', 'thumbnail_path')
+    __slots__ = FIELDS
+
+
+class VideoDetails(Record):
+    """What the detail page shows of a video; fetched when it is opened, not with the feed"""
+    FIELDS = ('id', 'title', 'description', 'published_at', 'published_utc', 'channel_title', 'duration',
+              'view_count', 'like_count', 'comment_count', 'tags')
+    __slots__ = FIELDS
+    DERIVED = {
+        'duration_formatted': lambda details: format_duration(details.duration)
+    }
+
+
+class Post(Record):
+    """A listing post, or with its full selftext the post shown by the viewer"""
+    FIELDS = ('id', 'title', 'author', 'subreddit', 'score', 'upvote_ratio', 'num_comments', 'created_utc',
+              'url', 'permalink', 'selftext', 'is_self', 'domain', 'gilded', 'locked', 'stickied', 'nsfw',
+              'thumbnail')
+    __slots__ = FIELDS
+    DERIVED = {
+        'created_formatted': lambda post: format_timestamp(post.created_utc),
+        'score_formatted': lambda post: format_number(post.score),
+        'comments_formatted': lambda post: format_number(post.num_comments),
+        'post_type': lambda post: 'text' if post.is_self else 'link'
+    }
+
+
+# Fields of a listed post that keep changing; refreshed without listing again
+POST_COUNT_FIELDS = ('score', 'num_comments', 'upvote_ratio')
+
+
+class Comment(Record):
+    """A comment; top-level comments of a thread also have their 'replies'"""
+    FIELDS = ('id', 'author', 'body', 'score', 'created_utc', 'is_submitter', 'gilded', 'replies')
+    __slots__ = FIELDS
+    DERIVED = {
+        'created_formatted': lambda comment: format_timestamp(comment.created_utc)
+    }
+
+    @classmethod
+    def from_cache(cls, data):
+        comment = super().from_cache(data)
+        if comment.replies is not MISSING and comment is not data:
+            comment.replies = cls.list_from_cache(comment.replies)
+        return comment
+
+    def to_cache(self):
+        data = super().to_cache()
+        if 'replies' in data:
+            data['replies'] = list_to_cache(data['replies'])
+        return data
+
+
+def video_from_playlist_item(item, channel_title=''):
+    """Video from a playlistItems resource"""
+    return videos_from_playlist_page([item], channel_title)[0]
+
+
+def videos_from_playlist_page(items, channel_title=''):
+    """Videos for a whole playlistItems page"""
+    videos = []
+    append = videos.append
+    for item in items:
+        snippet = item['snippet']
+        get = snippet.get
+        append(Video(
+            id=item['contentDetails']['videoId'],
+            title=get('title', 'No Title'),
+            description=get('description', 'No description')[:200] + "...",
+            published_at=format_date(get('publishedAt', '')),
+            published_utc=iso_timestamp(get('publishedAt', '')),
+            thumbnail_url=get('thumbnails', {}).get('high', {}).get('url', ''),
+            channel_title=get('channelTitle', channel_title)
+        ))
+    return videos
+
+
+def video_details_from_json(item):
+    """VideoDetails from a videos resource with snippet, contentDetails and statistics"""
+    snippet = item.get('snippet', {})
+    statistics = item.get('statistics', {})
+    return VideoDetails(
+        id=item['id'],
+        title=snippet.get('title', 'No Title'),
+        description=snippet.get('description', ''),
+        published_at=format_date(snippet.get('publishedAt', '')),
+        published_utc=iso_timestamp(snippet.get('publishedAt', '')),
+        channel_title=snippet.get('channelTitle', ''),
+        duration=item.get('contentDetails', {}).get('duration', ''),
+        view_count=int(statistics.get('viewCount', 0)),
+        # Channels can hide likes and turn comments off
+        like_count=int(statistics['likeCount']) if 'likeCount' in statistics else MISSING,
+        comment_count=int(statistics['commentCount']) if 'commentCount' in statistics else MISSING,
+        tags=snippet.get('tags', [])
+    )
+
+
+def post_from_json(post):
+    """Post from a listing child's 'data' in Reddit's JSON API"""
+    get = post.get
+    thumbnail = get('thumbnail')
+    return Post(
+        id=post['id'],
+        title=post['title'],
+        author=get('author', '[deleted]'),
+        subreddit=post['subreddit'],
+        score=post['score'],
+        upvote_ratio=get('upvote_ratio', 0),
+        num_comments=post['num_comments'],
+        created_utc=post['created_utc'],
+        url=post['url'],
+        permalink=post['permalink'],
+        selftext=get('selftext', '')[:500],  # Limit text length
+        is_self=post['is_self'],
+        domain=get('domain', ''),
+        gilded=get('gilded', 0),
+        locked=get('locked', False),
+        stickied=get('stickied', False),
+        nsfw=get('over_18', False),
+        # Only real images, Reddit also sends placeholders like 'self'
+        thumbnail=thumbnail if thumbnail and thumbnail not in PLACEHOLDER_THUMBNAILS else MISSING
+    )
+
+
+def posts_from_listing(children):
+    """Posts for a whole listing page ('children' of Reddit's JSON API)"""
+    convert = post_from_json
+    return [convert(child['data']) for child in children]
+
+
+def post_counts_from_info(children):
+    """{post id: {field: value}} of the POST_COUNT_FIELDS in an /api/info listing's children"""
+    counts = {}
+    for child in children:
+        post = child['data']
+        counts[post['id']] = {field: post[field] for field in POST_COUNT_FIELDS if field in post}
+    return counts
+
+
+def post_details_from_json(post):
+    """Full post (untruncated selftext) as shown by the post viewer"""
+    return Post(
+        id=post['id'],
+        title=post['title'],
+        author=post.get('author', '[deleted]'),
+        subreddit=post['subreddit'],
+        score=post['score'],
+        upvote_ratio=post.get('upvote_ratio', 0),
+        num_comments=post['num_comments'],
+        created_utc=post['created_utc'],
+        selftext=post.get('selftext', ''),
+        url=post['url'],
+        is_self=post['is_self'],
+        domain=post.get('domain', ''),
+        gilded=post.get('gilded', 0),
+        locked=post.get('locked', False),
+        stickied=post.get('stickied', False),
+        nsfw=post.get('over_18', False)
+    )
+
+
+def comment_from_json(comment, submitter=None):
+    """Comment (without replies) from a 't1' thing's 'data'"""
+    author = comment.get('author') or '[deleted]'
+    return Comment(
+        id=comment['id'],
+        author=author,
+        body=comment.get('body', ''),
+        score=comment.get('score', 0),
+        created_utc=comment.get('created_utc', 0),
+        is_submitter=comment.get('is_submitter', author == submitter),
+        gilded=comment.get('gilded', 0)
+    )
+
+
+def comment_tree_from_json(children, submitter=None, limit=5, replies=2):
+    """Top `limit` comments with up to `replies` replies each, like CommentWorker"""
+    comments = []
+    for child in children:
+        if child.get('kind') != 't1':
+            continue
+        data = child['data']
+        comment = comment_from_json(data, submitter)
+        comment.replies = []
+
+        reply_listing = data.get('replies') or {}
+        for reply in reply_listing.get('data', {}).get('children', []):
+            if reply.get('kind') == 't1':
+                comment.replies.append(comment_from_json(reply['data'], submitter))
+            if len(comment.replies) >= replies:
+                break
+
+        comments.append(comment)
+        if len(comments) >= limit:
+            break
+    return comments
@@ -0,0 +1,126 @@
+"""Low-overhead sampling profiler that can be started in a running app.
+
+A daemon thread samples the Python stack of every thread with
+sys._current_frames() a hundred times a second, so nothing is traced and
+the profiled code runs at full speed. Samples are written as folded stacks
+(one `frame;frame;frame count` line per distinct stack), the input format
+of flamegraph.pl, speedscope and inferno.
+
+Every stack is rooted at the operation its thread was working on, as
+tagged with `OPERATIONS.tag("YouTube load channel X")`. The workers and
+the fetch engine tag their work, so a flame graph splits by user-visible
+operation first.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+SAMPLE_INTERVAL = 0.01
+
+
+class OperationTags:
+    """What each thread is currently working on"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # thread id -> names of the operations running on it
+        self.active = {}
+
+    @contextmanager
+    def tag(self, name):
+        """Tag the calling thread with `name` for the duration of the block.
+
+        Coroutines on one event loop share a thread, so while several run
+        their names are joined.
+        """
+        thread_id = threading.get_ident()
+        with self.lock:
+            self.active.setdefault(thread_id, []).append(name)
+        try:
+            yield
+        finally:
+            with self.lock:
+                names = self.active[thread_id]
+                names.remove(name)
+                if not names:
+                    del self.active[thread_id]
+
+    def describe(self, thread_id):
+        with self.lock:
+            names = self.active.get(thread_id)
+            return ' + '.join(dict.fromkeys(names)) if names else None
+
+
+def frame_label(code):
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+
+class SamplingProfiler:
+    """Counts the stacks of all threads until stopped"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, operations=None):
+        self.interval = interval
+        self.operations = operations or OPERATIONS
+        self.counts = Counter()
+        self.samples = 0
+        self.labels = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        return self
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            self.sample(own_id)
+
+    def label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = frame_label(code)
+        return label
+
+    def sample(self, own_id=None):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            stack.append(self.operations.describe(thread_id) or 'no operation')
+            stack.reverse()
+            self.counts[';'.join(stack)] += 1
+        self.samples += 1
+
+    def folded(self):
+        """Folded stacks, most frequent first"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+    def write(self, path):
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.folded())
+
+
+# Shared by the workers, the fetch engine and the CLI
+OPERATIONS = OperationTags()
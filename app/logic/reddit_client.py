@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+from .env import load_env
+from .metrics import METRICS
+from .scheduler import SCHEDULER, host_of
+from .transport import request_key, transport_mode
+
+ACCESS_TOKEN_PATH = "/api/v1/access_token"
+
+_local = threading.local()
+
+def get_reddit_client():
+    """PRAW client for the calling thread, built once and reused.
+
+    PRAW instances are not thread safe, so every pool thread keeps its own.
+    Returns None if the client can't be set up.
+    """
+    if not hasattr(_local, 'reddit'):
+        _local.reddit = create_reddit_client()
+    return _local.reddit
+
+def replayed_response(url, status, reason, headers, body):
+    """requests.Response built from a cassette entry"""
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    
+    response = Response()
+    response.url = url
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    return response
+
+def scheduled_requestor_class():
+    """prawcore Requestor that sends every PRAW request through the scheduler,
+    recording or replaying them when FETCH_TRANSPORT asks for it"""
+    from prawcore import Requestor
+    
+    class ScheduledRequestor(Requestor):
+        def request(self, method, url, *args, **kwargs):
+            mode, cassette = transport_mode()
+            key = request_key(method, url, kwargs.get('params'))
+            host = host_of(url)
+            if mode == 'replay':
+                response = replayed_response(url, *cassette.play(key))
+                METRICS.count_request(host, len(response.content))
+                return response
+            
+            SCHEDULER.acquire(host)
+            response = super().request(method, url, *args, **kwargs)
+            SCHEDULER.update_from_headers(host, response.headers)
+            METRICS.count_request(host, len(response.content))
+            
+            if mode == 'record':
+                body = response.content
+                if url.endswith(ACCESS_TOKEN_PATH):
+                    # Never write real tokens to a cassette
+                    body = json.dumps({'access_token': 'recorded', 'token_type': 'bearer',
+                                       'expires_in': 3600, 'scope': '*'}).encode('utf-8')
+                cassette.record(key, response.status_code, response.reason, response.headers, body)
+            return response
+    
+    return ScheduledRequestor
+
+def create_reddit_client():
+    """Setup Reddit client with credentials from .env or use read-only mode"""
+    try:
+        import praw
+        load_env()
+        
+        # Try to get credentials from environment
+        client_id = os.getenv('REDDIT_CLIENT_ID')
+        client_secret = os.getenv('REDDIT_CLIENT_SECRET')
+        user_agent = os.getenv('REDDIT_USER_AGENT', 'ContentAggregator/1.0 by YourUsername')
+        
+        # Point PRAW at a local stand-in server (see app.standin) when configured
+        urls = {name: os.getenv(env_name) for name, env_name in
+                (('oauth_url', 'REDDIT_OAUTH_URL'), ('reddit_url', 'REDDIT_URL')) if os.getenv(env_name)}
+        
+        if client_id and client_secret:
+            # Use authenticated client
+            return praw.Reddit(
+                client_id=client_id,
+                client_secret=client_secret,
+                user_agent=user_agent,
+                requestor_class=scheduled_requestor_class(),
+                **urls
+            )
+        
+        # Use read-only mode (requires only user agent)
+        return praw.Reddit(
+            client_id=None,
+            client_secret=None,
+            user_agent=user_agent,
+            requestor_class=scheduled_requestor_class(),
+            **urls
+        )
+    except Exception as e:
+        print(f"Error setting up Reddit client: {e}")
+        return None
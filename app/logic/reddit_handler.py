@@ -1,262 +1,244 @@
-import os
-import json
 import time
-from datetime import datetime
-from PyQt6.QtCore import QThread, pyqtSignal
-from dotenv import load_dotenv
-import praw
+from PyQt6.QtCore import pyqtSignal
+from .cache_store import (REDDIT_CACHE_FILE, REDDIT_FOLDER, read_reddit_cache, reddit_ttl, store_posts,
+                          update_post_counts, write_json)
+from .engine_bridge import run_on_engine
+from .metrics import METRICS
+from .normalize import MISSING, PLACEHOLDER_THUMBNAILS, Post
+from .reddit_client import get_reddit_client
+from .resilience import get_breaker, retry_call
+from .workers import CancellableWorker, WorkerCancelled
 
-load_dotenv()
+def posts_key(subreddit='popular'):
+    """In-flight key for a subreddit listing"""
+    return f"reddit_{subreddit}"
 
-class RedditWorker(QThread):
+def counts_key(subreddit='popular'):
+    """In-flight key for refreshing a subreddit's scores and comment counts"""
+    return f"reddit_counts_{subreddit}"
+
+def call_backends(job, backends, stage='posts'):
+    """Return (result, name) of the first healthy backend in `backends`.
+    
+    `backends` is a list of (name, fetch) pairs, tried in order. A backend
+    whose circuit breaker is open is skipped until its cooldown ends, so a
+    broken PRAW setup doesn't cost a failed attempt on every refresh. If
+    every backend is marked as failing, the last one is still tried.
+    Each attempt is timed as the `reddit.<stage>.<name>` span.
+    """
+    errors = []
+    skipped = 0
+    
+    for name, fetch in backends:
+        breaker = get_breaker(f"reddit_{name}")
+        last_resort = skipped == len(backends) - 1
+        if not breaker.allow() and not last_resort:
+            skipped += 1
+            errors.append(f"{name}: skipped, recently failing ({breaker.last_error})")
+            continue
+        
+        if errors:
+            job.progress.emit(f"{errors[-1].split(':')[0]} failed, trying {name}...")
+        
+        try:
+            with METRICS.span(f"reddit.{stage}.{name}"):
+                return breaker.call(fetch), name
+        except Exception as e:
+            job.raise_if_cancelled()
+            print(f"{name} failed: {e}")
+            errors.append(f"{name}: {e}")
+    
+    raise Exception(f"All methods failed. {'; '.join(errors)}")
+
+class RedditWorker(CancellableWorker):
     progress = pyqtSignal(str)
+    cached = pyqtSignal(list)
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
     
-    def __init__(self):
+    def __init__(self, subreddit='popular', limit=10):
         super().__init__()
-        self.data_folder = "reddit_data"
-        self.cache_file = os.path.join(self.data_folder, "cache.json")
-        
-        # Create data folder if it doesn't exist
-        os.makedirs(self.data_folder, exist_ok=True)
+        self.subreddit = subreddit
+        self.limit = limit
+        self.data_folder = REDDIT_FOLDER
+        self.cache_file = REDDIT_CACHE_FILE
         
-        # Initialize Reddit API client
+        # Reddit API client is only looked up once a network fetch is needed
         self.reddit = None
-        self.setup_reddit_client()
+    
+    def operation_name(self):
+        return f"Reddit load r/{self.subreddit}"
     
     def setup_reddit_client(self):
-        """Setup Reddit client with credentials from .env or use read-only mode"""
-        try:
-            # Try to get credentials from environment
-            client_id = os.getenv('REDDIT_CLIENT_ID')
-            client_secret = os.getenv('REDDIT_CLIENT_SECRET')
-            user_agent = os.getenv('REDDIT_USER_AGENT', 'ContentAggregator/1.0 by YourUsername')
-            
-            if client_id and client_secret:
-                # Use authenticated client
-                self.reddit = praw.Reddit(
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    user_agent=user_agent
-                )
-                self.progress.emit("Using authenticated Reddit API...")
-            else:
-                # Use read-only mode (requires only user agent)
-                self.reddit = praw.Reddit(
-                    client_id=None,
-                    client_secret=None,
-                    user_agent=user_agent
-                )
-                self.progress.emit("Using read-only Reddit API...")
-                
-        except Exception as e:
-            print(f"Error setting up Reddit client: {e}")
-            self.reddit = None
+        """Use this pool thread's shared Reddit client"""
+        self.reddit = get_reddit_client()
     
     def load_cache(self):
-        """Load cached data from JSON file"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading cache: {e}")
-        return {}
+        """Load cached data from JSON file, keyed by subreddit"""
+        return read_reddit_cache(self.cache_file)
     
     def save_cache(self, cache):
         """Save data to cache JSON file"""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving cache: {e}")
-    
-    def format_timestamp(self, timestamp):
-        """Format Unix timestamp to readable date"""
-        try:
-            dt = datetime.fromtimestamp(timestamp)
-            return dt.strftime('%b %d, %Y at %H:%M')
-        except:
-            return "Unknown date"
-    
-    def format_number(self, num):
-        """Format large numbers with K, M suffixes"""
-        try:
-            num = int(num)
-            if num >= 1000000:
-                return f"{num/1000000:.1f}M"
-            elif num >= 1000:
-                return f"{num/1000:.1f}K"
-            else:
-                return str(num)
-        except:
-            return "0"
+        write_json(self.cache_file, cache)
     
     def get_posts_with_praw(self):
         """Get Reddit posts using PRAW library"""
         try:
+            self.setup_reddit_client()
             if not self.reddit:
                 raise Exception("Reddit client not initialized")
             
             posts = []
             
-            # Get hot posts from r/all or r/popular
-            subreddit = self.reddit.subreddit('popular')  # or 'all'
+            # Get hot posts from the requested subreddit (r/popular by default)
+            subreddit = self.reddit.subreddit(self.subreddit)
             
-            self.progress.emit("Fetching posts from r/popular...")
+            self.progress.emit(f"Fetching posts from r/{self.subreddit}...")
             
-            # Get top 10 hot posts
-            for i, submission in enumerate(subreddit.hot(limit=10), 1):
-                self.progress.emit(f"Processing post {i}/10: {submission.title[:50]}...")
+            # Get the top hot posts (10 by default)
+            for i, submission in enumerate(subreddit.hot(limit=self.limit), 1):
+                self.raise_if_cancelled()
+                self.progress.emit(f"Processing post {i}/{self.limit}: {submission.title[:50]}...")
                 
-                # Get post data
-                post_data = {
-                    'id': submission.id,
-                    'title': submission.title,
-                    'author': str(submission.author) if submission.author else '[deleted]',
-                    'subreddit': submission.subreddit.display_name,
-                    'score': submission.score,
-                    'upvote_ratio': getattr(submission, 'upvote_ratio', 0),
-                    'num_comments': submission.num_comments,
-                    'created_utc': submission.created_utc,
-                    'created_formatted': self.format_timestamp(submission.created_utc),
-                    'url': submission.url,
-                    'permalink': submission.permalink,
-                    'selftext': submission.selftext[:500] if submission.selftext else '',  # Limit text length
-                    'is_self': submission.is_self,
-                    'domain': submission.domain,
-                    'post_type': 'text' if submission.is_self else 'link',
-                    'gilded': getattr(submission, 'gilded', 0),
-                    'locked': submission.locked,
-                    'stickied': submission.stickied,
-                    'nsfw': submission.over_18
-                }
-                
-                # Add thumbnail info if available
-                if hasattr(submission, 'thumbnail') and submission.thumbnail not in ['self', 'default', 'nsfw']:
-                    post_data['thumbnail'] = submission.thumbnail
-                
-                # Format score and comments for display
-                post_data['score_formatted'] = self.format_number(post_data['score'])
-                post_data['comments_formatted'] = self.format_number(post_data['num_comments'])
-                
-                posts.append(post_data)
+                thumbnail = getattr(submission, 'thumbnail', None)
+                posts.append(Post(
+                    id=submission.id,
+                    title=submission.title,
+                    author=str(submission.author) if submission.author else '[deleted]',
+                    subreddit=submission.subreddit.display_name,
+                    score=submission.score,
+                    upvote_ratio=getattr(submission, 'upvote_ratio', 0),
+                    num_comments=submission.num_comments,
+                    created_utc=submission.created_utc,
+                    url=submission.url,
+                    permalink=submission.permalink,
+                    selftext=submission.selftext[:500] if submission.selftext else '',  # Limit text length
+                    is_self=submission.is_self,
+                    domain=submission.domain,
+                    gilded=getattr(submission, 'gilded', 0),
+                    locked=submission.locked,
+                    stickied=submission.stickied,
+                    nsfw=submission.over_18,
+                    thumbnail=thumbnail if thumbnail and thumbnail not in PLACEHOLDER_THUMBNAILS else MISSING
+                ))
             
             return posts
             
+        except WorkerCancelled:
+            raise
         except Exception as e:
-            raise Exception(f"Error fetching posts with PRAW: {str(e)}")
+            raise Exception(f"Error fetching posts with PRAW: {str(e)}") from e
     
     def get_posts_fallback(self):
-        """Fallback method using Reddit's JSON API if PRAW fails"""
+        """Fallback using Reddit's JSON API on the async engine if PRAW fails"""
         try:
-            import requests
-            
             self.progress.emit("Using fallback method (JSON API)...")
-            
-            url = "https://www.reddit.com/r/popular/hot.json?limit=10"
-            headers = {
-                'User-Agent': 'ContentAggregator/1.0 (by YourUsername)'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=15)
-            if response.status_code != 200:
-                raise Exception(f"HTTP {response.status_code}: {response.reason}")
-            
-            data = response.json()
-            posts = []
-            
-            for i, post_data in enumerate(data['data']['children'], 1):
-                self.progress.emit(f"Processing post {i}/10...")
-                
-                post = post_data['data']
-                
-                processed_post = {
-                    'id': post['id'],
-                    'title': post['title'],
-                    'author': post.get('author', '[deleted]'),
-                    'subreddit': post['subreddit'],
-                    'score': post['score'],
-                    'upvote_ratio': post.get('upvote_ratio', 0),
-                    'num_comments': post['num_comments'],
-                    'created_utc': post['created_utc'],
-                    'created_formatted': self.format_timestamp(post['created_utc']),
-                    'url': post['url'],
-                    'permalink': post['permalink'],
-                    'selftext': post.get('selftext', '')[:500],  # Limit text length
-                    'is_self': post['is_self'],
-                    'domain': post.get('domain', ''),
-                    'post_type': 'text' if post['is_self'] else 'link',
-                    'gilded': post.get('gilded', 0),
-                    'locked': post.get('locked', False),
-                    'stickied': post.get('stickied', False),
-                    'nsfw': post.get('over_18', False)
-                }
-                
-                # Add thumbnail if available
-                thumbnail = post.get('thumbnail')
-                if thumbnail and thumbnail not in ['self', 'default', 'nsfw', '']:
-                    processed_post['thumbnail'] = thumbnail
-                
-                # Format numbers
-                processed_post['score_formatted'] = self.format_number(processed_post['score'])
-                processed_post['comments_formatted'] = self.format_number(processed_post['num_comments'])
-                
-                posts.append(processed_post)
-            
-            return posts
-            
+            return run_on_engine(lambda engine: engine.reddit_listing(self.subreddit, limit=self.limit), self)
+        except WorkerCancelled:
+            raise
         except Exception as e:
-            raise Exception(f"Fallback method failed: {str(e)}")
+            raise Exception(f"Fallback method failed: {str(e)}") from e
+    
+    def fetch_posts(self):
+        """Fetch posts from the first healthy backend, PRAW before the JSON API"""
+        # The engine already retries its own requests
+        return call_backends(self, [
+            ('praw', lambda: retry_call(self.get_posts_with_praw)),
+            ('json_api', self.get_posts_fallback)
+        ])
     
     def run(self):
+        stale_shown = False
         try:
             self.progress.emit("Initializing Reddit data fetch...")
             
             cache = self.load_cache()
+            entry = cache.get(self.subreddit, {})
             
-            # Check if we have recent cached data (less than 10 minutes old)
+            # Use cached posts while they are within this subreddit's TTL
             current_time = time.time()
-            if 'last_fetch' in cache and 'timestamp' in cache:
-                cache_age = current_time - cache['timestamp']
-                if cache_age < 600:  # 10 minutes = 600 seconds
+            if 'last_fetch' in entry and 'timestamp' in entry:
+                if reddit_ttl().is_fresh(entry, current_time):
+                    METRICS.count_cache('reddit', 'hit')
                     self.progress.emit("Loading from cache...")
-                    self.finished.emit(cache['last_fetch'])
+                    self.finished.emit(Post.list_from_cache(entry['last_fetch']))
                     return
+                
+                # Show stale posts immediately while the refresh runs
+                METRICS.count_cache('reddit', 'stale')
+                self.progress.emit("Showing cached posts, refreshing...")
+                self.cached.emit(Post.list_from_cache(entry['last_fetch']))
+                stale_shown = True
+            else:
+                METRICS.count_cache('reddit', 'miss')
             
             # Try to fetch new data
-            posts = []
+            posts, method = self.fetch_posts()
             
-            # First try with PRAW
-            try:
-                posts = self.get_posts_with_praw()
-            except Exception as praw_error:
-                print(f"PRAW failed: {praw_error}")
-                self.progress.emit("PRAW failed, trying fallback method...")
-                
-                # Fallback to JSON API
-                try:
-                    posts = self.get_posts_fallback()
-                except Exception as fallback_error:
-                    raise Exception(f"Both methods failed. PRAW: {praw_error}, Fallback: {fallback_error}")
-            
-            # Save to cache
-            cache['last_fetch'] = posts
-            cache['timestamp'] = current_time
-            cache['method'] = 'praw' if self.reddit else 'json_api'
+            # Save to cache, adjusting the TTL by how much changed
+            store_posts(cache, self.subreddit, posts, method, current_time)
             self.save_cache(cache)
+            self.raise_if_cancelled()
             
             self.progress.emit(f"Successfully loaded {len(posts)} posts!")
             self.finished.emit(posts)
             
+        except WorkerCancelled:
+            print(f"Load of r/{self.subreddit} cancelled")
         except Exception as e:
-            self.error.emit(f"Error fetching Reddit posts: {str(e)}")
+            if self.is_cancelled():
+                return
+            if stale_shown:
+                print(f"Error refreshing Reddit posts: {e}")
+            else:
+                self.error.emit(f"Error fetching Reddit posts: {str(e)}")
             
             # Try to return cached data even if it's old
-            cache = self.load_cache()
-            if 'last_fetch' in cache:
+            entry = self.load_cache().get(self.subreddit, {})
+            if 'last_fetch' in entry:
                 self.progress.emit("Returning cached data due to error...")
-                self.finished.emit(cache['last_fetch'])
+                self.finished.emit(Post.list_from_cache(entry['last_fetch']))
             else:
-                self.finished.emit([])
\ No newline at end of file
+                self.finished.emit([])
+
+class RedditCountsWorker(CancellableWorker):
+    """Refreshes score, comment count and upvote ratio of a subreddit's cached posts.
+    
+    Asks /api/info for the cached posts by fullname, 100 per request,
+    instead of listing the subreddit again. Only the changing numbers are
+    written back, and `finished` gets {id: Post} of the posts that changed.
+    """
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    
+    def __init__(self, subreddit='popular'):
+        super().__init__()
+        self.subreddit = subreddit
+    
+    def operation_name(self):
+        return f"Reddit counts r/{self.subreddit}"
+    
+    def run(self):
+        try:
+            post_ids = [post['id'] for post in read_reddit_cache().get(self.subreddit, {}).get('last_fetch', [])]
+            if not post_ids:
+                self.finished.emit({})
+                return
+            
+            self.progress.emit(f"Refreshing scores of {len(post_ids)} posts...")
+            counts = run_on_engine(lambda engine: engine.reddit_counts(post_ids), self)
+            self.raise_if_cancelled()
+            
+            # Read again, a full fetch may have stored a newer listing meanwhile
+            cache = read_reddit_cache()
+            changed = update_post_counts(cache, self.subreddit, counts)
+            if changed:
+                write_json(REDDIT_CACHE_FILE, cache)
+            self.finished.emit(changed)
+            
+        except WorkerCancelled:
+            print(f"Count refresh of r/{self.subreddit} cancelled")
+        except Exception as e:
+            if not self.is_cancelled():
+                self.error.emit(f"Error refreshing Reddit scores: {str(e)}")
@@ -0,0 +1,174 @@
+import asyncio
+import random
+import threading
+import time
+from .scheduler import current_job
+
+# HTTP statuses and exception names worth retrying
+TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = {
+    'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout',
+    'ChunkedEncodingError', 'RequestException', 'ServerError', 'TooManyRequests',
+    'TimeoutError', 'ClientConnectionError', 'ClientConnectorError', 'ClientOSError',
+    'ClientPayloadError', 'ServerDisconnectedError', 'ServerTimeoutError'
+}
+
+
+def is_transient(error):
+    """True if the error (or anything it was raised from) looks temporary"""
+    while error is not None:
+        if type(error).__name__ in TRANSIENT_ERRORS:
+            return True
+        response = getattr(error, 'response', None)
+        status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+        if status in TRANSIENT_STATUSES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def backoff_sleep(seconds):
+    """Sleep in small steps so a cancelled job stops waiting right away"""
+    job = current_job()
+    deadline = time.monotonic() + seconds
+    while True:
+        if job is not None:
+            job.raise_if_cancelled()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 0.25))
+
+
+def retry_call(fn, attempts=3, base_delay=0.5, max_delay=8.0, retryable=is_transient):
+    """Call `fn`, retrying transient failures with full-jitter exponential backoff"""
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print(f"Transient error ({e}), retrying in {delay:.1f}s")
+            backoff_sleep(delay)
+
+
+async def retry_async(fn, attempts=3, base_delay=0.5, max_delay=8.0, retryable=is_transient):
+    """retry_call() for coroutines: `fn` is a zero-argument coroutine function"""
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print(f"Transient error ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Remembers a failing backend so callers can skip it for a while.
+
+    After `failure_threshold` consecutive transient failures, or a single
+    permanent one (e.g. a misconfigured client), the breaker opens and
+    `allow()` returns False until `cooldown` seconds have passed. Then one
+    trial call is let through: success closes the breaker, failure opens it
+    again. Success/failure counts and latency are kept for inspection.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, failure_threshold=2, cooldown=300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.opened_at = 0
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.latency_avg = None
+        self.last_error = None
+
+    def allow(self):
+        with self.lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def record_latency(self, latency):
+        if self.latency_avg is None:
+            self.latency_avg = latency
+        else:
+            self.latency_avg = 0.8 * self.latency_avg + 0.2 * latency
+
+    def record_success(self, latency):
+        with self.lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self.record_latency(latency)
+
+    def record_failure(self, latency, error):
+        with self.lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            self.record_latency(latency)
+            if (self.state == self.HALF_OPEN or not is_transient(error)
+                    or self.consecutive_failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_cancelled(self):
+        """A cancelled call says nothing about the backend; hand back the trial"""
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                # Still past its cooldown, so the next allow() retries the trial
+                self.state = self.OPEN
+
+    def call(self, fn):
+        """Run `fn` and record the outcome"""
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            job = current_job()
+            if job is not None and job.is_cancelled():
+                self.record_cancelled()
+            else:
+                self.record_failure(time.monotonic() - start, e)
+            raise
+        self.record_success(time.monotonic() - start)
+        return result
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'state': self.state,
+                'successes': self.successes,
+                'failures': self.failures,
+                'consecutive_failures': self.consecutive_failures,
+                'latency_avg_ms': None if self.latency_avg is None else self.latency_avg * 1000,
+                'last_error': self.last_error
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, **kwargs):
+    """Process-wide circuit breaker for a named backend"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+
+def backend_stats():
+    """Success and latency stats of every backend seen so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,211 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlparse
+
+# Request priorities, lower runs first
+USER = 0
+BACKGROUND = 10
+
+# Requests per second and burst size per host; anything else uses DEFAULT_LIMIT
+HOST_LIMITS = {
+    'www.googleapis.com': (5.0, 10),
+    'i.ytimg.com': (20.0, 20),
+    'oauth.reddit.com': (100 / 60, 10),  # OAuth clients get ~100 requests/minute
+    'www.reddit.com': (10 / 60, 5),      # unauthenticated JSON API
+    # Local stand-in server (app.standin), effectively unlimited
+    '127.0.0.1': (10000.0, 10000),
+    'localhost': (10000.0, 10000),
+}
+DEFAULT_LIMIT = (10.0, 10)
+
+_local = threading.local()
+
+# Priority of requests made from asyncio code (the fetch engine)
+request_priority = contextvars.ContextVar('request_priority', default=USER)
+
+
+class TokenBucket:
+    """Token bucket for one host, corrected by the server's rate limit headers"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now):
+        """Seconds until a request may be sent (0 if it can go now)"""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def apply_server_limits(self, remaining, reset, now):
+        """Trust the server's view of our quota over our own estimate"""
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+            if remaining < 1 and reset:
+                self.blocked_until = max(self.blocked_until, now + reset)
+        elif reset:
+            self.blocked_until = max(self.blocked_until, now + reset)
+
+
+def current_job():
+    """The job (worker) running on this thread, if any"""
+    return getattr(_local, 'job', None)
+
+
+class job_context:
+    """Marks `job` as the owner of requests made on this thread.
+
+    The scheduler reads the job's `priority` for every request (so an upgrade
+    from background to user priority applies immediately) and calls its
+    `raise_if_cancelled()` while the request waits for a slot.
+    """
+
+    def __init__(self, job):
+        self.job = job
+
+    def __enter__(self):
+        self.previous = current_job()
+        _local.job = self.job
+        return self.job
+
+    def __exit__(self, *exc):
+        _local.job = self.previous
+
+
+class RequestScheduler:
+    """Central gate every HTTP and PRAW request passes through.
+
+    Each host has a token bucket. Requests for the same host wait in a
+    priority queue, so user-initiated loads always get the next free slot
+    ahead of background refreshes and prefetches.
+    """
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, limits=None, default_limit=DEFAULT_LIMIT):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self.condition = threading.Condition()
+        self.buckets = {}
+        self.queues = {}
+        self.counter = itertools.count()
+        # (loop, event) pairs of coroutines waiting in acquire_async()
+        self.async_waiters = set()
+
+    def notify(self):
+        """Wake every waiter, threads and coroutines alike (condition held)"""
+        self.condition.notify_all()
+        for loop, event in self.async_waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def bucket(self, host):
+        if host not in self.buckets:
+            rate, capacity = self.limits.get(host, self.default_limit)
+            self.buckets[host] = TokenBucket(rate, capacity)
+        return self.buckets[host]
+
+    def acquire(self, host, priority=None):
+        """Block until a request to `host` may be sent"""
+        job = current_job()
+        if priority is None:
+            priority = getattr(job, 'priority', USER)
+
+        with self.condition:
+            queue = self.queues.setdefault(host, [])
+            ticket = [priority, next(self.counter)]
+            heapq.heappush(queue, ticket)
+            try:
+                while True:
+                    # Pick up priority upgrades made while we were waiting
+                    if job is not None and getattr(job, 'priority', priority) < ticket[0]:
+                        ticket[0] = job.priority
+                        heapq.heapify(queue)
+
+                    if queue[0] is ticket:
+                        delay = self.bucket(host).delay(time.monotonic())
+                        if delay <= 0:
+                            self.bucket(host).take()
+                            return
+                    else:
+                        delay = self.POLL_INTERVAL
+
+                    self.condition.wait(min(delay, self.POLL_INTERVAL))
+                    if job is not None:
+                        job.raise_if_cancelled()
+            finally:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                self.notify()
+
+    async def acquire_async(self, host, priority=None):
+        """Coroutine version of acquire() for the asyncio fetch engine"""
+        if priority is None:
+            priority = request_priority.get()
+
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.condition:
+            queue = self.queues.setdefault(host, [])
+            ticket = [priority, next(self.counter)]
+            heapq.heappush(queue, ticket)
+            self.async_waiters.add(waiter)
+        try:
+            while True:
+                with self.condition:
+                    if queue[0] is ticket:
+                        delay = self.bucket(host).delay(time.monotonic())
+                        if delay <= 0:
+                            self.bucket(host).take()
+                            return
+                    else:
+                        delay = self.POLL_INTERVAL
+                    waiter[1].clear()
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), min(delay, self.POLL_INTERVAL))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self.condition:
+                self.async_waiters.discard(waiter)
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                self.notify()
+
+    def update_from_headers(self, host, headers):
+        """Apply X-Ratelimit-* (Reddit) and Retry-After headers from a response"""
+        def number(name):
+            try:
+                return float(headers[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        remaining = number('X-Ratelimit-Remaining')
+        reset = number('X-Ratelimit-Reset') or number('Retry-After')
+        if remaining is None and reset is None:
+            return
+
+        with self.condition:
+            self.bucket(host).apply_server_limits(remaining, reset, time.monotonic())
+            self.notify()
+
+
+SCHEDULER = RequestScheduler()
+
+
+def host_of(url):
+    return urlparse(url).hostname or ''
@@ -0,0 +1,248 @@
+"""Full-text index over every video, post and comment stored in the caches.
+
+The caches are only keyed by channel, subreddit or post, so finding an
+item by its text would mean loading and scanning all of them. Instead the
+store functions in cache_store add what they store to an SQLite FTS5 index
+in search_data/, which answers a prefix query like "pyth rel" across
+hundreds of thousands of items in milliseconds:
+
+    SEARCH_INDEX.search_videos("pyth rel")     # [Video, ...], most recently stored first
+    SEARCH_INDEX.search_posts("pyth rel")      # posts matching themselves or by a comment
+
+Each entry also keeps the item's cache dict, so results are shown without
+reading the caches. An index that is missing is built from the caches the
+first time it is opened. If this Python's SQLite lacks FTS5 the same
+tables are searched with LIKE, which is slower but gives the same results.
+"""
+import itertools
+import json
+import os
+import re
+import threading
+from .metrics import METRICS
+from .normalize import Post, Video
+
+SEARCH_FOLDER = "search_data"
+INDEX_FILE = os.path.join(SEARCH_FOLDER, "index.sqlite3")
+
+# Results shown for one query
+SEARCH_LIMIT = 50
+
+# Videos and Reddit items are kept apart, so a search only walks its own feed
+FEED_TABLES = {'video': 'videos', 'post': 'reddit', 'comment': 'reddit'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS {feed} (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    source TEXT,
+    title TEXT,
+    body TEXT,
+    data TEXT,
+    UNIQUE (kind, item_id)
+);
+"""
+
+# The FTS table only indexes the text of its feed table; triggers keep it in step
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS {feed}_fts USING fts5(
+    title, body, content='{feed}', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS {feed}_fts_insert AFTER INSERT ON {feed} BEGIN
+    INSERT INTO {feed}_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS {feed}_fts_delete AFTER DELETE ON {feed} BEGIN
+    INSERT INTO {feed}_fts ({feed}_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS {feed}_fts_update AFTER UPDATE OF title, body ON {feed}
+WHEN old.title IS NOT new.title OR old.body IS NOT new.body BEGIN
+    INSERT INTO {feed}_fts ({feed}_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO {feed}_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+# Storing a known item again only re-indexes its text if the text changed
+UPSERT = """
+INSERT INTO {feed} (kind, item_id, source, title, body, data) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (kind, item_id) DO UPDATE SET
+    source = excluded.source, title = excluded.title, body = excluded.body, data = excluded.data
+"""
+
+# Hits come most recently stored first, which FTS5 reads straight off its
+# index and stops after the first page, however common the words are.
+# Comments count as hits for the post they belong to.
+POST_HITS = """
+SELECT CASE reddit.kind WHEN 'comment' THEN reddit.source ELSE reddit.item_id END
+FROM {tables} WHERE {match}
+ORDER BY {newest} DESC
+"""
+
+VIDEO_HITS = """
+SELECT videos.data FROM {tables} WHERE {match}
+ORDER BY {newest} DESC
+"""
+
+
+def query_terms(text):
+    """Lower-case words of a query; a one-letter last word is still being typed and left out"""
+    terms = re.findall(r'\w+', text.lower())
+    if terms and len(terms[-1]) == 1 and not text[-1:].isspace():
+        terms.pop()
+    return terms
+
+
+def fts_query(terms):
+    """FTS5 query matching items that contain every term as a word prefix"""
+    # One-letter prefixes are not in the prefix index and would walk every word
+    return ' '.join(f'"{term}"*' if len(term) > 1 else f'"{term}"' for term in terms)
+
+
+def like_condition(feed, terms):
+    """(condition, parameters) of the LIKE fallback for `terms`"""
+    condition = ' AND '.join(f"({feed}.title LIKE ? OR {feed}.body LIKE ?)" for _ in terms)
+    return condition, [pattern for term in terms for pattern in (f"%{term}%",) * 2]
+
+
+class SearchIndex:
+    """SQLite full-text index, with one connection per thread that uses it"""
+
+    def __init__(self, path=INDEX_FILE, fill_from_caches=True):
+        self.path = path
+        self.fill_from_caches = fill_from_caches
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.fts = None
+
+    def connect(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            return connection
+
+        import sqlite3
+        with self.lock:
+            created = not os.path.exists(self.path)
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            # Readers on the GUI thread never wait for a worker's write
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for feed in set(FEED_TABLES.values()):
+                connection.executescript(SCHEMA.format(feed=feed))
+            if self.fts is None:
+                try:
+                    for feed in set(FEED_TABLES.values()):
+                        connection.executescript(FTS_SCHEMA.format(feed=feed))
+                    self.fts = True
+                except sqlite3.OperationalError as e:
+                    print(f"Full-text search unavailable ({e}), searching with LIKE")
+                    self.fts = False
+            self.local.connection = connection
+        if created and self.fill_from_caches:
+            self.index_caches()
+        return connection
+
+    def close(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def write(self, rows):
+        """Insert or update (kind, item_id, source, title, body, data) rows of one kind"""
+        if not rows:
+            return
+        connection = self.connect()
+        with connection:
+            connection.executemany(UPSERT.format(feed=FEED_TABLES[rows[0][0]]), rows)
+
+    # Indexing
+
+    def add_videos(self, videos, source=None):
+        self.write([
+            ('video', video['id'], source, video.get('title', ''), video.get('description', ''),
+             json.dumps(video.to_cache() if isinstance(video, Video) else video, ensure_ascii=False))
+            for video in videos
+        ])
+
+    def add_posts(self, posts):
+        self.write([
+            ('post', post['id'], post.get('subreddit'), post.get('title', ''), post.get('selftext', ''),
+             json.dumps(post.to_cache() if isinstance(post, Post) else post, ensure_ascii=False))
+            for post in posts
+        ])
+
+    def add_comments(self, post_id, comments):
+        """Comments of a post and their replies; they are found through the post"""
+        rows = []
+        for comment in comments:
+            for item in [comment, *comment.get('replies', [])]:
+                rows.append(('comment', item['id'], post_id, '', item.get('body', ''), None))
+        self.write(rows)
+
+    def index_caches(self):
+        """Add everything already in the cache files, e.g. to a new index"""
+        from .cache_store import COMMENTS_CACHE_FILE, YOUTUBE_CACHE_FILE, read_json, read_reddit_cache
+        for cache_key, entry in read_json(YOUTUBE_CACHE_FILE).items():
+            self.add_videos(entry.get('videos', []), cache_key)
+        for entry in read_reddit_cache().values():
+            self.add_posts(entry.get('last_fetch', []))
+        for post_id, entry in read_json(COMMENTS_CACHE_FILE).items():
+            if 'post' in entry:
+                self.add_posts([entry['post']])
+            self.add_comments(post_id, entry.get('comments', []))
+
+    def count(self):
+        connection = self.connect()
+        return sum(connection.execute(f"SELECT COUNT(*) FROM {feed}").fetchone()[0]
+                   for feed in set(FEED_TABLES.values()))
+
+    # Searching
+
+    def matches(self, template, feed, text):
+        """Cursor over the rows of `template` for the words of `text`"""
+        terms = query_terms(text)
+        if not terms:
+            return iter(())
+        connection = self.connect()
+        if self.fts:
+            tables = f"{feed}_fts JOIN {feed} ON {feed}.id = {feed}_fts.rowid"
+            # Ordered by the FTS table's own rowid, or SQLite sorts every match first
+            sql = template.format(tables=tables, match=f"{feed}_fts MATCH ?", newest=f"{feed}_fts.rowid")
+            params = [fts_query(terms)]
+        else:
+            condition, params = like_condition(feed, terms)
+            sql = template.format(tables=feed, match=condition, newest=f"{feed}.id")
+        return connection.execute(sql, params)
+
+    def search_videos(self, text, limit=SEARCH_LIMIT):
+        """Videos whose title or description contain every word of `text`"""
+        with METRICS.span('search.videos'):
+            rows = itertools.islice(self.matches(VIDEO_HITS, 'videos', text), limit)
+            return [Video.from_cache(json.loads(data)) for data, in rows]
+
+    def search_posts(self, text, limit=SEARCH_LIMIT):
+        """Posts whose title, selftext or one of whose comments contain every word of `text`"""
+        with METRICS.span('search.posts'):
+            # Only the first rows are read, until `limit` posts are found
+            post_ids = {}
+            for post_id, in self.matches(POST_HITS, 'reddit', text):
+                post_ids.setdefault(post_id, len(post_ids))
+                if len(post_ids) >= limit:
+                    break
+            if not post_ids:
+                return []
+
+            placeholders = ', '.join('?' * len(post_ids))
+            rows = self.connect().execute(
+                f"SELECT item_id, data FROM reddit WHERE kind = 'post' AND item_id IN ({placeholders})", list(post_ids)
+            ).fetchall()
+            rows.sort(key=lambda row: post_ids[row[0]])
+            return [Post.from_cache(json.loads(data)) for _, data in rows]
+
+
+# Shared by the store functions in cache_store and the search boxes
+SEARCH_INDEX = SearchIndex()
@@ -0,0 +1,173 @@
+"""Detects stalls of the GUI event loop and records where they happened.
+
+The GUI thread calls `beat()` from a short repeating timer. A daemon thread
+watches the heartbeat: once the last beat is older than the threshold, it
+captures the GUI thread's Python stack right then, while the stall is still
+in progress. When beats resume, the stall's duration goes into a histogram
+keyed by the last user action (set through `set_action()`), into the
+`ui.stall` metrics span, and into the log with the captured stack.
+
+Nothing here imports Qt; app.ui.shared.stall_monitor wires it to the app.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from .metrics import METRICS
+
+# Upper bounds of the histogram buckets, in milliseconds; the last one is open
+STALL_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000)
+RECENT_STALLS = 50
+APP_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def handler_of(frame):
+    """Outermost app function on a stack, e.g. 'YouTubeTab.on_videos_loaded'.
+
+    On the GUI thread that is the Qt slot or event handler that was running.
+    """
+    handler = None
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(APP_FOLDER):
+            handler = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+        frame = frame.f_back
+    return handler or 'unknown'
+
+
+def bucket_label(index):
+    if index < len(STALL_BUCKETS_MS):
+        return f"<={STALL_BUCKETS_MS[index]}ms"
+    return f">{STALL_BUCKETS_MS[-1]}ms"
+
+
+class StallWatchdog:
+    """Heartbeat monitor for one thread's event loop"""
+
+    def __init__(self, threshold=0.2, log_path=None):
+        self.threshold = threshold
+        self.log_path = log_path
+        self.lock = threading.Lock()
+        self.thread_id = None
+        self.stopped = None
+        self.last_beat = time.monotonic()
+        self.stall = None
+        self.action = 'startup'
+        # action -> stall count per bucket
+        self.histogram = {}
+        self.recent = deque(maxlen=RECENT_STALLS)
+
+    @property
+    def running(self):
+        return self.stopped is not None and not self.stopped.is_set()
+
+    def start(self):
+        """Watch the calling thread, which must be the one calling beat()"""
+        if self.running:
+            return
+        self.thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.stall = None
+        self.stopped = threading.Event()
+        threading.Thread(target=self.watch, args=(self.stopped,), name="stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        if self.stopped is not None:
+            self.stopped.set()
+
+    def set_action(self, action):
+        """Name the user action later stalls are attributed to"""
+        self.action = action
+
+    def beat(self):
+        now = time.monotonic()
+        with self.lock:
+            stall, self.stall = self.stall, None
+            started, self.last_beat = self.last_beat, now
+        if stall is not None:
+            self.record(stall, now - started)
+
+    def watch(self, stopped):
+        while not stopped.wait(self.threshold / 4):
+            self.check(time.monotonic())
+
+    def check(self, now):
+        """Capture the watched thread's stack if it stopped beating"""
+        with self.lock:
+            if self.stall is not None or now - self.last_beat < self.threshold:
+                return
+            stall = self.stall = {'action': self.action}
+
+        frame = sys._current_frames().get(self.thread_id)
+        stall['handler'] = handler_of(frame)
+        stall['stack'] = traceback.format_stack(frame) if frame is not None else []
+
+    def record(self, stall, duration):
+        duration_ms = duration * 1000
+        index = next((i for i, bound in enumerate(STALL_BUCKETS_MS) if duration_ms <= bound),
+                     len(STALL_BUCKETS_MS))
+        entry = {
+            'time': time.time(),
+            'duration_ms': round(duration_ms, 1),
+            'action': stall['action'],
+            'handler': stall.get('handler', 'unknown'),
+            'stack': stall.get('stack', [])
+        }
+        with self.lock:
+            counts = self.histogram.setdefault(stall['action'], [0] * (len(STALL_BUCKETS_MS) + 1))
+            counts[index] += 1
+            self.recent.append(entry)
+        METRICS.record_span('ui.stall', duration)
+        self.log(entry)
+
+    def log(self, entry):
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+                return
+            except OSError as e:
+                print(f"Error writing stall log: {e}")
+        print(f"GUI stalled for {entry['duration_ms']:.0f} ms in {entry['handler']} "
+              f"(after: {entry['action']})\n{''.join(entry['stack'])}", file=sys.stderr)
+
+    def report(self):
+        """Stall histogram per user action as plain text"""
+        with self.lock:
+            histogram = {action: list(counts) for action, counts in self.histogram.items()}
+            recent = list(self.recent)
+        if not histogram:
+            return f"No GUI stalls over {self.threshold * 1000:.0f} ms"
+
+        labels = [bucket_label(i) for i in range(len(STALL_BUCKETS_MS) + 1)]
+        lines = [f"GUI stalls over {self.threshold * 1000:.0f} ms", '',
+                 f"{'Action':36s} " + ' '.join(f"{label:>9s}" for label in labels)]
+        for action, counts in sorted(histogram.items(), key=lambda item: -sum(item[1])):
+            lines.append(f"{action[:36]:36s} " + ' '.join(f"{count:9d}" for count in counts))
+
+        lines += ['', 'Slowest recent stalls:']
+        for entry in sorted(recent, key=lambda item: -item['duration_ms'])[:5]:
+            lines.append(f"  {entry['duration_ms']:8.0f} ms  {entry['handler']}  (after: {entry['action']})")
+        return '\n'.join(lines)
+
+    def write_report(self):
+        """Add the histogram to the stall log (or stderr), e.g. at exit"""
+        with self.lock:
+            histogram = {action: dict(zip(map(bucket_label, range(len(counts))), counts))
+                         for action, counts in self.histogram.items()}
+        if not histogram:
+            return
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'time': time.time(), 'histogram': histogram}) + '\n')
+                return
+            except OSError as e:
+                print(f"Error writing stall log: {e}")
+        print(self.report(), file=sys.stderr)
+
+
+# The GUI's watchdog; only runs once started
+STALLS = StallWatchdog()
@@ -0,0 +1,165 @@
+"""Timeline: the uploads and posts of every cached source, newest first.
+
+Each channel and subreddit in the caches becomes a PagedSource, an iterator
+over its items newest first that starts with what the cache holds and only
+fetches a page once the merge needs an item past that. A Timeline is a
+lazy k-way merge of all of them, so opening one over hundreds of sources
+reads the caches and only fetches for sources with nothing cached.
+Scrolling further only pulls pages from the sources that reach that far
+back:
+
+    timeline = Timeline()
+    timeline.next_items(30)      # the 30 newest items across all sources
+    timeline.next_items(30)      # the next 30, fetching pages as needed
+
+Videos are ordered by `published_utc`, or by the day in `published_at` for
+videos cached before that field existed. Posts are ordered by
+`created_utc`.
+"""
+import heapq
+import itertools
+import threading
+from .cache_store import YOUTUBE_CACHE_FILE, attach_thumbnails, read_json, read_reddit_cache
+from .feed_view import item_time
+from .metrics import METRICS
+from .normalize import Post, Video
+from .scheduler import current_job
+
+# Items added to the timeline per scroll step
+TIMELINE_STEP = 30
+
+# Items per fetched page; both are the APIs' maximum
+VIDEO_PAGE_SIZE = 50
+POST_PAGE_SIZE = 100
+
+
+def post_fullname(post):
+    """Reddit's name for a post, which listings take as `after`"""
+    return f"t3_{post['id']}"
+
+
+class PagedSource:
+    """One channel's or subreddit's items, newest first: the cached ones, then fetched pages.
+
+    `fetch_page(token)` returns (items, next token) for the page at `token`,
+    None being the first page. Leave it None to only show the cache.
+    `resume(item)`, if given, is the token of the page after the last
+    cached item. Otherwise fetching starts at the first page again, so
+    items already shown, or newer than the last one shown, are skipped to
+    keep the order.
+    """
+
+    def __init__(self, name, cached=(), fetch_page=None, resume=None):
+        self.name = name
+        self.cached = sorted(cached, key=item_time, reverse=True)
+        self.fetch_page = fetch_page
+        self.resume = resume
+        self.pages = 0
+        self.error = None
+
+    def __iter__(self):
+        seen = set()
+        oldest = None
+        for item in self.cached:
+            seen.add(item['id'])
+            oldest = item_time(item)
+            yield item
+        if self.fetch_page is None:
+            return
+
+        resumed = bool(self.resume and self.cached)
+        token = self.resume(self.cached[-1]) if resumed else None
+        while True:
+            try:
+                with METRICS.span('timeline.page'):
+                    items, next_token = self.fetch_page(token)
+            except Exception as e:
+                job = current_job()
+                if job is not None and job.is_cancelled():
+                    # The read was given up on, not the source
+                    raise
+                # A failing source ends here, the rest of the timeline goes on
+                print(f"Timeline source {self.name} failed: {e}")
+                self.error = str(e)
+                return
+            self.pages += 1
+            if resumed and not items:
+                # The last cached item has dropped out of the listing, page from the top instead
+                resumed, token = False, None
+                continue
+            resumed = False
+
+            for item in items:
+                published = item_time(item)
+                if item['id'] in seen or (oldest is not None and published > oldest):
+                    continue
+                seen.add(item['id'])
+                oldest = published
+                yield item
+            if not next_token or not items:
+                return
+            token = next_token
+
+
+def channel_pages(channel_url):
+    """Page fetcher for a channel's uploads, run on the shared fetch engine for the reading worker"""
+    from .engine_bridge import run_on_engine
+    return lambda token: run_on_engine(
+        lambda engine: engine.channel_page(channel_url, token, VIDEO_PAGE_SIZE), current_job()
+    )
+
+
+def subreddit_pages(subreddit):
+    """Page fetcher for a subreddit's newest posts, run on the shared fetch engine for the reading worker"""
+    from .engine_bridge import run_on_engine
+    return lambda after: run_on_engine(
+        lambda engine: engine.reddit_page(subreddit, POST_PAGE_SIZE, after, sort='new'), current_job()
+    )
+
+
+def cached_sources(live=True):
+    """A source per channel and subreddit in the caches; with `live` they page on past the cache"""
+    for cache_key, entry in read_json(YOUTUBE_CACHE_FILE).items():
+        videos = attach_thumbnails(Video.list_from_cache(entry.get('videos', [])))
+        channel_url = entry.get('channel_url')
+        name = videos[0].get('channel_title', cache_key) if videos else cache_key
+        yield PagedSource(name, videos, channel_pages(channel_url) if live and channel_url else None)
+    for subreddit, entry in read_reddit_cache().items():
+        posts = Post.list_from_cache(entry.get('last_fetch', []))
+        yield PagedSource(f"r/{subreddit}", posts, subreddit_pages(subreddit) if live else None,
+                          resume=post_fullname)
+
+
+class Timeline:
+    """Newest-first merge of the sources from `load_sources()`, read a step at a time.
+
+    The sources are only loaded by the first `next_items()`, so a timeline
+    can be created on the GUI thread and read from a worker. Reads are
+    serialized, as the merge cannot be advanced from two threads at once.
+    A read whose worker is cancelled ends the merge, so start a new
+    timeline after cancelling one.
+    """
+
+    def __init__(self, load_sources=cached_sources):
+        self.load_sources = load_sources
+        self.sources = None
+        self.merged = None
+        self.exhausted = False
+        self.lock = threading.Lock()
+
+    def next_items(self, count=TIMELINE_STEP):
+        """The next `count` items, or fewer once every source has run out"""
+        with self.lock:
+            if self.merged is None:
+                self.sources = list(self.load_sources())
+                self.merged = heapq.merge(*self.sources, key=item_time, reverse=True)
+            items = list(itertools.islice(self.merged, count))
+            if len(items) < count:
+                self.exhausted = True
+            return items
+
+    def pages_fetched(self):
+        return sum(source.pages for source in self.sources or ())
+
+    def failed_sources(self):
+        return [source.name for source in self.sources or () if source.error]
@@ -0,0 +1,32 @@
+from PyQt6.QtCore import pyqtSignal
+from .metrics import METRICS
+from .timeline import TIMELINE_STEP
+from .workers import CancellableWorker, WorkerCancelled
+
+class TimelineWorker(CancellableWorker):
+    """Reads the next step of a Timeline, fetching whatever pages it needs"""
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+    
+    def __init__(self, timeline, count=TIMELINE_STEP):
+        super().__init__()
+        self.timeline = timeline
+        self.count = count
+    
+    def operation_name(self):
+        return "Timeline next items"
+    
+    def run(self):
+        try:
+            self.progress.emit("Loading timeline...")
+            with METRICS.span('timeline.step'):
+                items = self.timeline.next_items(self.count)
+            self.raise_if_cancelled()
+            self.finished.emit(items)
+        except WorkerCancelled:
+            print("Timeline load cancelled")
+        except Exception as e:
+            if self.is_cancelled():
+                return
+            self.error.emit(f"Error loading timeline: {e}")
@@ -0,0 +1,187 @@
+"""Pluggable HTTP transports for the fetch engine and PRAW: live, record, replay.
+
+FETCH_TRANSPORT selects the mode and FETCH_CASSETTE the cassette file:
+
+    FETCH_TRANSPORT=record FETCH_CASSETTE=cassettes/run.json   # live, and save every response
+    FETCH_TRANSPORT=replay FETCH_CASSETTE=cassettes/run.json   # answer from the file, no network
+
+A cassette is a JSON file of request -> response pairs. Requests are matched
+on method, URL and sorted query parameters; the YouTube API key is never
+stored. Repeated requests replay their recorded responses in order.
+"""
+import asyncio
+import base64
+import json
+import os
+import threading
+from functools import lru_cache
+from urllib.parse import urlencode
+from .env import load_env
+from .scheduler import SCHEDULER, host_of
+
+USER_AGENT = 'ContentAggregator/1.0 (by YourUsername)'
+
+# Query parameters left out of cassette keys (secrets)
+UNRECORDED_PARAMS = {'key'}
+
+
+class CassetteMiss(Exception):
+    """A replayed request has no recorded response"""
+
+
+def request_key(method, url, params=None):
+    params = sorted((k, str(v)) for k, v in (params or {}).items() if k not in UNRECORDED_PARAMS)
+    return f"{method.upper()} {url}?{urlencode(params)}" if params else f"{method.upper()} {url}"
+
+
+class Cassette:
+    """Recorded responses kept in a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.interactions = []
+        self.positions = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.interactions = json.load(f).get('interactions', [])
+
+    def record(self, key, status, reason, headers, body):
+        interaction = {
+            'request': key,
+            'status': status,
+            'reason': reason,
+            'headers': {name: value for name, value in headers.items()
+                        if name.lower() in ('content-type', 'retry-after') or name.lower().startswith('x-ratelimit')}
+        }
+        try:
+            interaction['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            interaction['body_base64'] = base64.b64encode(body).decode('ascii')
+
+        with self.lock:
+            self.interactions.append(interaction)
+            self.save()
+
+    def play(self, key):
+        """(status, reason, headers, body) for the next recorded response to `key`"""
+        with self.lock:
+            matches = [item for item in self.interactions if item['request'] == key]
+            if not matches:
+                raise CassetteMiss(f"No recorded response for {key} in {self.path}")
+            # Step through repeated responses, then keep returning the last one
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+            interaction = matches[min(position, len(matches) - 1)]
+
+        if 'body_base64' in interaction:
+            body = base64.b64decode(interaction['body_base64'])
+        else:
+            body = interaction['body'].encode('utf-8')
+        return interaction['status'], interaction['reason'], interaction['headers'], body
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'interactions': self.interactions}, f, indent=1, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+class LiveTransport:
+    """aiohttp requests through the shared RequestScheduler"""
+    mode = 'live'
+
+    def __init__(self, concurrency=32):
+        self.concurrency = concurrency
+        self.session = None
+        self.semaphore = None
+
+    async def open(self):
+        if self.session is None:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise Exception("aiohttp is not installed. Please install it with 'pip install aiohttp'.") from e
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=15),
+                headers={'User-Agent': USER_AGENT}
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, url, params=None):
+        """GET `url` once; returns (status, reason, headers, body bytes)"""
+        await self.open()
+        host = host_of(url)
+        await SCHEDULER.acquire_async(host)
+        async with self.semaphore:
+            async with self.session.get(url, params=params) as response:
+                body = await response.read()
+                SCHEDULER.update_from_headers(host, response.headers)
+                return response.status, response.reason, response.headers, body
+
+
+class RecordingTransport(LiveTransport):
+    """Live requests whose responses are also written to a cassette"""
+    mode = 'record'
+
+    def __init__(self, cassette, concurrency=32):
+        super().__init__(concurrency)
+        self.cassette = cassette
+
+    async def request(self, url, params=None):
+        status, reason, headers, body = await super().request(url, params)
+        self.cassette.record(request_key('GET', url, params), status, reason, headers, body)
+        return status, reason, headers, body
+
+
+class ReplayTransport:
+    """Answers every request from a cassette without touching the network"""
+    mode = 'replay'
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def request(self, url, params=None):
+        return self.cassette.play(request_key('GET', url, params))
+
+
+@lru_cache(maxsize=None)
+def shared_cassette(path):
+    """One Cassette per file, shared by the engine and the PRAW requestor"""
+    return Cassette(path)
+
+
+def transport_mode():
+    """(mode, cassette) configured through FETCH_TRANSPORT and FETCH_CASSETTE"""
+    load_env()
+    mode = os.getenv('FETCH_TRANSPORT', 'live').lower()
+    if mode == 'live':
+        return mode, None
+    if mode not in ('record', 'replay'):
+        raise Exception(f"Unknown FETCH_TRANSPORT '{mode}', use live, record or replay")
+    path = os.getenv('FETCH_CASSETTE')
+    if not path:
+        raise Exception(f"FETCH_TRANSPORT={mode} needs FETCH_CASSETTE to point at a cassette file")
+    return mode, shared_cassette(path)
+
+
+def transport_from_env(concurrency=32):
+    """Transport for a new FetchEngine, as configured in the environment"""
+    mode, cassette = transport_mode()
+    if mode == 'record':
+        return RecordingTransport(cassette, concurrency)
+    if mode == 'replay':
+        return ReplayTransport(cassette)
+    return LiveTransport(concurrency)
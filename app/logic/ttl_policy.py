@@ -0,0 +1,72 @@
+import os
+import time
+
+
+class AdaptiveTTL:
+    """Per-key cache freshness window that adapts to how often content changes.
+
+    Every refresh compares the fetched item IDs with the cached ones. When new
+    items show up the window shrinks, when nothing changed it grows, always
+    staying between the configured minimum and maximum. The decision is stored
+    in the cache entry under 'ttl' so it can be inspected later.
+    """
+    HISTORY_SIZE = 10
+
+    def __init__(self, default, minimum, maximum, grow=1.5, shrink=0.5):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.default = self.clamp(default)
+        self.grow = grow
+        self.shrink = shrink
+
+    @classmethod
+    def from_env(cls, prefix, default, minimum, maximum):
+        """Build a policy whose bounds can be overridden with <PREFIX>_TTL_MIN/MAX"""
+        def read(name, fallback):
+            try:
+                return float(os.getenv(f"{prefix}_TTL_{name}", fallback))
+            except ValueError:
+                print(f"Invalid {prefix}_TTL_{name}, using {fallback}")
+                return fallback
+
+        return cls(default, read('MIN', minimum), read('MAX', maximum))
+
+    def clamp(self, seconds):
+        return max(self.minimum, min(self.maximum, seconds))
+
+    def current(self, entry):
+        """TTL currently in effect for a cache entry"""
+        return self.clamp(entry.get('ttl', {}).get('seconds', self.default))
+
+    def is_fresh(self, entry, now=None):
+        now = time.time() if now is None else now
+        return now - entry.get('timestamp', 0) < self.current(entry)
+
+    def record_refresh(self, entry, old_items, new_items, now=None):
+        """Adjust and store the TTL of an entry after a network refresh"""
+        now = time.time() if now is None else now
+        previous = self.current(entry)
+        old_ids = {item['id'] for item in old_items}
+        new_count = sum(1 for item in new_items if item['id'] not in old_ids)
+
+        if not old_items:
+            seconds, reason = previous, 'first fetch'
+        elif new_count:
+            seconds, reason = self.clamp(previous * self.shrink), f"{new_count} new item(s)"
+        else:
+            seconds, reason = self.clamp(previous * self.grow), 'no new items'
+
+        history = entry.get('ttl', {}).get('history', [])
+        history = (history + [{'at': now, 'new_items': new_count, 'seconds': seconds}])[-self.HISTORY_SIZE:]
+
+        entry['ttl'] = {
+            'seconds': seconds,
+            'previous': previous,
+            'reason': reason,
+            'min': self.minimum,
+            'max': self.maximum,
+            'decided_at': now,
+            'history': history
+        }
+        return seconds
+
@@ -0,0 +1,189 @@
+import os
+import threading
+from functools import lru_cache
+from PyQt6.QtCore import Qt, QObject, QThreadPool
+from .env import load_env
+from .profiler import OPERATIONS
+from .scheduler import USER, job_context
+
+class WorkerCancelled(Exception):
+    """Raised inside a worker to unwind once its load has been superseded"""
+
+
+@lru_cache(maxsize=None)
+def fetch_pool():
+    """Long-lived, bounded thread pool every fetch job runs on.
+
+    The number of concurrent network workers is capped by FETCH_WORKERS
+    (default 4). Threads are kept alive between jobs so per-thread setup
+    such as HTTP sessions and PRAW clients is only paid once.
+    """
+    load_env()
+    pool = QThreadPool()
+    try:
+        pool.setMaxThreadCount(max(1, int(os.getenv('FETCH_WORKERS', 4))))
+    except ValueError:
+        print("Invalid FETCH_WORKERS, using 4")
+        pool.setMaxThreadCount(4)
+    pool.setExpiryTimeout(-1)
+    return pool
+
+
+class CancellableWorker(QObject):
+    """A fetch job with typed result signals, run as a task on fetch_pool().
+
+    Subclasses implement `run()` and call `raise_if_cancelled()` between
+    stages; `run()` catches WorkerCancelled and returns without emitting
+    anything. Jobs cancelled before a pool thread picks them up never run.
+    """
+    IDLE, QUEUED, RUNNING, DONE = range(4)
+
+    def __init__(self):
+        super().__init__()
+        self.cancel_event = threading.Event()
+        self.state = self.IDLE
+        self.priority = USER
+
+    def start(self, priority=None):
+        """Queue the job on the shared pool; user jobs are picked up first"""
+        if priority is not None:
+            self.priority = priority
+        self.state = self.QUEUED
+        # QThreadPool runs higher numbers first, the scheduler lower ones
+        fetch_pool().start(self.execute, -self.priority)
+
+    def execute(self):
+        if self.is_cancelled():
+            self.state = self.DONE
+            return
+        self.state = self.RUNNING
+        try:
+            # Requests made by run() are scheduled with this job's priority
+            with job_context(self), OPERATIONS.tag(self.operation_name()):
+                self.run()
+        except Exception as e:
+            # run() reports its own errors; never let one kill a pool thread
+            print(f"Unhandled error in {type(self).__name__}: {e}")
+        finally:
+            self.state = self.DONE
+
+    def run(self):
+        raise NotImplementedError
+
+    def operation_name(self):
+        """What this job does, as shown in profiles"""
+        return type(self).__name__
+
+    def is_running(self):
+        return self.state in (self.QUEUED, self.RUNNING)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.is_cancelled():
+            raise WorkerCancelled()
+
+
+class Subscription:
+    """A caller's interest in an in-flight worker"""
+
+    def __init__(self, registry, key, worker, slots):
+        self.registry = registry
+        self.key = key
+        self.worker = worker
+        self.slots = slots
+
+    def is_active(self):
+        """True while the worker is still in flight for this key"""
+        return self.worker is not None and self.registry.workers.get(self.key) is self.worker
+
+    def cancel(self):
+        """Stop receiving results; the worker is cancelled once nobody listens"""
+        for name, slot in self.slots.items():
+            try:
+                getattr(self.worker, name).disconnect(slot)
+            except TypeError:
+                pass
+        self.registry.release(self.key, self.worker)
+
+    def close_if_finished(self):
+        """Let go of a worker that has reported back.
+
+        Disconnects the slots so a finished worker no longer references the
+        widgets it reported to and can be freed. Returns True if it did.
+        """
+        if self.worker is None or self.is_active():
+            return False
+        self.cancel()
+        self.worker = None
+        self.slots = {}
+        return True
+
+
+class InFlightRegistry:
+    """Shares one running worker between callers asking for the same key"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.workers = {}
+        self.subscribers = {}
+
+    def subscribe(self, key, factory, priority=USER, **slots):
+        """Connect `slots` (signal name -> callable) to the worker for `key`.
+
+        Reuses a running worker for the same key, otherwise creates one with
+        `factory()` and starts it. Joining a background job with a user
+        request raises the job's priority.
+        """
+        with self.lock:
+            worker = self.workers.get(key)
+            is_new = worker is None or worker.is_cancelled()
+            if is_new:
+                worker = factory()
+                self.workers[key] = worker
+                self.subscribers[worker] = 0
+
+                # Forget the worker as soon as it reports back
+                for name in ('finished', 'error'):
+                    getattr(worker, name).connect(
+                        lambda *args, w=worker: self.discard(key, w),
+                        Qt.ConnectionType.DirectConnection
+                    )
+
+            for name, slot in slots.items():
+                getattr(worker, name).connect(slot)
+            self.subscribers[worker] += 1
+            if not is_new:
+                worker.priority = min(worker.priority, priority)
+
+        if is_new:
+            worker.start(priority)
+        return Subscription(self, key, worker, slots)
+
+    def release(self, key, worker):
+        with self.lock:
+            if worker not in self.subscribers:
+                return
+            self.subscribers[worker] -= 1
+            if self.subscribers[worker] > 0:
+                return
+            del self.subscribers[worker]
+            if self.workers.get(key) is worker:
+                del self.workers[key]
+
+            if worker.is_running():
+                worker.cancel()
+
+    def discard(self, key, worker):
+        with self.lock:
+            if self.workers.get(key) is worker:
+                del self.workers[key]
+            self.subscribers.pop(worker, None)
+
+
+# Shared by every tab so identical requests coalesce across the app
+IN_FLIGHT = InFlightRegistry()
@@ -0,0 +1,284 @@
+"""Read-only local HTTP API over the cached feeds, run as `python -m app serve`.
+
+Endpoints (all GET/HEAD):
+
+    /api/channels                 cached channels with their TTL state
+    /api/channels/<cache key>     one channel's videos
+    /api/subreddits               cached subreddits
+    /api/subreddits/<name>        one subreddit's posts
+    /api/comments/<post id>       a post's details and top comments (posts opened
+                                  in the GUI, or fetched with `fetch --comments`)
+    /thumbnails/<video id>.jpg    a downloaded thumbnail
+
+Nothing here touches the network: it serves whatever the GUI or
+`python -m app fetch` last wrote. Responses carry an ETag (answered with
+304 on If-None-Match), a Cache-Control max-age matching the entry's
+remaining TTL, and are gzip-compressed when the client accepts it.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .logic.cache_store import (COMMENTS_CACHE_FILE, REDDIT_CACHE_FILE, YOUTUBE_CACHE_FILE,
+                                YOUTUBE_FOLDER, read_json, read_reddit_cache, reddit_ttl, youtube_ttl)
+
+# Smaller bodies are not worth compressing
+GZIP_MIN_SIZE = 1024
+THUMBNAIL_MAX_AGE = 24 * 3600
+SAFE_ID = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class NotFound(Exception):
+    pass
+
+
+class Response:
+    """An encoded JSON body with its ETag and gzip variant, built once per cache version"""
+
+    def __init__(self, payload, stale_at=None):
+        self.body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+        self.stale_at = stale_at
+        self.gzipped = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN_SIZE else None
+
+    def max_age(self):
+        """Seconds until the entry behind this response goes stale, at send time"""
+        if self.stale_at is None:
+            return 0
+        return max(0, int(self.stale_at - time.time()))
+
+
+class FeedStore:
+    """Cache files loaded on demand and reloaded only when they change on disk"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = {}
+        self.responses = {}
+
+    def version(self, path):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def load(self, path, read):
+        version = self.version(path)
+        with self.lock:
+            cached = self.files.get(path)
+            if cached and cached[0] == version:
+                return cached[1]
+        data = read(path) if version else {}
+        with self.lock:
+            self.files[path] = (version, data)
+        return data
+
+    def response(self, route, path, read, build):
+        """Response for `route`, rebuilt only after the file behind it changed"""
+        version = self.version(path)
+        with self.lock:
+            cached = self.responses.get(route)
+            if cached and cached[0] == version:
+                return cached[1]
+        response = build(self.load(path, read))
+        with self.lock:
+            self.responses[route] = (version, response)
+        return response
+
+
+def stale_at(policy, entry):
+    return entry.get('timestamp', 0) + policy.current(entry)
+
+
+def cache_state(policy, entry):
+    ttl = entry.get('ttl', {})
+    return {
+        'fetched_at': entry.get('timestamp'),
+        'ttl_seconds': policy.current(entry),
+        'ttl_reason': ttl.get('reason'),
+        'stale_at': stale_at(policy, entry)
+    }
+
+
+def public_video(video):
+    """A cached video with its local thumbnail path swapped for a server URL"""
+    video = {key: value for key, value in video.items() if key != 'thumbnail_path'}
+    if os.path.exists(os.path.join(YOUTUBE_FOLDER, f"{video['id']}.jpg")):
+        video['thumbnail_local_url'] = f"/thumbnails/{video['id']}.jpg"
+    return video
+
+
+def channel_list(cache):
+    channels = []
+    for key, entry in cache.items():
+        videos = entry.get('videos', [])
+        channels.append({
+            'key': key,
+            'channel_url': entry.get('channel_url', ''),
+            'channel_title': videos[0].get('channel_title', '') if videos else '',
+            'video_count': len(videos),
+            **cache_state(youtube_ttl(), entry)
+        })
+    return Response({'channels': channels})
+
+
+def channel_detail(cache, key):
+    entry = cache.get(key)
+    if entry is None:
+        raise NotFound(f"Unknown channel: {key}")
+    return Response({
+        'key': key,
+        'channel_url': entry.get('channel_url', ''),
+        **cache_state(youtube_ttl(), entry),
+        'videos': [public_video(video) for video in entry.get('videos', [])]
+    }, stale_at(youtube_ttl(), entry))
+
+
+def subreddit_list(cache):
+    subreddits = [{
+        'name': name,
+        'post_count': len(entry.get('last_fetch', [])),
+        'method': entry.get('method'),
+        **cache_state(reddit_ttl(), entry)
+    } for name, entry in cache.items()]
+    return Response({'subreddits': subreddits})
+
+
+def subreddit_detail(cache, name):
+    entry = cache.get(name)
+    if entry is None:
+        raise NotFound(f"Unknown subreddit: {name}")
+    return Response({
+        'name': name,
+        'method': entry.get('method'),
+        **cache_state(reddit_ttl(), entry),
+        'posts': entry.get('last_fetch', [])
+    }, stale_at(reddit_ttl(), entry))
+
+
+def comment_thread(cache, post_id):
+    entry = cache.get(post_id)
+    if entry is None:
+        raise NotFound(f"No cached comments for post: {post_id}")
+    return Response(entry)
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'ContentAggregator'
+    store = None  # set by serve()
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        try:
+            if path.startswith('/thumbnails/'):
+                self.send_thumbnail(path[len('/thumbnails/'):], head)
+            else:
+                self.send_json(self.route(path.split('/')[1:]), head)
+        except NotFound as e:
+            self.send_error_json(404, str(e), head)
+        except Exception as e:
+            print(f"Error serving {self.path}: {e}")
+            self.send_error_json(500, str(e), head)
+
+    def route(self, parts):
+        store = self.store
+        if parts[:1] != ['api'] or len(parts) not in (2, 3):
+            raise NotFound(f"Unknown path: {self.path}")
+
+        name, key = parts[1], parts[2] if len(parts) == 3 else None
+        if name == 'channels':
+            if key is None:
+                return store.response('channels', YOUTUBE_CACHE_FILE, read_json, channel_list)
+            return store.response(f'channels/{key}', YOUTUBE_CACHE_FILE, read_json,
+                                  lambda cache: channel_detail(cache, key))
+        if name == 'subreddits':
+            if key is None:
+                return store.response('subreddits', REDDIT_CACHE_FILE, read_reddit_cache, subreddit_list)
+            return store.response(f'subreddits/{key}', REDDIT_CACHE_FILE, read_reddit_cache,
+                                  lambda cache: subreddit_detail(cache, key))
+        if name == 'comments' and key is not None:
+            return store.response(f'comments/{key}', COMMENTS_CACHE_FILE, read_json,
+                                  lambda cache: comment_thread(cache, key))
+        raise NotFound(f"Unknown path: {self.path}")
+
+    def accepts_gzip(self):
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def not_modified(self, etag):
+        return etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+
+    def send_json(self, response, head):
+        body, etag = response.body, response.etag
+        use_gzip = response.gzipped is not None and self.accepts_gzip()
+        if use_gzip:
+            body, etag = response.gzipped, f'{etag[:-1]}-gzip"'
+
+        if self.not_modified(etag):
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', f'public, max-age={response.max_age()}')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        if not head and not self.not_modified(etag):
+            self.wfile.write(body)
+
+    def send_thumbnail(self, name, head):
+        video_id, extension = os.path.splitext(name)
+        path = os.path.join(YOUTUBE_FOLDER, name)
+        if extension != '.jpg' or not SAFE_ID.match(video_id) or not os.path.isfile(path):
+            raise NotFound(f"Unknown thumbnail: {name}")
+
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if self.not_modified(etag):
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(stat.st_size))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', f'public, max-age={THUMBNAIL_MAX_AGE}')
+        self.end_headers()
+        if not head and not self.not_modified(etag):
+            with open(path, 'rb') as f:
+                self.wfile.write(f.read())
+
+    def send_error_json(self, status, message, head):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def do_POST(self):
+        self.send_error_json(405, "This API is read-only", False)
+
+    do_PUT = do_DELETE = do_PATCH = do_POST
+
+
+def serve(host='127.0.0.1', port=8765):
+    """Serve the caches until interrupted"""
+    FeedRequestHandler.store = FeedStore()
+    server = ThreadingHTTPServer((host, port), FeedRequestHandler)
+    print(f"Serving cached feeds on http://{host}:{server.server_port}/api/channels", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,362 @@
+"""Local stand-in for the YouTube Data API and Reddit, run as `python -m app standin`.
+
+Implements the endpoints the app uses (YouTube `search`, `channels`,
+`playlistItems` and `videos`; Reddit `hot.json`, `new.json`, `comments`, `api/info`
+and the OAuth token endpoint that PRAW needs) from fixture data, seeded from the existing
+cache files or generated at any size. Point the app at it with:
+
+    YOUTUBE_API_URL=http://127.0.0.1:8766/youtube/v3
+    REDDIT_API_URL=http://127.0.0.1:8766
+    REDDIT_URL=http://127.0.0.1:8766  REDDIT_OAUTH_URL=http://127.0.0.1:8766
+
+Every response can be delayed (`latency` plus up to `jitter` seconds) and a
+share of requests can fail with `error_status`, drawn from a seeded random
+generator so runs are repeatable.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from .logic.cache_store import (COMMENTS_CACHE_FILE, REDDIT_CACHE_FILE, YOUTUBE_CACHE_FILE, YOUTUBE_FOLDER,
+                                read_json, read_reddit_cache)
+
+
+def channel_id_for(key):
+    return 'UC' + hashlib.md5(key.encode()).hexdigest()[:22]
+
+
+def iso_date(value):
+    """ISO timestamp for a cached 'Sep 10, 2025' style date"""
+    try:
+        dt = datetime.strptime(value, '%b %d, %Y').replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        dt = datetime.now(timezone.utc)
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def raw_post(post):
+    """Reddit 't3' data for a cached post dict"""
+    data = {key: value for key, value in post.items()
+            if key not in ('created_formatted', 'score_formatted', 'comments_formatted', 'post_type', 'nsfw')}
+    data['over_18'] = post.get('nsfw', False)
+    data['name'] = f"t3_{post['id']}"
+    data.setdefault('thumbnail', 'self' if post.get('is_self') else 'default')
+    return data
+
+
+def raw_comment(comment, replies=None):
+    data = {key: value for key, value in comment.items() if key not in ('created_formatted', 'replies')}
+    data['name'] = f"t1_{comment['id']}"
+    data['replies'] = listing([{'kind': 't1', 'data': raw_comment(reply)} for reply in replies]) if replies else ''
+    return data
+
+
+def listing(children, after=None):
+    return {'kind': 'Listing', 'data': {'children': children, 'after': after, 'before': None}}
+
+
+class Fixtures:
+    """Channels, subreddits and comment threads served by the stand-in"""
+
+    def __init__(self):
+        # channel id -> {'title', 'handle', 'username', 'videos': [video dicts]}
+        self.channels = {}
+        # subreddit -> [post dicts]
+        self.subreddits = {}
+        # post id -> (post dict, [comment dicts with 'replies'])
+        self.comments = {}
+        # video id -> (channel, video dict), built on first lookup
+        self.videos = None
+        # post id -> post dict, built on first lookup
+        self.posts = None
+
+    @classmethod
+    def from_cache(cls):
+        """Fixtures seeded from youtube_data/ and reddit_data/"""
+        fixtures = cls()
+        for key, entry in read_json(YOUTUBE_CACHE_FILE).items():
+            videos = entry.get('videos', [])
+            kind, _, name = key.partition('_')
+            channel_id = name if kind == 'channel_id' else channel_id_for(key)
+            fixtures.channels[channel_id] = {
+                'title': videos[0].get('channel_title', key) if videos else key,
+                'handle': name if kind in ('handle', 'custom') else None,
+                'username': name if kind == 'username' else None,
+                'videos': videos
+            }
+        for name, entry in read_reddit_cache(REDDIT_CACHE_FILE).items():
+            fixtures.subreddits[name] = entry.get('last_fetch', [])
+        for post_id, entry in read_json(COMMENTS_CACHE_FILE).items():
+            fixtures.comments[post_id] = (entry['post'], entry['comments'])
+        return fixtures
+
+    @classmethod
+    def synthetic(cls, channels=1, videos=20, subreddits=1, posts=10, comments=5, replies=2):
+        """Generated fixtures of any size; channel N has the handle @standinN"""
+        fixtures = cls()
+        now = time.time()
+        for c in range(channels):
+            channel_id = channel_id_for(f"standin{c}")
+            fixtures.channels[channel_id] = {
+                'title': f"Stand-in channel {c}",
+                'handle': f"standin{c}",
+                'username': None,
+                'videos': [{
+                    'id': f"v{c}x{v}",
+                    'title': f"Video {v} of channel {c}",
+                    'description': f"Description of video {v}. " * 10,
+                    'published_at': datetime.fromtimestamp(now - v * 3600, timezone.utc).strftime('%b %d, %Y'),
+                    'channel_title': f"Stand-in channel {c}",
+                    'view_count': (v * 7919) % 1000000
+                } for v in range(videos)]
+            }
+        for s in range(subreddits):
+            name = 'popular' if s == 0 else f"standin{s}"
+            fixtures.subreddits[name] = []
+            for p in range(posts):
+                post = {
+                    'id': f"p{s}x{p}", 'title': f"Post {p} in r/{name}", 'author': f"user{p % 97}",
+                    'subreddit': name, 'score': (p * 104729) % 50000, 'upvote_ratio': 0.9,
+                    'num_comments': (p * 31) % 2000, 'created_utc': now - p * 60,
+                    'url': f"https://example.com/{s}/{p}", 'permalink': f"/r/{name}/comments/p{s}x{p}/",
+                    'selftext': '' if p % 2 else f"Text of post {p}. " * 5, 'is_self': p % 2 == 0,
+                    'domain': f"self.{name}" if p % 2 == 0 else 'example.com', 'gilded': 0,
+                    'locked': False, 'stickied': False, 'nsfw': p % 50 == 49
+                }
+                fixtures.subreddits[name].append(post)
+                fixtures.comments[post['id']] = (post, [{
+                    'id': f"{post['id']}c{i}", 'author': f"user{i}", 'body': f"Comment {i} on post {p}",
+                    'score': 100 - i, 'created_utc': now - i, 'is_submitter': False, 'gilded': 0,
+                    'replies': [{
+                        'id': f"{post['id']}c{i}r{r}", 'author': f"user{r}", 'body': f"Reply {r}",
+                        'score': 10 - r, 'created_utc': now - r, 'is_submitter': False, 'gilded': 0
+                    } for r in range(replies)]
+                } for i in range(comments)])
+        return fixtures
+
+    def videos_by_id(self):
+        if self.videos is None:
+            self.videos = {video['id']: (channel, video)
+                           for channel in self.channels.values() for video in channel['videos']}
+        return self.videos
+
+    def posts_by_id(self):
+        if self.posts is None:
+            self.posts = {post['id']: post for posts in self.subreddits.values() for post in posts}
+        return self.posts
+
+    def find_channel(self, handle=None, username=None):
+        for channel_id, channel in self.channels.items():
+            if (handle and channel['handle'] == handle) or (username and channel['username'] == username):
+                return channel_id
+        return None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = 'StandIn'
+    fixtures = None
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    error_status = 503
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.handle_request()
+
+    def handle_request(self):
+        with self.rng_lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return self.send_json({'error': 'injected failure'}, self.error_status)
+
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip('/')
+        if path.endswith('.json'):
+            path = path[:-len('.json')]
+        parts = path.split('/')[1:]
+        try:
+            if parts[:2] == ['youtube', 'v3'] and len(parts) == 3:
+                payload = getattr(self, f"youtube_{parts[2]}")(params)
+            elif parts[:1] == ['thumbnails']:
+                return self.send_thumbnail(parts[-1])
+            elif len(parts) == 3 and parts[0] == 'r' and parts[2] in ('hot', 'new'):
+                payload = self.reddit_listing(parts[1], params, parts[2])
+            elif parts[:1] == ['comments'] and len(parts) >= 2:
+                payload = self.reddit_comments(parts[1])
+            elif path == '/api/info':
+                payload = self.reddit_info(params)
+            elif path == '/api/v1/access_token':
+                payload = {'access_token': 'standin', 'token_type': 'bearer', 'expires_in': 3600, 'scope': '*'}
+            else:
+                raise KeyError(path)
+        except (KeyError, AttributeError):
+            return self.send_json({'error': 'not found'}, 404)
+        self.send_json(payload)
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_thumbnail(self, name):
+        path = os.path.join(YOUTUBE_FOLDER, name)
+        if not os.path.isfile(path):
+            path = self.server.default_thumbnail
+        body = b''
+        if path:
+            with open(path, 'rb') as f:
+                body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # YouTube Data API
+
+    def youtube_search(self, params):
+        channel_id = self.fixtures.find_channel(handle=params.get('q', '').lstrip('@'))
+        return {'items': [{'snippet': {'channelId': channel_id}}] if channel_id else []}
+
+    def youtube_channels(self, params):
+        channel_id = params.get('id') or self.fixtures.find_channel(
+            handle=params.get('forHandle'), username=params.get('forUsername'))
+        channel = self.fixtures.channels.get(channel_id)
+        if channel is None:
+            return {'items': []}
+        return {'items': [{
+            'id': channel_id,
+            'snippet': {'title': channel['title']},
+            'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + channel_id[2:]}}
+        }]}
+
+    def youtube_playlistItems(self, params):
+        channel = self.fixtures.channels['UC' + params['playlistId'][2:]]
+        start = int(params.get('pageToken') or 0)
+        end = start + min(50, int(params.get('maxResults', 5)))
+        base = f"http://{self.headers.get('Host')}/thumbnails"
+        items = [{
+            'snippet': {
+                'title': video.get('title', ''),
+                'description': video.get('description', ''),
+                'publishedAt': iso_date(video.get('published_at')),
+                'thumbnails': {'high': {'url': f"{base}/{video['id']}.jpg"}},
+                'channelTitle': channel['title']
+            },
+            'contentDetails': {'videoId': video['id']}
+        } for video in channel['videos'][start:end]]
+        response = {'items': items, 'pageInfo': {'totalResults': len(channel['videos'])}}
+        if end < len(channel['videos']):
+            response['nextPageToken'] = str(end)
+        return response
+
+    def youtube_videos(self, params):
+        parts = params.get('part', 'statistics').split(',')
+        videos = self.fixtures.videos_by_id()
+        items = []
+        for video_id in params.get('id', '').split(','):
+            if video_id not in videos:
+                continue
+            channel, video = videos[video_id]
+            views = video.get('view_count', 0)
+            item = {'id': video_id}
+            if 'statistics' in parts:
+                item['statistics'] = {'viewCount': str(views), 'likeCount': str(views // 25),
+                                      'commentCount': str(views // 400)}
+            if 'snippet' in parts:
+                item['snippet'] = {
+                    'title': video.get('title', ''),
+                    'description': video.get('description', ''),
+                    'publishedAt': iso_date(video.get('published_at')),
+                    'channelTitle': channel['title'],
+                    'tags': video.get('title', '').lower().split()[:5]
+                }
+            if 'contentDetails' in parts:
+                item['contentDetails'] = {'duration': f"PT{views % 47 + 1}M{views % 60}S"}
+            items.append(item)
+        return {'items': items}
+
+    # Reddit
+
+    def reddit_listing(self, subreddit, params, sort='hot'):
+        posts = self.fixtures.subreddits[subreddit]
+        if sort == 'new':
+            posts = sorted(posts, key=lambda post: post.get('created_utc', 0), reverse=True)
+        start = 0
+        if params.get('after'):
+            start = next((i + 1 for i, post in enumerate(posts) if f"t3_{post['id']}" == params['after']), len(posts))
+        page = posts[start:start + int(params.get('limit', 25))]
+        after = f"t3_{page[-1]['id']}" if page and start + len(page) < len(posts) else None
+        return listing([{'kind': 't3', 'data': raw_post(post)} for post in page], after)
+
+    def reddit_info(self, params):
+        posts = self.fixtures.posts_by_id()
+        # Like Reddit, only the first 100 names are looked up
+        names = params.get('id', '').split(',')[:100]
+        found = [posts[name[3:]] for name in names if name.startswith('t3_') and name[3:] in posts]
+        return listing([{'kind': 't3', 'data': raw_post(post)} for post in found])
+
+    def reddit_comments(self, post_id):
+        post, comments = self.fixtures.comments[post_id]
+        return [
+            listing([{'kind': 't3', 'data': raw_post(post)}]),
+            listing([{'kind': 't1', 'data': raw_comment(comment, comment.get('replies'))} for comment in comments])
+        ]
+
+
+def start_standin(fixtures, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                  error_rate=0.0, error_status=503, seed=0):
+    """Start a stand-in server on a background thread and return it.
+
+    `server.base_url` is its address; call `server.shutdown()` when done.
+    """
+    handler = type('ConfiguredStandInHandler', (StandInHandler,), {
+        'fixtures': fixtures,
+        'latency': latency,
+        'jitter': jitter,
+        'error_rate': error_rate,
+        'error_status': error_status,
+        'rng': random.Random(seed),
+        'rng_lock': threading.Lock()
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.base_url = f"http://{host}:{server.server_port}"
+    thumbnails = sorted(name for name in os.listdir(YOUTUBE_FOLDER) if name.endswith('.jpg')) \
+        if os.path.isdir(YOUTUBE_FOLDER) else []
+    server.default_thumbnail = os.path.join(YOUTUBE_FOLDER, thumbnails[0]) if thumbnails else None
+    threading.Thread(target=server.serve_forever, name='standin', daemon=True).start()
+    return server
+
+
+def standin_environment(base_url):
+    """Environment variables that point the app at a stand-in server"""
+    return {
+        'YOUTUBE_API_URL': f"{base_url}/youtube/v3",
+        'REDDIT_API_URL': base_url,
+        'REDDIT_URL': base_url,
+        'REDDIT_OAUTH_URL': base_url
+    }
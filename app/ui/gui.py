@@ -1,19 +1,43 @@
-﻿from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
+﻿import time
+from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QMessageBox, 
-                            QProgressBar, QStackedWidget)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
-from ..logic.reddit_handler import RedditWorker
+                            QProgressBar, QStackedWidget, QFileDialog)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont, QKeySequence
+from ..logic.cache_store import load_cached_posts, load_last_viewed_channel
+from ..logic.feed_view import POST_FILTERS, POST_SORTS
+from ..logic.metrics import METRICS
+from ..logic.search_index import SEARCH_INDEX
+from ..logic.reddit_handler import RedditCountsWorker, RedditWorker, counts_key, posts_key
+from ..logic.scheduler import BACKGROUND, USER
+from ..logic.workers import IN_FLIGHT
 from .reddit.reddit_post_viewer import RedditPostViewer
 from .shared.custom_scroll import CustomScrollArea
 from .youtube.youtube_widgets import YouTubeTab
 from .reddit.reddit_widgets import RedditPostFrame
+from .shared.feed_controls import FeedControls
+from .shared.feed_updates import apply_feed_update, clear_layout
+from .shared.lazy_tab import LazyTab
+from .shared.search_panel import SearchPanel
 
 class RedditTab(QWidget):
+    # Scores and comment counts of the shown posts are refreshed this often
+    COUNTS_REFRESH_MS = 2 * 60 * 1000
+    
     def __init__(self):
         super().__init__()
+        self.post_frames = {}
+        self.background_load = False
+        self.subscription = None
+        self.counts_subscription = None
+        # Set once a counts refresh fails, so a streak of failures is reported once
+        self.counts_failing = False
         self.init_ui()
         
+        self.counts_timer = QTimer(self)
+        self.counts_timer.timeout.connect(self.refresh_counts)
+        self.counts_timer.start(self.COUNTS_REFRESH_MS)
+        
     def init_ui(self):
         # Use stacked widget to switch between post list and post viewer
         self.stacked_widget = QStackedWidget()
@@ -21,13 +45,11 @@ class RedditTab(QWidget):
         # Create post list page
         self.post_list_page = self.create_post_list_page()
         
-        # Create post viewer page
-        self.post_viewer_page = RedditPostViewer()
-        self.post_viewer_page.back_clicked.connect(self.show_post_list)
+        # Post viewer page is created the first time a post is opened
+        self.post_viewer_page = None
         
         # Add pages to stack
         self.stacked_widget.addWidget(self.post_list_page)
-        self.stacked_widget.addWidget(self.post_viewer_page)
         
         # Main layout
         layout = QVBoxLayout()
@@ -51,28 +73,8 @@ class RedditTab(QWidget):
         
         self.load_button = QPushButton("🔄 Load Top 10 Posts from Reddit")
         self.load_button.setMinimumHeight(45)
-        self.load_button.setStyleSheet("""
-            QPushButton {
-                background-color: #0078d4;
-                color: #ffffff;
-                border: none;
-                padding: 12px 20px;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            QPushButton:disabled {
-                background-color: #666666;
-                color: #999999;
-            }
-        """)
-        self.load_button.clicked.connect(self.load_posts)
+        self.load_button.setObjectName("primaryButton")
+        self.load_button.clicked.connect(lambda: self.load_posts())
         
         header_layout.addWidget(self.load_button)
         header_layout.addStretch()
@@ -80,23 +82,11 @@ class RedditTab(QWidget):
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #555555;
-                border-radius: 8px;
-                text-align: center;
-                background-color: #404040;
-                height: 20px;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d4;
-                border-radius: 6px;
-            }
-        """)
+        self.progress_bar.setObjectName("loadProgress")
         
         # Status label
         self.status_label = QLabel("Click 'Load Top 10 Posts' to get started")
-        self.status_label.setStyleSheet("color: #cccccc; padding: 10px; font-size: 12px;")
+        self.status_label.setObjectName("statusLabel")
         
         # Scroll area for posts
         self.scroll_area = CustomScrollArea()
@@ -108,66 +98,178 @@ class RedditTab(QWidget):
         self.scroll_area.setWidget(self.scroll_content)
         self.scroll_area.setWidgetResizable(True)
         
+        # Search over every cached post and comment, shown in place of the feed
+        self.search_panel = SearchPanel(
+            "🔎 Search cached posts and comments...", SEARCH_INDEX.search_posts, self.create_post_frame,
+            self.scroll_area
+        )
+        
+        # Sort and filter the loaded posts without fetching them again
+        self.feed_controls = FeedControls(POST_SORTS, POST_FILTERS, self.scroll_layout, lambda: self.post_frames)
+        
         layout.addLayout(header_layout)
         layout.addWidget(self.progress_bar)
         layout.addWidget(self.status_label)
-        layout.addWidget(self.scroll_area)
+        layout.addWidget(self.feed_controls)
+        layout.addWidget(self.search_panel)
         
         page.setLayout(layout)
         return page
     
-    def load_posts(self):
+    def load_posts(self, background=False):
+        # A refresh is already running, let it finish
+        if self.subscription and self.subscription.is_active():
+            if not background:
+                # The user is now waiting on it, move it ahead of background work
+                self.background_load = False
+                self.subscription.worker.priority = USER
+            return
+        
+        self.background_load = background
         self.load_button.setEnabled(False)
         self.load_button.setText("⏳ Loading...")
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         
-        # Clear previous posts
-        for i in reversed(range(self.scroll_layout.count())):
-            child = self.scroll_layout.itemAt(i)
-            if child.widget():
-                child.widget().setParent(None)
+        # Clear previous posts, unless they are about to be refreshed in place
+        if not self.post_frames:
+            clear_layout(self.scroll_layout)
         
-        # Start worker thread
-        self.worker = RedditWorker()
-        self.worker.progress.connect(self.update_status)
-        self.worker.finished.connect(self.on_posts_loaded)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        # Share the fetch with any other caller loading the same feed
+        if self.subscription:
+            self.subscription.cancel()
+        self.subscription = IN_FLIGHT.subscribe(
+            posts_key(),
+            RedditWorker,
+            priority=BACKGROUND if background else USER,
+            progress=self.update_status,
+            cached=self.on_posts_cached,
+            finished=self.on_posts_loaded,
+            error=self.on_error
+        )
     
     def update_status(self, message):
         self.status_label.setText(message)
     
+    def create_post_frame(self, post):
+        post_frame = RedditPostFrame(post)
+        post_frame.post_clicked.connect(self.show_post_details)
+        return post_frame
+    
+    def add_post_frames(self, posts):
+        with METRICS.span('ui.reddit_cards'):
+            for post in posts:
+                post_frame = self.create_post_frame(post)
+                self.post_frames[post['id']] = post_frame
+                self.scroll_layout.addWidget(post_frame)
+            
+            self.scroll_layout.addStretch()
+        self.feed_controls.set_items(posts)
+    
+    def on_posts_cached(self, posts):
+        """Show stale cached posts while the worker refreshes them"""
+        if self.post_frames:
+            apply_feed_update(self.scroll_layout, self.post_frames, posts, self.create_post_frame, 'post_data')
+            self.feed_controls.set_items(posts)
+        else:
+            self.add_post_frames(posts)
+    
+    def show_cached(self, posts):
+        """Render posts from a previous session before any network activity"""
+        if not posts:
+            return
+        self.add_post_frames(posts)
+        self.status_label.setText(f"Showing {len(posts)} cached posts from your last session")
+    
     def on_posts_loaded(self, posts):
+        # Errors are followed by finished, so the worker is let go only here
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
         self.progress_bar.setVisible(False)
         self.load_button.setEnabled(True)
         self.load_button.setText("🔄 Load Top 10 Posts from Reddit")
         
+        if posts and self.post_frames:
+            # Cached posts are already on screen, only swap what changed
+            updated = apply_feed_update(self.scroll_layout, self.post_frames, posts, self.create_post_frame, 'post_data')
+            self.feed_controls.set_items(posts)
+            self.status_label.setText(f"✅ Loaded {len(posts)} posts, {updated} updated (click any post to view details)")
+            return
+        
+        # Remove any stale cards before showing the final result
+        clear_layout(self.scroll_layout)
+        self.post_frames = {}
+        self.feed_controls.set_items([])
+        
         if not posts:
             self.status_label.setText("No posts found.")
             no_posts_label = QLabel("No posts found.")
-            no_posts_label.setStyleSheet("color: #999999; padding: 40px; text-align: center; font-size: 14px;")
+            no_posts_label.setObjectName("emptyFeed")
             no_posts_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.scroll_layout.addWidget(no_posts_label)
+            self.scroll_layout.addStretch()
         else:
             self.status_label.setText(f"✅ Loaded {len(posts)} posts (click any post to view details)")
-            
-            for post in posts:
-                post_frame = RedditPostFrame(post)
-                post_frame.post_clicked.connect(self.show_post_details)
-                self.scroll_layout.addWidget(post_frame)
-        
-        self.scroll_layout.addStretch()
+            self.add_post_frames(posts)
     
     def on_error(self, error_message):
         self.progress_bar.setVisible(False)
         self.load_button.setEnabled(True)
         self.load_button.setText("🔄 Load Top 10 Posts from Reddit")
+        if self.background_load:
+            # Don't interrupt with a dialog for refreshes the user didn't ask for
+            self.status_label.setText(f"❌ Refresh failed: {error_message}")
+            return
         self.status_label.setText("❌ Error occurred")
         QMessageBox.critical(self, "Error", error_message)
     
+    def refresh_counts(self):
+        """Update scores and comment counts of the shown posts without listing them again"""
+        # The timer keeps firing while another tab is shown, skip those refreshes;
+        # a running load brings new numbers anyway
+        if not self.post_frames or not self.isVisible():
+            return
+        if self.subscription and self.subscription.is_active():
+            return
+        if self.counts_subscription and self.counts_subscription.is_active():
+            return
+        self.counts_subscription = IN_FLIGHT.subscribe(
+            counts_key(),
+            RedditCountsWorker,
+            priority=BACKGROUND,
+            finished=self.on_counts_refreshed,
+            error=self.on_counts_error
+        )
+    
+    def on_counts_refreshed(self, changed):
+        if self.counts_subscription and self.counts_subscription.close_if_finished():
+            self.counts_subscription = None
+        self.counts_failing = False
+        updated = 0
+        for post_id, post in changed.items():
+            frame = self.post_frames.get(post_id)
+            if frame is not None:
+                frame.update_counts(post)
+                updated += 1
+        if updated:
+            # Sorting by score or comments follows the new numbers
+            self.feed_controls.set_items([frame.post_data for frame in self.post_frames.values()])
+    
+    def on_counts_error(self, error_message):
+        if self.counts_subscription and self.counts_subscription.close_if_finished():
+            self.counts_subscription = None
+        # The old numbers stay up and the next refresh tries again, so say it once until one succeeds
+        if not self.counts_failing:
+            self.counts_failing = True
+            self.status_label.setText(f"❌ {error_message}")
+    
     def show_post_details(self, post_data):
         """Switch to post viewer and load the selected post"""
+        if self.post_viewer_page is None:
+            self.post_viewer_page = RedditPostViewer()
+            self.post_viewer_page.back_clicked.connect(self.show_post_list)
+            self.stacked_widget.addWidget(self.post_viewer_page)
+        
         self.post_viewer_page.load_post(post_data)
         self.stacked_widget.setCurrentWidget(self.post_viewer_page)
     
@@ -178,7 +280,103 @@ class RedditTab(QWidget):
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.start_time = time.perf_counter()
+        self.time_to_content_ms = None
+        self.first_paint_ms = None
+        self.first_paint_done = False
+        self.metrics_panel = None
         self.init_ui()
+        self.init_debug_menu()
+        self.warm_start()
+    
+    def warm_start(self):
+        """Render the last known channel straight from the on-disk cache"""
+        channel_url, videos = load_last_viewed_channel()
+        self.youtube_tab.show_cached(channel_url, videos)
+        self.time_to_content_ms = (time.perf_counter() - self.start_time) * 1000
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            # Network refreshes wait until the window has been drawn once
+            self.first_paint_done = True
+            self.first_paint_ms = (time.perf_counter() - self.start_time) * 1000
+            QTimer.singleShot(0, self.refresh_after_start)
+    
+    def refresh_after_start(self):
+        """Revalidate warm-started feeds in the background"""
+        if self.youtube_tab.video_frames:
+            self.youtube_tab.load_videos(background=True)
+        if self.reddit_tab and self.reddit_tab.post_frames:
+            self.reddit_tab.load_posts(background=True)
+    
+    def init_debug_menu(self):
+        """Developer tools, built only when first used"""
+        debug_menu = self.menuBar().addMenu("Debug")
+        metrics_action = debug_menu.addAction("Metrics")
+        metrics_action.setShortcut(QKeySequence("Ctrl+Shift+M"))
+        metrics_action.triggered.connect(self.toggle_metrics_panel)
+        
+        self.stall_action = debug_menu.addAction("Stall Watchdog")
+        self.stall_action.setCheckable(True)
+        self.stall_action.toggled.connect(self.set_stall_watchdog)
+        
+        self.profiler = None
+        self.profile_action = debug_menu.addAction("Start Profiler")
+        self.profile_action.setShortcut(QKeySequence("Ctrl+Shift+P"))
+        self.profile_action.triggered.connect(self.toggle_profiler)
+        debug_menu.aboutToShow.connect(self.sync_debug_menu)
+    
+    def sync_debug_menu(self):
+        from ..logic.stall_watchdog import STALLS
+        self.stall_action.blockSignals(True)
+        self.stall_action.setChecked(STALLS.running)
+        self.stall_action.blockSignals(False)
+    
+    def set_stall_watchdog(self, enabled):
+        """Watch the event loop for stalls; the histogram shows in Debug > Metrics"""
+        from .shared.stall_monitor import stall_monitor
+        if enabled:
+            stall_monitor().start()
+        else:
+            stall_monitor().stop()
+    
+    def toggle_metrics_panel(self):
+        if self.metrics_panel is None:
+            from .shared.metrics_panel import MetricsPanel
+            self.metrics_panel = MetricsPanel(self)
+            self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.metrics_panel)
+            return
+        self.metrics_panel.setVisible(not self.metrics_panel.isVisible())
+    
+    def toggle_profiler(self):
+        """Sample every thread until stopped, then save a flame graph input file"""
+        from ..logic.profiler import SamplingProfiler
+        if self.profiler is None:
+            self.profiler = SamplingProfiler().start()
+            self.profile_action.setText("Stop Profiler...")
+            return
+        
+        profiler, self.profiler = self.profiler.stop(), None
+        self.profile_action.setText("Start Profiler")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Profile", "profile.folded", "Folded stacks (*.folded *.txt)"
+        )
+        if path:
+            profiler.write(path)
+    
+    def create_reddit_tab(self):
+        """Build the Reddit tab on first activation, warm-started from cache"""
+        self.reddit_tab = RedditTab()
+        self.reddit_tab.show_cached(load_cached_posts())
+        if self.first_paint_done and self.reddit_tab.post_frames:
+            QTimer.singleShot(0, lambda: self.reddit_tab.load_posts(background=True))
+        return self.reddit_tab
+    
+    def create_timeline_tab(self):
+        """Build the merged timeline on first activation, starting from the caches"""
+        from .timeline.timeline_widgets import TimelineTab
+        return TimelineTab()
         
     def init_ui(self):
         self.setWindowTitle("Content Aggregator - Enhanced Dark Theme")
@@ -194,44 +392,23 @@ class MainWindow(QMainWindow):
         # App title
         title_label = QLabel("📱 Content Aggregator")
         title_label.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        title_label.setStyleSheet("color: #ffffff; margin-bottom: 10px;")
+        title_label.setObjectName("appTitle")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Create tab widget
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 2px solid #555555;
-                border-radius: 8px;
-                background-color: #3c3c3c;
-                padding: 5px;
-            }
-            QTabBar::tab {
-                background-color: #555555;
-                color: #ffffff;
-                padding: 12px 20px;
-                margin-right: 3px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QTabBar::tab:selected {
-                background-color: #3c3c3c;
-                border-bottom: 3px solid #0078d4;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #666666;
-            }
-        """)
-        
-        # Create tabs
+        self.tab_widget.setObjectName("mainTabs")
+        
+        # Create tabs; hidden ones are only built when first shown
         self.youtube_tab = YouTubeTab()
-        self.reddit_tab = RedditTab()
+        self.reddit_tab = None
+        self.reddit_page = LazyTab(self.create_reddit_tab)
+        self.timeline_page = LazyTab(self.create_timeline_tab)
         
         # Add tabs to tab widget
         self.tab_widget.addTab(self.youtube_tab, "📺 YouTube")
-        self.tab_widget.addTab(self.reddit_tab, "🔗 Reddit")
+        self.tab_widget.addTab(self.reddit_page, "🔗 Reddit")
+        self.tab_widget.addTab(self.timeline_page, "🕒 Timeline")
         
         layout.addWidget(title_label)
         layout.addWidget(self.tab_widget)
\ No newline at end of file
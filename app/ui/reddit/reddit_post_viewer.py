@@ -1,131 +1,123 @@
-import os
-import praw
-from datetime import datetime
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QFrame, QMessageBox, QProgressBar, QTextEdit)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QPixmap
-from dotenv import load_dotenv
+from ...logic.cache_store import COMMENTS_CACHE_FILE, read_json, store_comments, write_json
+from ...logic.engine_bridge import run_on_engine
+from ...logic.metrics import METRICS
+from ...logic.normalize import Comment, Post
+from ...logic.reddit_client import get_reddit_client
+from ...logic.reddit_handler import call_backends
+from ...logic.resilience import retry_call
+from ...logic.workers import IN_FLIGHT, CancellableWorker, WorkerCancelled
 from ..shared.custom_scroll import CustomScrollArea
+from ..shared.feed_updates import clear_layout
 
-load_dotenv()
-
-class CommentWorker(QThread):
+class CommentWorker(CancellableWorker):
     progress = pyqtSignal(str)
-    finished = pyqtSignal(dict, list)
+    finished = pyqtSignal(object, list)
     error = pyqtSignal(str)
     
     def __init__(self, post_data):
         super().__init__()
         self.post_data = post_data
         self.reddit = None
-        self.setup_reddit_client()
     
-    def setup_reddit_client(self):
-        """Setup Reddit client"""
-        try:
-            client_id = os.getenv('REDDIT_CLIENT_ID')
-            client_secret = os.getenv('REDDIT_CLIENT_SECRET')
-            user_agent = os.getenv('REDDIT_USER_AGENT', 'ContentAggregator/1.0 by YourUsername')
-            
-            if client_id and client_secret:
-                self.reddit = praw.Reddit(
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    user_agent=user_agent
-                )
-            else:
-                self.reddit = praw.Reddit(
-                    client_id=None,
-                    client_secret=None,
-                    user_agent=user_agent
-                )
-        except Exception as e:
-            print(f"Error setting up Reddit client: {e}")
-            self.reddit = None
+    def operation_name(self):
+        return f"open post {self.post_data['id']}"
     
-    def format_timestamp(self, timestamp):
-        """Format Unix timestamp to readable date"""
-        try:
-            dt = datetime.fromtimestamp(timestamp)
-            return dt.strftime('%b %d, %Y at %H:%M')
-        except:
-            return "Unknown date"
+    def save_comments(self, post_details, comments):
+        """Keep the thread on disk so other tools can read it from the cache"""
+        cache = read_json(COMMENTS_CACHE_FILE)
+        store_comments(cache, post_details['id'], post_details, comments)
+        write_json(COMMENTS_CACHE_FILE, cache)
+    
+    def comment_from_praw(self, comment):
+        """Comment (without replies) from a PRAW comment"""
+        return Comment(
+            id=comment.id,
+            author=str(comment.author) if comment.author else '[deleted]',
+            body=comment.body,
+            score=comment.score,
+            created_utc=comment.created_utc,
+            is_submitter=comment.is_submitter,
+            gilded=getattr(comment, 'gilded', 0)
+        )
+    
+    def get_comments_with_praw(self):
+        """Post details and top comments using PRAW"""
+        # Reuse this pool thread's Reddit client
+        self.reddit = get_reddit_client()
+        if not self.reddit:
+            raise Exception("Reddit client not available")
+        
+        # Get the submission
+        submission = self.reddit.submission(id=self.post_data['id'])
+        
+        # Get full post data
+        post_details = Post(
+            id=submission.id,
+            title=submission.title,
+            author=str(submission.author) if submission.author else '[deleted]',
+            subreddit=submission.subreddit.display_name,
+            score=submission.score,
+            upvote_ratio=getattr(submission, 'upvote_ratio', 0),
+            num_comments=submission.num_comments,
+            created_utc=submission.created_utc,
+            selftext=submission.selftext,
+            url=submission.url,
+            is_self=submission.is_self,
+            domain=submission.domain,
+            gilded=getattr(submission, 'gilded', 0),
+            locked=submission.locked,
+            stickied=submission.stickied,
+            nsfw=submission.over_18
+        )
+        
+        self.raise_if_cancelled()
+        self.progress.emit("Loading comments...")
+        
+        # Get top 5 comments
+        submission.comments.replace_more(limit=0)  # Remove "load more comments"
+        top_comments = []
+        
+        for comment in submission.comments[:5]:
+            self.raise_if_cancelled()
+            if hasattr(comment, 'body'):
+                comment_data = self.comment_from_praw(comment)
+                comment_data.replies = []
+                
+                # Get top 2 replies for each comment
+                if hasattr(comment, 'replies') and len(comment.replies) > 0:
+                    for reply in comment.replies[:2]:
+                        if hasattr(reply, 'body'):
+                            comment_data.replies.append(self.comment_from_praw(reply))
+                
+                top_comments.append(comment_data)
+    
+        return post_details, top_comments
+    
+    def get_comments_fallback(self):
+        """Post details and top comments from the JSON API on the async engine"""
+        return run_on_engine(lambda engine: engine.reddit_comments(self.post_data['id']), self)
     
     def run(self):
         try:
-            if not self.reddit:
-                self.error.emit("Reddit client not available")
-                return
-            
             self.progress.emit("Loading post details...")
+            (post_details, top_comments), _ = call_backends(self, [
+                ('praw', lambda: retry_call(self.get_comments_with_praw)),
+                ('json_api', self.get_comments_fallback)
+            ], stage='comments')
             
-            # Get the submission
-            submission = self.reddit.submission(id=self.post_data['id'])
-            
-            # Get full post data
-            post_details = {
-                'id': submission.id,
-                'title': submission.title,
-                'author': str(submission.author) if submission.author else '[deleted]',
-                'subreddit': submission.subreddit.display_name,
-                'score': submission.score,
-                'upvote_ratio': getattr(submission, 'upvote_ratio', 0),
-                'num_comments': submission.num_comments,
-                'created_utc': submission.created_utc,
-                'created_formatted': self.format_timestamp(submission.created_utc),
-                'selftext': submission.selftext,
-                'url': submission.url,
-                'is_self': submission.is_self,
-                'domain': submission.domain,
-                'gilded': getattr(submission, 'gilded', 0),
-                'locked': submission.locked,
-                'stickied': submission.stickied,
-                'nsfw': submission.over_18
-            }
-            
-            self.progress.emit("Loading comments...")
-            
-            # Get top 5 comments
-            submission.comments.replace_more(limit=0)  # Remove "load more comments"
-            top_comments = []
-            
-            for comment in submission.comments[:5]:
-                if hasattr(comment, 'body'):
-                    comment_data = {
-                        'id': comment.id,
-                        'author': str(comment.author) if comment.author else '[deleted]',
-                        'body': comment.body,
-                        'score': comment.score,
-                        'created_utc': comment.created_utc,
-                        'created_formatted': self.format_timestamp(comment.created_utc),
-                        'is_submitter': comment.is_submitter,
-                        'gilded': getattr(comment, 'gilded', 0),
-                        'replies': []
-                    }
-                    
-                    # Get top 2 replies for each comment
-                    if hasattr(comment, 'replies') and len(comment.replies) > 0:
-                        for reply in comment.replies[:2]:
-                            if hasattr(reply, 'body'):
-                                reply_data = {
-                                    'id': reply.id,
-                                    'author': str(reply.author) if reply.author else '[deleted]',
-                                    'body': reply.body,
-                                    'score': reply.score,
-                                    'created_utc': reply.created_utc,
-                                    'created_formatted': self.format_timestamp(reply.created_utc),
-                                    'is_submitter': reply.is_submitter,
-                                    'gilded': getattr(reply, 'gilded', 0)
-                                }
-                                comment_data['replies'].append(reply_data)
-                    
-                    top_comments.append(comment_data)
-            
+            self.raise_if_cancelled()
+            self.save_comments(post_details, top_comments)
             self.finished.emit(post_details, top_comments)
             
+        except WorkerCancelled:
+            print(f"Load of post {self.post_data['id']} cancelled")
         except Exception as e:
-            self.error.emit(f"Error loading post: {str(e)}")
+            if not self.is_cancelled():
+                self.error.emit(f"Error loading post: {str(e)}")
 
 class CommentFrame(QFrame):
     def __init__(self, comment_data, is_reply=False):
@@ -133,27 +125,9 @@ class CommentFrame(QFrame):
         self.comment_data = comment_data
         self.is_reply = is_reply
         
-        # Different styling for replies
-        if is_reply:
-            self.setStyleSheet("""
-                QFrame {
-                    border-left: 3px solid #0078d4;
-                    margin: 5px 5px 5px 30px;
-                    padding: 8px;
-                    border-radius: 4px;
-                    background-color: #383838;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    border: 1px solid #555555;
-                    margin: 8px;
-                    padding: 10px;
-                    border-radius: 6px;
-                    background-color: #404040;
-                }
-            """)
+        # Replies are styled differently, see QFrame#commentCard in the theme
+        self.setObjectName("commentCard")
+        self.setProperty("reply", is_reply)
         
         layout = QVBoxLayout()
         layout.setSpacing(5)
@@ -168,7 +142,7 @@ class CommentFrame(QFrame):
             metadata += f" • 🥇 {comment_data['gilded']}"
         
         author_label = QLabel(metadata)
-        author_label.setStyleSheet("color: #0078d4; font-size: 10px; font-weight: bold;")
+        author_label.setObjectName("commentMeta")
         
         # Comment body
         body_text = comment_data['body']
@@ -177,7 +151,7 @@ class CommentFrame(QFrame):
         
         body_label = QLabel(body_text)
         body_label.setWordWrap(True)
-        body_label.setStyleSheet("color: #ffffff; font-size: 11px; margin: 5px 0px;")
+        body_label.setObjectName("commentBody")
         
         layout.addWidget(author_label)
         layout.addWidget(body_label)
@@ -191,6 +165,7 @@ class RedditPostViewer(QWidget):
         super().__init__()
         self.init_ui()
         self.current_post = None
+        self.subscription = None
     
     def init_ui(self):
         layout = QVBoxLayout()
@@ -202,19 +177,7 @@ class RedditPostViewer(QWidget):
         
         self.back_button = QPushButton("← Back to Posts")
         self.back_button.setMinimumHeight(35)
-        self.back_button.setStyleSheet("""
-            QPushButton {
-                background-color: #555555;
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #666666;
-            }
-        """)
+        self.back_button.setObjectName("backButton")
         self.back_button.clicked.connect(self.back_clicked.emit)
         
         header_layout.addWidget(self.back_button)
@@ -226,7 +189,7 @@ class RedditPostViewer(QWidget):
         
         # Status label
         self.status_label = QLabel()
-        self.status_label.setStyleSheet("color: #cccccc; font-size: 12px;")
+        self.status_label.setObjectName("postStatus")
         
         # Scroll area for content
         self.scroll_area = CustomScrollArea()
@@ -247,41 +210,47 @@ class RedditPostViewer(QWidget):
     
     def load_post(self, post_data):
         """Load a Reddit post and its comments"""
+        key = f"comments_{post_data['id']}"
+        if self.subscription and self.subscription.key == key and self.subscription.is_active():
+            return
+        
         self.current_post = post_data
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         
-        # Clear previous content
-        for i in reversed(range(self.scroll_layout.count())):
-            child = self.scroll_layout.itemAt(i)
-            if child.widget():
-                child.widget().setParent(None)
-        
-        # Start loading comments
-        self.worker = CommentWorker(post_data)
-        self.worker.progress.connect(self.update_status)
-        self.worker.finished.connect(self.on_post_loaded)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        self.clear()
+        
+        # Drop the previous post's load and share any identical one in flight
+        if self.subscription:
+            self.subscription.cancel()
+        self.subscription = IN_FLIGHT.subscribe(
+            key,
+            lambda: CommentWorker(post_data),
+            progress=self.update_status,
+            finished=self.on_post_loaded,
+            error=self.on_error
+        )
+    
+    def clear(self):
+        """Delete the previous post's widgets, including the stretch after them"""
+        clear_layout(self.scroll_layout)
     
     def update_status(self, message):
         self.status_label.setText(message)
     
     def on_post_loaded(self, post_details, comments):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
+        with METRICS.span('ui.comment_thread'):
+            self.show_post(post_details, comments)
+    
+    def show_post(self, post_details, comments):
         self.progress_bar.setVisible(False)
         self.status_label.setText(f"Loaded post with {len(comments)} comments")
         
         # Post header
         post_frame = QFrame()
-        post_frame.setStyleSheet("""
-            QFrame {
-                border: 2px solid #0078d4;
-                margin: 10px;
-                padding: 15px;
-                border-radius: 8px;
-                background-color: #404040;
-            }
-        """)
+        post_frame.setObjectName("postHeader")
         
         post_layout = QVBoxLayout(post_frame)
         
@@ -289,7 +258,7 @@ class RedditPostViewer(QWidget):
         title_label = QLabel(post_details['title'])
         title_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
         title_label.setWordWrap(True)
-        title_label.setStyleSheet("color: #ffffff; margin-bottom: 10px;")
+        title_label.setObjectName("postTitle")
         
         # Post metadata
         metadata_parts = []
@@ -301,17 +270,17 @@ class RedditPostViewer(QWidget):
         
         metadata_text = " • ".join(metadata_parts)
         metadata_label = QLabel(metadata_text)
-        metadata_label.setStyleSheet("color: #999999; font-size: 11px; margin-bottom: 10px;")
+        metadata_label.setObjectName("postMeta")
         
         # Post content
         if post_details['selftext']:
             content_label = QLabel(post_details['selftext'])
             content_label.setWordWrap(True)
-            content_label.setStyleSheet("color: #ffffff; font-size: 12px; margin-bottom: 10px;")
+            content_label.setObjectName("postText")
             post_layout.addWidget(content_label)
         elif not post_details['is_self']:
             link_label = QLabel(f"🔗 External Link: {post_details['url']}")
-            link_label.setStyleSheet("color: #0078d4; font-size: 11px; margin-bottom: 10px;")
+            link_label.setObjectName("postLink")
             post_layout.addWidget(link_label)
         
         post_layout.addWidget(title_label)
@@ -323,7 +292,7 @@ class RedditPostViewer(QWidget):
         if comments:
             comments_header = QLabel(f"💬 Top {len(comments)} Comments")
             comments_header.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-            comments_header.setStyleSheet("color: #ffffff; margin: 20px 10px 10px 10px;")
+            comments_header.setObjectName("sectionHeader")
             self.scroll_layout.addWidget(comments_header)
             
             # Add comments
@@ -337,20 +306,22 @@ class RedditPostViewer(QWidget):
                     self.scroll_layout.addWidget(reply_frame)
         else:
             no_comments_label = QLabel("No comments available")
-            no_comments_label.setStyleSheet("color: #999999; margin: 20px; text-align: center;")
+            no_comments_label.setObjectName("noComments")
             no_comments_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.scroll_layout.addWidget(no_comments_label)
         
         self.scroll_layout.addStretch()
     
     def on_error(self, error_message):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
         self.progress_bar.setVisible(False)
         self.status_label.setText("❌ Error occurred")
         QMessageBox.critical(self, "Error", error_message)
         
         # Show error in scroll area
         error_label = QLabel(f"Error loading post: {error_message}")
-        error_label.setStyleSheet("color: #ff6666; margin: 20px; text-align: center;")
+        error_label.setObjectName("errorMessage")
         error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         error_label.setWordWrap(True)
         self.scroll_layout.addWidget(error_label)
\ No newline at end of file
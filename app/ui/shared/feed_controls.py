@@ -0,0 +1,90 @@
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QLabel
+from ...logic.feed_view import AS_LOADED, FeedView
+from .feed_updates import arrange_cards
+
+class FeedControls(QWidget):
+    """Sort and filter choices over the cards of a loaded feed.
+
+    Picking one moves the feed's existing cards into the new order and hides
+    the ones filtered out; nothing is fetched again and no card is rebuilt.
+    The tab calls `set_items(items)` whenever its cards change, and
+    `frames()` returns its current item id -> card map.
+    """
+
+    def __init__(self, sorts, filters, feed_layout, frames, parent=None):
+        super().__init__(parent)
+        self.view = FeedView(sorts, filters)
+        self.feed_layout = feed_layout
+        self.frames = frames
+        # Whether the cards are out of the feed's own order or some are hidden
+        self.arranged = False
+
+        self.sort_box = QComboBox()
+        self.sort_box.setObjectName("feedChoice")
+        for name, (label, _, _) in sorts.items():
+            self.sort_box.addItem(label, name)
+        self.sort_box.currentIndexChanged.connect(self.apply)
+
+        self.filter_boxes = {}
+        for field in filters:
+            box = QComboBox()
+            box.setObjectName("feedChoice")
+            box.setVisible(False)
+            box.currentIndexChanged.connect(self.apply)
+            self.filter_boxes[field] = box
+
+        self.count_label = QLabel()
+        self.count_label.setObjectName("feedCount")
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+        layout.addWidget(self.sort_box)
+        for box in self.filter_boxes.values():
+            layout.addWidget(box)
+        layout.addStretch()
+        layout.addWidget(self.count_label)
+
+        self.setVisible(False)
+
+    def choices(self):
+        """(sort name, {field: value or None}) currently picked"""
+        filters = {field: box.currentData() for field, box in self.filter_boxes.items()}
+        return self.sort_box.currentData(), filters
+
+    def set_items(self, items):
+        """Take the items now shown as cards, keeping the picked choices that still apply"""
+        self.view.set_items(items)
+        for field, box in self.filter_boxes.items():
+            any_label, value_label = self.view.filters[field]
+            values = self.view.values(field)
+            selected = box.currentData()
+
+            box.blockSignals(True)
+            box.clear()
+            box.addItem(any_label, None)
+            for value in values:
+                box.addItem(value_label(value), value)
+            index = box.findData(selected) if selected is not None else 0
+            # A filter with a single value has nothing to leave out
+            box.setCurrentIndex(index if index > 0 and len(values) > 1 else 0)
+            box.blockSignals(False)
+            box.setVisible(len(values) > 1)
+
+        self.setVisible(len(self.view) > 1)
+        self.apply()
+
+    def apply(self):
+        frames = self.frames()
+        sort, filters = self.choices()
+        default = sort == AS_LOADED and all(value is None for value in filters.values())
+        if not frames:
+            self.arranged = False
+        if not frames or (default and not self.arranged):
+            # The cards are already in the feed's order, all shown
+            self.count_label.clear()
+            return
+
+        shown = arrange_cards(self.feed_layout, self.view.visible_ids(sort, filters), frames)
+        self.arranged = not default
+        self.count_label.setText(f"Showing {shown} of {len(frames)}" if shown < len(frames) else "")
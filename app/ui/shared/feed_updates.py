@@ -0,0 +1,113 @@
+from ...logic.metrics import METRICS
+
+
+def discard_widget(widget):
+    """Take a widget off screen and delete it, with its children and pixmaps,
+    once control returns to the event loop"""
+    widget.hide()
+    widget.deleteLater()
+
+
+def clear_layout(layout):
+    """Remove every item from `layout`, deleting its widgets and nested layouts"""
+    while layout.count():
+        item = layout.takeAt(layout.count() - 1)
+        if item.widget() is not None:
+            discard_widget(item.widget())
+        elif item.layout() is not None:
+            clear_layout(item.layout())
+            item.layout().deleteLater()
+
+
+def remove_non_card_items(layout, frames):
+    """Drop stretches and placeholder labels so only feed cards remain"""
+    cards = set(frames.values())
+    for i in reversed(range(layout.count())):
+        item = layout.itemAt(i)
+        widget = item.widget()
+        if widget is None:
+            layout.takeAt(i)
+        elif widget not in cards:
+            layout.takeAt(i)
+            discard_widget(widget)
+
+
+def apply_feed_update(layout, frames, items, make_frame, data_attr):
+    """Sync an on-screen feed with a fresh list of items.
+
+    Cards whose data is unchanged are kept (and only moved if the order
+    changed), changed or new items get a fresh card, and cards for items
+    that disappeared are removed. `frames` maps item id -> card and is
+    updated in place. Returns the number of cards that were (re)built.
+    """
+    with METRICS.span('ui.feed_update'):
+        return sync_cards(layout, frames, items, make_frame, data_attr)
+
+
+def sync_cards(layout, frames, items, make_frame, data_attr):
+    remove_non_card_items(layout, frames)
+
+    rebuilt = 0
+    new_frames = {}
+    for item in items:
+        frame = frames.pop(item['id'], None)
+        if frame is not None and getattr(frame, data_attr) != item:
+            layout.removeWidget(frame)
+            discard_widget(frame)
+            frame = None
+        if frame is None:
+            frame = make_frame(item)
+            rebuilt += 1
+        new_frames[item['id']] = frame
+
+    # Whatever is left over is no longer part of the feed
+    for frame in frames.values():
+        layout.removeWidget(frame)
+        discard_widget(frame)
+
+    # Place cards in the new order, touching only the ones that moved
+    for index, frame in enumerate(new_frames.values()):
+        if layout.indexOf(frame) != index:
+            layout.removeWidget(frame)
+            layout.insertWidget(index, frame)
+
+    frames.clear()
+    frames.update(new_frames)
+    layout.addStretch()
+    return rebuilt
+
+
+def arrange_cards(layout, order, frames):
+    """Show the cards of the item ids in `order`, in that order, and hide the rest.
+
+    The cards are only taken out of the layout and put back, never rebuilt,
+    and the content is repainted once at the end, so re-sorting or
+    filtering a feed of thousands of cards is a single relayout.
+    """
+    with METRICS.span('ui.feed_arrange'):
+        content = layout.parentWidget()
+        content.setUpdatesEnabled(False)
+        try:
+            remove_non_card_items(layout, frames)
+            # Taking from the end keeps every take O(1)
+            while layout.count():
+                layout.takeAt(layout.count() - 1)
+
+            shown = set()
+            for item_id in order:
+                frame = frames.get(item_id)
+                if frame is None:
+                    continue
+                shown.add(item_id)
+                layout.addWidget(frame)
+                if frame.isHidden():
+                    frame.show()
+            # Hidden cards stay in the layout, after the visible ones, to be shown again later
+            for item_id, frame in frames.items():
+                if item_id not in shown:
+                    layout.addWidget(frame)
+                    frame.hide()
+            layout.addStretch()
+        finally:
+            content.setUpdatesEnabled(True)
+        return len(shown)
@@ -0,0 +1,23 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+class LazyTab(QWidget):
+    """Placeholder page that builds its real content the first time it is shown"""
+    
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.content = None
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+    
+    def ensure_built(self):
+        """Build the content now if it has not been built yet"""
+        if self.content is None:
+            self.content = self.factory()
+            self.layout().addWidget(self.content)
+        return self.content
+    
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
@@ -0,0 +1,70 @@
+from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                            QPlainTextEdit, QFileDialog)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFontDatabase
+from ...logic.metrics import METRICS
+from ...logic.stall_watchdog import STALLS
+
+class MetricsPanel(QDockWidget):
+    """Live view of the fetch timing spans, per-host traffic, cache hit ratios
+    and, while the stall watchdog runs, GUI stalls per user action"""
+    REFRESH_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__("Metrics", parent)
+        self.setObjectName("metricsPanel")
+
+        content = QWidget()
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(8, 8, 8, 8)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        buttons = QHBoxLayout()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        save_button = QPushButton("Save...")
+        save_button.clicked.connect(self.save)
+        buttons.addStretch()
+        buttons.addWidget(reset_button)
+        buttons.addWidget(save_button)
+
+        layout.addWidget(self.text)
+        layout.addLayout(buttons)
+        self.setWidget(content)
+
+        # Only refresh while the panel is on screen
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        scroll = self.text.verticalScrollBar().value()
+        report = METRICS.report()
+        if STALLS.running or STALLS.histogram:
+            report += '\n\n' + STALLS.report()
+        self.text.setPlainText(report)
+        self.text.verticalScrollBar().setValue(scroll)
+
+    def reset(self):
+        METRICS.reset()
+        self.refresh()
+
+    def save(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Metrics", "metrics.json", "JSON (*.json);;Prometheus text (*.prom)"
+        )
+        if path:
+            METRICS.write(path)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,86 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QStackedWidget
+from PyQt6.QtCore import Qt, QTimer
+from ...logic.metrics import METRICS
+from ...logic.search_index import query_terms
+from .custom_scroll import CustomScrollArea
+from .feed_updates import clear_layout
+
+class SearchPanel(QWidget):
+    """Search-as-you-type box over the full-text index, wrapped around a tab's feed.
+
+    While the box holds a query its hits are shown in place of `feed`;
+    clearing it brings the feed back as it was, without reloading it.
+    `search(text)` returns the items to show and `make_card(item)` builds
+    a card for one of them.
+    """
+    # Typing faster than this only searches once
+    DEBOUNCE_MS = 120
+
+    def __init__(self, placeholder, search, make_card, feed, parent=None):
+        super().__init__(parent)
+        self.search = search
+        self.make_card = make_card
+        self.feed = feed
+
+        self.input = QLineEdit()
+        self.input.setPlaceholderText(placeholder)
+        self.input.setClearButtonEnabled(True)
+        self.input.setObjectName("searchInput")
+        self.input.textChanged.connect(self.schedule_search)
+        self.input.returnPressed.connect(self.run_search)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.run_search)
+
+        # Results page, shown instead of the feed while searching
+        self.results_area = CustomScrollArea()
+        self.results_content = QWidget()
+        self.results_layout = QVBoxLayout(self.results_content)
+        self.results_layout.setContentsMargins(0, 0, 0, 0)
+        self.results_layout.setSpacing(5)
+        self.results_area.setWidget(self.results_content)
+
+        self.pages = QStackedWidget()
+        self.pages.addWidget(feed)
+        self.pages.addWidget(self.results_area)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+        layout.addWidget(self.input)
+        layout.addWidget(self.pages)
+
+    def is_searching(self):
+        return self.pages.currentWidget() is self.results_area
+
+    def schedule_search(self):
+        self.timer.start()
+
+    def run_search(self):
+        self.timer.stop()
+        text = self.input.text()
+        clear_layout(self.results_layout)
+        if not query_terms(text):
+            self.pages.setCurrentWidget(self.feed)
+            return
+
+        try:
+            items = self.search(text)
+        except Exception as e:
+            print(f"Search failed: {e}")
+            items = []
+
+        with METRICS.span('ui.search_results'):
+            for item in items:
+                self.results_layout.addWidget(self.make_card(item))
+            if not items:
+                empty_label = QLabel(f"Nothing cached matches \"{text.strip()}\".")
+                empty_label.setObjectName("emptyFeed")
+                empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.results_layout.addWidget(empty_label)
+            self.results_layout.addStretch()
+
+        self.results_area.verticalScrollBar().setValue(0)
+        self.pages.setCurrentWidget(self.results_area)
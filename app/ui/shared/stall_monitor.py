@@ -0,0 +1,82 @@
+import atexit
+import os
+from functools import lru_cache
+from PyQt6.QtWidgets import QApplication, QAbstractButton, QLineEdit, QTabBar
+from PyQt6.QtCore import QObject, QEvent, QTimer, Qt
+from ...logic.stall_watchdog import STALLS
+
+def describe_click(widget, position):
+    """Short name for what a click landed on, e.g. "click '🔍 Load Videos'" """
+    if isinstance(widget, QAbstractButton):
+        return f"click '{widget.text()}'"
+    if isinstance(widget, QTabBar):
+        return f"tab '{widget.tabText(widget.tabAt(position))}'"
+    # Name the app's own card or page the click landed in
+    while widget is not None and not type(widget).__module__.startswith('app.'):
+        widget = widget.parentWidget()
+    return f"click {type(widget).__name__}" if widget is not None else "click"
+
+class StallMonitor(QObject):
+    """Drives the stall watchdog from the Qt event loop.
+
+    A timer beats the watchdog, and an application event filter names the
+    user action (clicks and Enter presses) later stalls are attributed to.
+    """
+
+    def __init__(self, app, watchdog=STALLS):
+        super().__init__(app)
+        self.app = app
+        self.watchdog = watchdog
+        self.last_input = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.watchdog.beat)
+        atexit.register(self.watchdog.write_report)
+
+    def is_running(self):
+        return self.watchdog.running
+
+    def start(self, threshold=None):
+        if threshold:
+            self.watchdog.threshold = threshold
+        # Beat several times per threshold so short stalls are not missed
+        self.timer.start(max(10, int(self.watchdog.threshold * 1000 / 4)))
+        self.watchdog.start()
+        self.app.installEventFilter(self)
+
+    def stop(self):
+        self.app.removeEventFilter(self)
+        self.timer.stop()
+        self.watchdog.stop()
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type == QEvent.Type.MouseButtonRelease:
+            # The same event is offered to every parent it propagates to
+            if event.timestamp() != self.last_input and obj.isWidgetType():
+                self.last_input = event.timestamp()
+                self.watchdog.set_action(describe_click(obj, event.position().toPoint()))
+        elif event_type == QEvent.Type.KeyPress and event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            if event.timestamp() != self.last_input and isinstance(obj, QLineEdit):
+                self.last_input = event.timestamp()
+                self.watchdog.set_action(f"enter '{obj.text()[:40]}'")
+        return False
+
+@lru_cache(maxsize=None)
+def stall_monitor():
+    """The application's stall monitor, created on first use"""
+    STALLS.log_path = os.environ.get('STALL_LOG') or None
+    return StallMonitor(QApplication.instance())
+
+def start_from_environment():
+    """Start the watchdog if STALL_WATCHDOG_MS is set.
+
+    Read from the process environment rather than .env, so checking it
+    never delays startup.
+    """
+    try:
+        threshold_ms = float(os.environ.get('STALL_WATCHDOG_MS', 0))
+    except ValueError:
+        print("Invalid STALL_WATCHDOG_MS, stall watchdog disabled")
+        return
+    if threshold_ms > 0:
+        stall_monitor().start(threshold_ms / 1000)
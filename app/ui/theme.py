@@ -0,0 +1,421 @@
+"""The application's one stylesheet, applied once with `apply_theme(app)`.
+
+Widgets never call setStyleSheet themselves. They get an object name (and,
+where the look depends on state, a dynamic property) that a rule here
+selects, so building a card costs no stylesheet parsing:
+
+    frame.setObjectName("commentCard")
+    frame.setProperty("reply", True)     # QFrame#commentCard[reply="true"]
+
+A card's rules are written as `QFrame#card, QFrame#card QFrame`, so they
+still reach the labels inside it the way its own stylesheet used to. Rules
+for those labels select them through the card's object name too, which
+keeps them more specific than the card's.
+"""
+
+STYLESHEET = """
+/* Base dark theme */
+QMainWindow {
+    background-color: #1e1e1e;
+    color: #ffffff;
+}
+QWidget {
+    background-color: #1e1e1e;
+    color: #ffffff;
+    font-family: 'Segoe UI', Arial, sans-serif;
+}
+QLabel {
+    color: #ffffff;
+}
+QMessageBox {
+    background-color: #2b2b2b;
+    color: #ffffff;
+    border: 1px solid #555555;
+    border-radius: 8px;
+}
+QMessageBox QPushButton {
+    min-width: 80px;
+    background-color: #0078d4;
+    color: #ffffff;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QMessageBox QPushButton:hover {
+    background-color: #106ebe;
+}
+/* Text selection styling */
+QLabel:selection {
+    background-color: #0078d4;
+    color: #ffffff;
+}
+QTextEdit:selection {
+    background-color: #0078d4;
+    color: #ffffff;
+}
+
+/* Main window */
+QLabel#appTitle {
+    color: #ffffff;
+    margin-bottom: 10px;
+}
+QTabWidget#mainTabs::pane {
+    border: 2px solid #555555;
+    border-radius: 8px;
+    background-color: #3c3c3c;
+    padding: 5px;
+}
+QTabWidget#mainTabs QTabBar::tab {
+    background-color: #555555;
+    color: #ffffff;
+    padding: 12px 20px;
+    margin-right: 3px;
+    border-top-left-radius: 8px;
+    border-top-right-radius: 8px;
+    font-weight: bold;
+    font-size: 12px;
+}
+QTabWidget#mainTabs QTabBar::tab:selected {
+    background-color: #3c3c3c;
+    border-bottom: 3px solid #0078d4;
+}
+QTabWidget#mainTabs QTabBar::tab:hover:!selected {
+    background-color: #666666;
+}
+
+/* Feed pages */
+QPushButton#primaryButton {
+    background-color: #0078d4;
+    color: #ffffff;
+    border: none;
+    padding: 12px 20px;
+    border-radius: 8px;
+    font-weight: bold;
+    font-size: 13px;
+}
+QPushButton#primaryButton:hover {
+    background-color: #106ebe;
+}
+QPushButton#primaryButton:pressed {
+    background-color: #005a9e;
+}
+QPushButton#primaryButton:disabled {
+    background-color: #666666;
+    color: #999999;
+}
+QLineEdit#channelInput {
+    background-color: #404040;
+    border: 2px solid #666666;
+    padding: 10px;
+    border-radius: 6px;
+    color: #ffffff;
+    font-size: 12px;
+}
+QLineEdit#channelInput:focus {
+    border: 2px solid #0078d4;
+}
+QLineEdit#searchInput {
+    background-color: #333333;
+    border: 1px solid #555555;
+    padding: 8px;
+    border-radius: 6px;
+    color: #ffffff;
+    font-size: 12px;
+}
+QLineEdit#searchInput:focus {
+    border: 1px solid #0078d4;
+}
+QComboBox#feedChoice {
+    background-color: #333333;
+    border: 1px solid #555555;
+    padding: 5px 8px;
+    border-radius: 6px;
+    color: #ffffff;
+    font-size: 12px;
+}
+QComboBox#feedChoice:focus {
+    border: 1px solid #0078d4;
+}
+QComboBox#feedChoice QAbstractItemView {
+    background-color: #2b2b2b;
+    color: #ffffff;
+    selection-background-color: #0078d4;
+}
+QLabel#feedCount {
+    color: #999999;
+    font-size: 11px;
+}
+QProgressBar#loadProgress {
+    border: 2px solid #555555;
+    border-radius: 8px;
+    text-align: center;
+    background-color: #404040;
+    height: 20px;
+}
+QProgressBar#loadProgress::chunk {
+    background-color: #0078d4;
+    border-radius: 6px;
+}
+QLabel#statusLabel {
+    color: #cccccc;
+    padding: 10px;
+    font-size: 12px;
+}
+QLabel#emptyFeed {
+    color: #999999;
+    padding: 40px;
+    text-align: center;
+    font-size: 14px;
+}
+
+/* Feed scroll areas */
+QScrollArea#feedScroll {
+    border: 1px solid #555555;
+    border-radius: 8px;
+    background-color: #3c3c3c;
+    padding: 0px;
+}
+QScrollArea#feedScroll QScrollBar:vertical {
+    background-color: transparent;
+    width: 14px;
+    margin: 0px;
+    border: none;
+    border-radius: 7px;
+}
+QScrollArea#feedScroll QScrollBar::handle:vertical {
+    background-color: #666666;
+    border-radius: 7px;
+    min-height: 30px;
+    margin: 2px;
+}
+QScrollArea#feedScroll QScrollBar::handle:vertical:hover {
+    background-color: #777777;
+}
+QScrollArea#feedScroll QScrollBar::handle:vertical:pressed {
+    background-color: #0078d4;
+}
+/* Remove scrollbar buttons (arrows) */
+QScrollArea#feedScroll QScrollBar::add-line:vertical,
+QScrollArea#feedScroll QScrollBar::sub-line:vertical {
+    height: 0px;
+    background: none;
+    border: none;
+}
+QScrollArea#feedScroll QScrollBar::up-arrow:vertical,
+QScrollArea#feedScroll QScrollBar::down-arrow:vertical {
+    background: none;
+    border: none;
+}
+QScrollArea#feedScroll QScrollBar::add-page:vertical,
+QScrollArea#feedScroll QScrollBar::sub-page:vertical {
+    background: transparent;
+}
+QScrollArea#feedScroll QScrollBar:horizontal {
+    background-color: transparent;
+    height: 14px;
+    margin: 0px;
+    border: none;
+    border-radius: 7px;
+}
+QScrollArea#feedScroll QScrollBar::handle:horizontal {
+    background-color: #666666;
+    border-radius: 7px;
+    min-width: 30px;
+    margin: 2px;
+}
+QScrollArea#feedScroll QScrollBar::handle:horizontal:hover {
+    background-color: #777777;
+}
+QScrollArea#feedScroll QScrollBar::handle:horizontal:pressed {
+    background-color: #0078d4;
+}
+QScrollArea#feedScroll QScrollBar::add-line:horizontal,
+QScrollArea#feedScroll QScrollBar::sub-line:horizontal {
+    width: 0px;
+    background: none;
+    border: none;
+}
+QScrollArea#feedScroll QScrollBar::left-arrow:horizontal,
+QScrollArea#feedScroll QScrollBar::right-arrow:horizontal {
+    background: none;
+    border: none;
+}
+QScrollArea#feedScroll QScrollBar::add-page:horizontal,
+QScrollArea#feedScroll QScrollBar::sub-page:horizontal {
+    background: transparent;
+}
+
+/* Video and post cards */
+QFrame#videoCard, QFrame#videoCard QFrame,
+QFrame#postCard, QFrame#postCard QFrame {
+    border: 1px solid #666666;
+    margin: 8px;
+    padding: 12px;
+    border-radius: 8px;
+    background-color: #404040;
+}
+QFrame#videoCard:hover, QFrame#videoCard QFrame:hover,
+QFrame#postCard:hover, QFrame#postCard QFrame:hover {
+    border: 2px solid #0078d4;
+    background-color: #454545;
+}
+QFrame#videoCard QFrame#thumbnailBox, QFrame#videoCard QFrame#thumbnailBox QFrame {
+    border: 1px solid #555555;
+    border-radius: 6px;
+    background-color: #333333;
+    margin: 0px;
+    padding: 0px;
+}
+QFrame#videoCard QFrame#thumbnailBox QLabel#thumbnail {
+    border: none;
+    background: transparent;
+}
+QFrame#videoCard QFrame#thumbnailBox QLabel#thumbnail[missing="true"] {
+    background-color: #555555;
+    color: #999999;
+    font-size: 11px;
+}
+QFrame#videoCard QLabel#cardTitle, QFrame#postCard QLabel#cardTitle {
+    color: #ffffff;
+    margin: 0px;
+}
+QFrame#videoCard QLabel#cardStats, QFrame#postCard QLabel#cardStats {
+    color: #999999;
+    font-size: 10px;
+    margin: 0px;
+}
+QFrame#videoCard QLabel#cardText {
+    color: #cccccc;
+    font-size: 10px;
+    margin: 0px;
+}
+QFrame#postCard QLabel#cardText {
+    color: #cccccc;
+    font-size: 10px;
+    margin-top: 5px;
+}
+QFrame#postCard QLabel#postType {
+    color: #0078d4;
+    font-size: 9px;
+    margin: 0px;
+}
+
+/* Post viewer */
+QPushButton#backButton {
+    background-color: #555555;
+    color: #ffffff;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 6px;
+    font-weight: bold;
+}
+QPushButton#backButton:hover {
+    background-color: #666666;
+}
+QLabel#postStatus {
+    color: #cccccc;
+    font-size: 12px;
+}
+QFrame#postHeader, QFrame#postHeader QFrame {
+    border: 2px solid #0078d4;
+    margin: 10px;
+    padding: 15px;
+    border-radius: 8px;
+    background-color: #404040;
+}
+QFrame#postHeader QLabel#postTitle {
+    color: #ffffff;
+    margin-bottom: 10px;
+}
+QFrame#postHeader QLabel#postMeta {
+    color: #999999;
+    font-size: 11px;
+    margin-bottom: 10px;
+}
+QFrame#postHeader QLabel#postText {
+    color: #ffffff;
+    font-size: 12px;
+    margin-bottom: 10px;
+}
+QFrame#postHeader QLabel#postLink {
+    color: #0078d4;
+    font-size: 11px;
+    margin-bottom: 10px;
+}
+QFrame#videoHeader {
+    border: 2px solid #0078d4;
+    margin: 10px;
+    padding: 15px;
+    border-radius: 8px;
+    background-color: #404040;
+}
+QFrame#videoHeader QLabel#videoTitle {
+    color: #ffffff;
+    margin-bottom: 10px;
+}
+QFrame#videoHeader QLabel#videoMeta {
+    color: #999999;
+    font-size: 11px;
+    margin-bottom: 10px;
+}
+QFrame#videoHeader QLabel#videoTags {
+    color: #5fa8e8;
+    font-size: 11px;
+    margin-bottom: 10px;
+}
+QFrame#videoHeader QLabel#videoLink {
+    color: #0078d4;
+    font-size: 11px;
+    margin-bottom: 10px;
+}
+QFrame#videoHeader QLabel#videoDescription {
+    color: #ffffff;
+    font-size: 12px;
+}
+QLabel#sectionHeader {
+    color: #ffffff;
+    margin: 20px 10px 10px 10px;
+}
+QLabel#noComments {
+    color: #999999;
+    margin: 20px;
+    text-align: center;
+}
+QLabel#errorMessage {
+    color: #ff6666;
+    margin: 20px;
+    text-align: center;
+}
+
+/* Comments */
+QFrame#commentCard[reply="false"], QFrame#commentCard[reply="false"] QFrame {
+    border: 1px solid #555555;
+    margin: 8px;
+    padding: 10px;
+    border-radius: 6px;
+    background-color: #404040;
+}
+QFrame#commentCard[reply="true"], QFrame#commentCard[reply="true"] QFrame {
+    border-left: 3px solid #0078d4;
+    margin: 5px 5px 5px 30px;
+    padding: 8px;
+    border-radius: 4px;
+    background-color: #383838;
+}
+QFrame#commentCard QLabel#commentMeta {
+    color: #0078d4;
+    font-size: 10px;
+    font-weight: bold;
+}
+QFrame#commentCard QLabel#commentBody {
+    color: #ffffff;
+    font-size: 11px;
+    margin: 5px 0px;
+}
+"""
+
+
+def apply_theme(app):
+    """Style the whole application; call once, before any window is shown"""
+    app.setStyleSheet(STYLESHEET)
@@ -0,0 +1,170 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox,
+                            QStackedWidget)
+from PyQt6.QtCore import Qt, QTimer
+from ...logic.metrics import METRICS
+from ...logic.normalize import Video
+from ...logic.timeline import Timeline
+from ...logic.timeline_handler import TimelineWorker
+from ...logic.workers import IN_FLIGHT
+from ..reddit.reddit_post_viewer import RedditPostViewer
+from ..reddit.reddit_widgets import RedditPostFrame
+from ..shared.custom_scroll import CustomScrollArea
+from ..shared.feed_updates import clear_layout
+from ..youtube.youtube_widgets import VideoFrame
+
+class TimelineTab(QWidget):
+    """Uploads and posts of every cached channel and subreddit in one feed, newest first.
+
+    Opens on what the caches hold and adds a step of items whenever the
+    user scrolls close to the end; only the sources that reach that far
+    back fetch their next page.
+    """
+    # Load the next step once the end is closer than this
+    PREFETCH_PX = 800
+    
+    def __init__(self):
+        super().__init__()
+        self.timeline = None
+        self.subscription = None
+        self.shown = 0
+        self.init_ui()
+        self.open_timeline()
+    
+    def init_ui(self):
+        self.stacked_widget = QStackedWidget()
+        self.list_page = QWidget()
+        self.post_viewer_page = None
+        self.video_details_page = None
+        
+        layout = QVBoxLayout(self.list_page)
+        layout.setSpacing(15)
+        layout.setContentsMargins(15, 15, 15, 15)
+        
+        header_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("🔄 Rebuild Timeline")
+        self.refresh_button.setMinimumHeight(40)
+        self.refresh_button.clicked.connect(self.open_timeline)
+        header_layout.addWidget(self.refresh_button)
+        header_layout.addStretch()
+        
+        self.status_label = QLabel("Merging cached channels and subreddits...")
+        self.status_label.setObjectName("statusLabel")
+        
+        self.scroll_area = CustomScrollArea()
+        self.scroll_content = QWidget()
+        self.scroll_layout = QVBoxLayout(self.scroll_content)
+        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
+        self.scroll_layout.setSpacing(5)
+        self.scroll_area.setWidget(self.scroll_content)
+        self.scroll_area.setWidgetResizable(True)
+        
+        # Pull more as the end comes into view, or while the items don't fill the view yet
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.check_scroll_position)
+        scroll_bar.rangeChanged.connect(self.check_scroll_position)
+        
+        layout.addLayout(header_layout)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.scroll_area)
+        
+        self.stacked_widget.addWidget(self.list_page)
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addWidget(self.stacked_widget)
+    
+    def open_timeline(self):
+        """Start over from the newest items of the current caches"""
+        if self.subscription:
+            self.subscription.cancel()
+            self.subscription = None
+        clear_layout(self.scroll_layout)
+        self.scroll_layout.addStretch()
+        self.shown = 0
+        self.timeline = Timeline()
+        self.load_more()
+    
+    def check_scroll_position(self, *args):
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if scroll_bar.maximum() - scroll_bar.value() < self.PREFETCH_PX:
+            self.load_more()
+    
+    def load_more(self):
+        if self.timeline.exhausted or (self.subscription and self.subscription.is_active()):
+            return
+        timeline = self.timeline
+        self.subscription = IN_FLIGHT.subscribe(
+            f"timeline_{id(timeline)}",
+            lambda: TimelineWorker(timeline),
+            progress=self.status_label.setText,
+            finished=self.on_items_loaded,
+            error=self.on_error
+        )
+    
+    def create_card(self, item):
+        if isinstance(item, Video):
+            video_frame = VideoFrame(item)
+            video_frame.video_clicked.connect(self.show_video_details)
+            return video_frame
+        post_frame = RedditPostFrame(item)
+        post_frame.post_clicked.connect(self.show_post_details)
+        return post_frame
+    
+    def on_items_loaded(self, items):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
+        
+        with METRICS.span('ui.timeline_cards'):
+            # Cards go before the trailing stretch
+            for item in items:
+                self.scroll_layout.insertWidget(self.scroll_layout.count() - 1, self.create_card(item))
+        self.shown += len(items)
+        
+        if not self.shown and self.timeline.exhausted:
+            empty_label = QLabel("Nothing cached yet. Load a YouTube channel or Reddit posts first.")
+            empty_label.setObjectName("emptyFeed")
+            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.scroll_layout.insertWidget(0, empty_label)
+        self.update_status()
+        
+        # Keep going while the new cards still don't reach past the view
+        QTimer.singleShot(0, self.check_scroll_position)
+    
+    def update_status(self):
+        sources = len(self.timeline.sources or ())
+        status = f"Showing {self.shown} items from {sources} sources, newest first"
+        if self.timeline.exhausted:
+            status += " (end of timeline)"
+        failed = self.timeline.failed_sources()
+        if failed:
+            status += f" • could not load more from {', '.join(failed)}"
+        self.status_label.setText(status)
+    
+    def on_error(self, error_message):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
+        self.status_label.setText("❌ Error occurred")
+        QMessageBox.critical(self, "Error", error_message)
+    
+    def show_post_details(self, post_data):
+        """Switch to the post viewer and load the selected post"""
+        if self.post_viewer_page is None:
+            self.post_viewer_page = RedditPostViewer()
+            self.post_viewer_page.back_clicked.connect(self.show_timeline)
+            self.stacked_widget.addWidget(self.post_viewer_page)
+        
+        self.post_viewer_page.load_post(post_data)
+        self.stacked_widget.setCurrentWidget(self.post_viewer_page)
+    
+    def show_video_details(self, video):
+        """Switch to the video details page and load the selected video"""
+        if self.video_details_page is None:
+            from ..youtube.video_details_viewer import VideoDetailsViewer
+            self.video_details_page = VideoDetailsViewer("← Back to Timeline")
+            self.video_details_page.back_clicked.connect(self.show_timeline)
+            self.stacked_widget.addWidget(self.video_details_page)
+        
+        self.video_details_page.load_video(video)
+        self.stacked_widget.setCurrentWidget(self.video_details_page)
+    
+    def show_timeline(self):
+        self.stacked_widget.setCurrentWidget(self.list_page)
@@ -0,0 +1,193 @@
+import os
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame, QProgressBar)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QPixmap
+from ...logic.metrics import METRICS
+from ...logic.scheduler import BACKGROUND
+from ...logic.workers import IN_FLIGHT
+from ...logic.youtube_handler import VideoDetailsWorker, details_key
+from ..shared.custom_scroll import CustomScrollArea
+
+class VideoDetailsViewer(QWidget):
+    """Detail page of a video.
+
+    Shows what the feed already knows at once, then fills in the full
+    description, duration, likes, comment count and tags, which are only
+    fetched when a video is opened. The videos after it in the feed are
+    fetched along with it, so opening the next one is instant.
+    """
+    back_clicked = pyqtSignal()
+    # Videos after the opened one whose details are prefetched
+    PREFETCH = 4
+
+    def __init__(self, back_text="← Back to Videos"):
+        super().__init__()
+        self.current_video = None
+        self.subscription = None
+        self.prefetch = None
+        self.init_ui(back_text)
+
+    def init_ui(self, back_text):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(15)
+
+        # Header with back button
+        header_layout = QHBoxLayout()
+
+        self.back_button = QPushButton(back_text)
+        self.back_button.setMinimumHeight(35)
+        self.back_button.setObjectName("backButton")
+        self.back_button.clicked.connect(self.back_clicked.emit)
+
+        header_layout.addWidget(self.back_button)
+        header_layout.addStretch()
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+
+        self.status_label = QLabel()
+        self.status_label.setObjectName("postStatus")
+
+        # The page is built once; opening a video only changes its texts
+        video_frame = QFrame()
+        video_frame.setObjectName("videoHeader")
+        video_layout = QVBoxLayout(video_frame)
+
+        self.thumbnail_label = QLabel()
+        self.thumbnail_label.setObjectName("videoThumbnail")
+        self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.title_label = QLabel()
+        self.title_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
+        self.title_label.setWordWrap(True)
+        self.title_label.setObjectName("videoTitle")
+
+        self.meta_label = QLabel()
+        self.meta_label.setWordWrap(True)
+        self.meta_label.setObjectName("videoMeta")
+
+        self.tags_label = QLabel()
+        self.tags_label.setWordWrap(True)
+        self.tags_label.setObjectName("videoTags")
+
+        self.link_label = QLabel()
+        self.link_label.setObjectName("videoLink")
+        self.link_label.setOpenExternalLinks(True)
+
+        self.description_label = QLabel()
+        self.description_label.setWordWrap(True)
+        self.description_label.setTextFormat(Qt.TextFormat.PlainText)
+        self.description_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.description_label.setObjectName("videoDescription")
+
+        video_layout.addWidget(self.thumbnail_label)
+        video_layout.addWidget(self.title_label)
+        video_layout.addWidget(self.meta_label)
+        video_layout.addWidget(self.tags_label)
+        video_layout.addWidget(self.link_label)
+        video_layout.addWidget(self.description_label)
+
+        self.scroll_area = CustomScrollArea()
+        self.scroll_content = QWidget()
+        self.scroll_layout = QVBoxLayout(self.scroll_content)
+        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
+        self.scroll_layout.addWidget(video_frame)
+        self.scroll_layout.addStretch()
+
+        self.scroll_area.setWidget(self.scroll_content)
+        self.scroll_area.setWidgetResizable(True)
+
+        layout.addLayout(header_layout)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.scroll_area)
+
+        self.setLayout(layout)
+
+    def load_video(self, video, next_ids=()):
+        """Show `video` and fetch its details; `next_ids` are the videos after it in the feed"""
+        key = details_key([video['id']])
+        if self.subscription and self.subscription.key == key and self.subscription.is_active():
+            return
+
+        self.current_video = video
+        self.show_thumbnail(video)
+        self.show_details(video)
+        self.scroll_area.verticalScrollBar().setValue(0)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.status_label.clear()
+
+        if self.subscription:
+            self.subscription.cancel()
+        self.subscription = IN_FLIGHT.subscribe(
+            key,
+            lambda: VideoDetailsWorker([video['id']]),
+            progress=self.status_label.setText,
+            finished=self.on_details_loaded,
+            error=self.on_error
+        )
+
+        # Sent at the same time, so the engine merges both into one request
+        prefetch_ids = [video_id for video_id in next_ids if video_id != video['id']][:self.PREFETCH]
+        if prefetch_ids and not (self.prefetch and self.prefetch.is_active()):
+            self.prefetch = IN_FLIGHT.subscribe(
+                details_key(prefetch_ids), lambda: VideoDetailsWorker(prefetch_ids), priority=BACKGROUND
+            )
+
+    def show_thumbnail(self, video):
+        thumbnail_path = video.get('thumbnail_path', '')
+        if os.path.exists(thumbnail_path):
+            self.thumbnail_label.setPixmap(QPixmap(thumbnail_path).scaled(
+                480, 360, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+            ))
+            self.thumbnail_label.setVisible(True)
+        else:
+            self.thumbnail_label.clear()
+            self.thumbnail_label.setVisible(False)
+
+    def show_details(self, video):
+        """Fill the page from a feed Video or, once fetched, its VideoDetails"""
+        self.title_label.setText(video.get('title', 'No Title'))
+
+        meta_parts = []
+        if video.get('channel_title'):
+            meta_parts.append(video['channel_title'])
+        if 'view_count' in video:
+            meta_parts.append(f"{video['view_count']:,} views")
+        if 'like_count' in video:
+            meta_parts.append(f"👍 {video['like_count']:,}")
+        if 'comment_count' in video:
+            meta_parts.append(f"💬 {video['comment_count']:,}")
+        if video.get('duration_formatted'):
+            meta_parts.append(f"⏱ {video['duration_formatted']}")
+        if 'published_at' in video:
+            meta_parts.append(video['published_at'])
+        self.meta_label.setText(" • ".join(meta_parts))
+
+        tags = video.get('tags', [])
+        self.tags_label.setText(" ".join(f"#{tag}" for tag in tags))
+        self.tags_label.setVisible(bool(tags))
+
+        url = f"https://www.youtube.com/watch?v={video['id']}"
+        self.link_label.setText(f'▶ <a href="{url}">Watch on YouTube</a>')
+        self.description_label.setText(video.get('description', '') or "No description")
+
+    def on_details_loaded(self, details):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
+        self.progress_bar.setVisible(False)
+        if not details:
+            self.status_label.setText("No details available, the video may be private or deleted")
+            return
+        with METRICS.span('ui.video_details'):
+            self.show_details(details[0])
+        self.status_label.clear()
+
+    def on_error(self, error_message):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
+        self.progress_bar.setVisible(False)
+        # What the feed knew stays on the page
+        self.status_label.setText(f"❌ {error_message}")
@@ -1,27 +1,26 @@
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
-                            QPushButton, QLabel, QFrame, QMessageBox, QProgressBar)
-from PyQt6.QtCore import Qt
+                            QPushButton, QLabel, QFrame, QMessageBox, QProgressBar, QStackedWidget)
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QFont
-from ...logic.youtube_handler import YouTubeWorker
+from ...logic.feed_view import VIDEO_FILTERS, VIDEO_SORTS
+from ...logic.metrics import METRICS
+from ...logic.search_index import SEARCH_INDEX
+from ...logic.youtube_handler import YouTubeWorker, channel_cache_key
+from ...logic.scheduler import BACKGROUND, USER
+from ...logic.workers import IN_FLIGHT
+from ..shared.feed_controls import FeedControls
+from ..shared.feed_updates import apply_feed_update, clear_layout
+from ..shared.search_panel import SearchPanel
 
 class VideoFrame(QFrame):
+    video_clicked = pyqtSignal(object)
+    
     def __init__(self, video_data):
         super().__init__()
+        self.video_data = video_data
         self.setFrameStyle(QFrame.Shape.Box)
-        self.setStyleSheet("""
-            QFrame {
-                border: 1px solid #666666;
-                margin: 8px;
-                padding: 12px;
-                border-radius: 8px;
-                background-color: #404040;
-            }
-            QFrame:hover {
-                border: 2px solid #0078d4;
-                background-color: #454545;
-            }
-        """)
+        self.setObjectName("videoCard")
         
         layout = QHBoxLayout()
         layout.setSpacing(15)
@@ -29,21 +28,14 @@ class VideoFrame(QFrame):
         # Thumbnail container
         thumbnail_container = QFrame()
         thumbnail_container.setFixedSize(160, 120)
-        thumbnail_container.setStyleSheet("""
-            QFrame {
-                border: 1px solid #555555;
-                border-radius: 6px;
-                background-color: #333333;
-                margin: 0px;
-                padding: 0px;
-            }
-        """)
+        thumbnail_container.setObjectName("thumbnailBox")
         
         thumbnail_layout = QVBoxLayout(thumbnail_container)
         thumbnail_layout.setContentsMargins(0, 0, 0, 0)
         
         # Thumbnail
         thumbnail_label = QLabel()
+        thumbnail_label.setObjectName("thumbnail")
         thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         if os.path.exists(video_data.get('thumbnail_path', '')):
@@ -55,15 +47,9 @@ class VideoFrame(QFrame):
                 Qt.TransformationMode.SmoothTransformation
             )
             thumbnail_label.setPixmap(scaled_pixmap)
-            thumbnail_label.setStyleSheet("border: none; background: transparent;")
         else:
             thumbnail_label.setText("No Thumbnail")
-            thumbnail_label.setStyleSheet("""
-                border: none;
-                background-color: #555555;
-                color: #999999;
-                font-size: 11px;
-            """)
+            thumbnail_label.setProperty("missing", True)
         
         thumbnail_layout.addWidget(thumbnail_label)
         
@@ -75,7 +61,7 @@ class VideoFrame(QFrame):
         title_label = QLabel(video_data.get('title', 'No Title'))
         title_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
         title_label.setWordWrap(True)
-        title_label.setStyleSheet("color: #ffffff; margin: 0px;")
+        title_label.setObjectName("cardTitle")
         title_label.setMaximumHeight(60)  # Limit title height
         
         # Stats
@@ -89,7 +75,7 @@ class VideoFrame(QFrame):
         
         if stats_text:
             stats_label = QLabel(stats_text)
-            stats_label.setStyleSheet("color: #999999; font-size: 10px; margin: 0px;")
+            stats_label.setObjectName("cardStats")
         
         # Description
         desc_text = video_data.get('description', 'No description')
@@ -98,7 +84,7 @@ class VideoFrame(QFrame):
         
         desc_label = QLabel(desc_text)
         desc_label.setWordWrap(True)
-        desc_label.setStyleSheet("color: #cccccc; font-size: 10px; margin: 0px;")
+        desc_label.setObjectName("cardText")
         
         # Add to layout
         info_layout.addWidget(title_label)
@@ -111,13 +97,38 @@ class VideoFrame(QFrame):
         layout.addLayout(info_layout, 1)
         
         self.setLayout(layout)
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.video_clicked.emit(self.video_data)
 
 class YouTubeTab(QWidget):
     def __init__(self):
         super().__init__()
+        self.video_frames = {}
+        self.current_url = None
+        self.background_load = False
+        self.subscription = None
         self.init_ui()
         
     def init_ui(self):
+        # Switch between the video list and the details of an opened video
+        self.stacked_widget = QStackedWidget()
+        self.video_list_page = self.create_video_list_page()
+        
+        # Details page is created the first time a video is opened
+        self.video_details_page = None
+        
+        self.stacked_widget.addWidget(self.video_list_page)
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.stacked_widget)
+        self.setLayout(layout)
+    
+    def create_video_list_page(self):
+        """Create the channel input and video list page"""
+        page = QWidget()
         layout = QVBoxLayout()
         layout.setSpacing(15)
         layout.setContentsMargins(15, 15, 15, 15)
@@ -129,24 +140,12 @@ class YouTubeTab(QWidget):
         self.url_input = QLineEdit()
         self.url_input.setPlaceholderText("Enter YouTube channel URL (e.g., https://www.youtube.com/@channelname)")
         self.url_input.setMinimumHeight(40)
-        self.url_input.setStyleSheet("""
-            QLineEdit {
-                background-color: #404040;
-                border: 2px solid #666666;
-                padding: 10px;
-                border-radius: 6px;
-                color: #ffffff;
-                font-size: 12px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0078d4;
-            }
-        """)
+        self.url_input.setObjectName("channelInput")
         
         self.load_button = QPushButton("🔍 Load Videos")
         self.load_button.setMinimumHeight(40)
         self.load_button.setMinimumWidth(120)
-        self.load_button.clicked.connect(self.load_videos)
+        self.load_button.clicked.connect(lambda: self.load_videos())
         
         input_layout.addWidget(self.url_input, 4)
         input_layout.addWidget(self.load_button, 1)
@@ -154,23 +153,11 @@ class YouTubeTab(QWidget):
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #555555;
-                border-radius: 8px;
-                text-align: center;
-                background-color: #404040;
-                height: 20px;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d4;
-                border-radius: 6px;
-            }
-        """)
+        self.progress_bar.setObjectName("loadProgress")
         
         # Status label
         self.status_label = QLabel("Enter a YouTube channel URL to get started")
-        self.status_label.setStyleSheet("color: #cccccc; padding: 10px; font-size: 12px;")
+        self.status_label.setObjectName("statusLabel")
         
         # Scroll area for videos - using custom scrollbar styling
         from ..shared.custom_scroll import CustomScrollArea
@@ -183,63 +170,160 @@ class YouTubeTab(QWidget):
         self.scroll_area.setWidget(self.scroll_content)
         self.scroll_area.setWidgetResizable(True)
         
+        # Search over every cached channel, shown in place of the videos
+        self.search_panel = SearchPanel(
+            "🔎 Search cached videos...", SEARCH_INDEX.search_videos, self.create_video_frame, self.scroll_area
+        )
+        
+        # Sort and filter the loaded videos without fetching them again
+        self.feed_controls = FeedControls(VIDEO_SORTS, VIDEO_FILTERS, self.scroll_layout, lambda: self.video_frames)
+        
         layout.addLayout(input_layout)
         layout.addWidget(self.progress_bar)
         layout.addWidget(self.status_label)
-        layout.addWidget(self.scroll_area)
+        layout.addWidget(self.feed_controls)
+        layout.addWidget(self.search_panel)
         
-        self.setLayout(layout)
+        page.setLayout(layout)
+        return page
     
-    def load_videos(self):
+    def load_videos(self, background=False):
         url = self.url_input.text().strip()
         if not url:
-            QMessageBox.warning(self, "Warning", "Please enter a YouTube channel URL")
+            if not background:
+                QMessageBox.warning(self, "Warning", "Please enter a YouTube channel URL")
             return
         
+        # The same channel is already loading, let that fetch finish
+        key = channel_cache_key(url)
+        if self.subscription and self.subscription.key == key and self.subscription.is_active():
+            if not background:
+                # The user is now waiting on it, move it ahead of background work
+                self.background_load = False
+                self.subscription.worker.priority = USER
+            return
+        
+        self.background_load = background
         self.load_button.setEnabled(False)
         self.load_button.setText("⏳ Loading...")
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         
-        # Clear previous videos
-        for i in reversed(range(self.scroll_layout.count())):
-            child = self.scroll_layout.itemAt(i)
-            if child.widget():
-                child.widget().setParent(None)
-        
-        # Start worker thread
-        self.worker = YouTubeWorker(url)
-        self.worker.progress.connect(self.update_status)
-        self.worker.finished.connect(self.on_videos_loaded)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        # Clear previous videos, unless we are refreshing the channel on screen
+        if url != self.current_url:
+            clear_layout(self.scroll_layout)
+            self.video_frames = {}
+            self.feed_controls.set_items([])
+        self.current_url = url
+        
+        # Drop the superseded load and share any identical one in flight
+        if self.subscription:
+            self.subscription.cancel()
+        self.subscription = IN_FLIGHT.subscribe(
+            key,
+            lambda: YouTubeWorker(url),
+            priority=BACKGROUND if background else USER,
+            progress=self.update_status,
+            cached=self.on_videos_cached,
+            finished=self.on_videos_loaded,
+            error=self.on_error
+        )
     
     def update_status(self, message):
         self.status_label.setText(message)
     
+    def create_video_frame(self, video):
+        video_frame = VideoFrame(video)
+        video_frame.video_clicked.connect(self.show_video_details)
+        return video_frame
+    
+    def add_video_frames(self, videos):
+        with METRICS.span('ui.youtube_cards'):
+            for video in videos:
+                video_frame = self.create_video_frame(video)
+                self.video_frames[video['id']] = video_frame
+                self.scroll_layout.addWidget(video_frame)
+            
+            self.scroll_layout.addStretch()
+        self.feed_controls.set_items(videos)
+    
+    def on_videos_cached(self, videos):
+        """Show stale cached videos while the worker refreshes them"""
+        if self.video_frames:
+            apply_feed_update(self.scroll_layout, self.video_frames, videos, self.create_video_frame, 'video_data')
+            self.feed_controls.set_items(videos)
+        else:
+            self.add_video_frames(videos)
+    
+    def show_cached(self, channel_url, videos):
+        """Render videos from a previous session before any network activity"""
+        if not videos:
+            return
+        self.url_input.setText(channel_url)
+        self.current_url = channel_url
+        self.add_video_frames(videos)
+        self.status_label.setText(f"Showing {len(videos)} cached videos from your last session")
+    
     def on_videos_loaded(self, videos):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
         self.progress_bar.setVisible(False)
         self.load_button.setEnabled(True)
         self.load_button.setText("🔍 Load Videos")
         
+        if videos and self.video_frames:
+            # Cached videos are already on screen, only swap what changed
+            updated = apply_feed_update(self.scroll_layout, self.video_frames, videos, self.create_video_frame, 'video_data')
+            self.feed_controls.set_items(videos)
+            self.status_label.setText(f"✅ Loaded {len(videos)} videos, {updated} updated (click to view details)")
+            return
+        
+        # Remove any stale cards before showing the final result
+        clear_layout(self.scroll_layout)
+        self.video_frames = {}
+        self.feed_controls.set_items([])
+        
         if not videos:
             self.status_label.setText("No videos found for this channel.")
             no_videos_label = QLabel("No videos found for this channel.")
-            no_videos_label.setStyleSheet("color: #999999; padding: 40px; text-align: center; font-size: 14px;")
+            no_videos_label.setObjectName("emptyFeed")
             no_videos_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.scroll_layout.addWidget(no_videos_label)
+            self.scroll_layout.addStretch()
         else:
             self.status_label.setText(f"✅ Loaded {len(videos)} videos (click to view details)")
-            
-            for video in videos:
-                video_frame = VideoFrame(video)
-                self.scroll_layout.addWidget(video_frame)
-        
-        self.scroll_layout.addStretch()
+            self.add_video_frames(videos)
     
     def on_error(self, error_message):
+        if self.subscription and self.subscription.close_if_finished():
+            self.subscription = None
         self.progress_bar.setVisible(False)
         self.load_button.setEnabled(True)
         self.load_button.setText("🔍 Load Videos")
+        if self.background_load:
+            # Don't interrupt with a dialog for refreshes the user didn't ask for
+            self.status_label.setText(f"❌ Refresh failed: {error_message}")
+            return
         self.status_label.setText("❌ Error occurred")
-        QMessageBox.critical(self, "Error", error_message)
\ No newline at end of file
+        QMessageBox.critical(self, "Error", error_message)
+    
+    def show_video_details(self, video):
+        """Switch to the details page and load the selected video"""
+        if self.video_details_page is None:
+            from .video_details_viewer import VideoDetailsViewer
+            self.video_details_page = VideoDetailsViewer()
+            self.video_details_page.back_clicked.connect(self.show_video_list)
+            self.stacked_widget.addWidget(self.video_details_page)
+        
+        # The videos below it in the feed, as sorted and filtered on screen
+        frames = [frame for frame in self.video_frames.values() if not frame.isHidden()]
+        order = sorted(frames, key=self.scroll_layout.indexOf)
+        ids = [frame.video_data['id'] for frame in order]
+        next_ids = ids[ids.index(video['id']) + 1:] if video['id'] in ids else []
+        
+        self.video_details_page.load_video(video, next_ids)
+        self.stacked_widget.setCurrentWidget(self.video_details_page)
+    
+    def show_video_list(self):
+        """Switch back to the video list"""
+        self.stacked_widget.setCurrentWidget(self.video_list_page)
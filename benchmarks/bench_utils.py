@@ -0,0 +1,93 @@
+import json
+import os
+import platform
+import statistics
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FOLDER = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+
+def summarize(samples):
+    """Reduce a list of timings to the statistics we track"""
+    ordered = sorted(samples)
+    return {
+        'median': statistics.median(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'runs': len(ordered)
+    }
+
+
+def write_results(name, results, output=None):
+    """Write benchmark results as JSON and return the path written"""
+    output = output or os.path.join(RESULTS_FOLDER, f"{name}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    payload = {
+        'benchmark': name,
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    return output
+
+
+def compare_to_baseline(results, baseline_path, tolerance=0.25):
+    """Compare median timings with a stored baseline.
+
+    Every metric is "lower is better". Returns a list of regressions as
+    (metric, baseline, current) tuples for metrics that got slower than the
+    baseline by more than `tolerance` (0.25 = 25%).
+    """
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, skipping comparison (store one with --update-baseline)")
+        return []
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+
+    regressions = []
+    for metric, stats in results.items():
+        if metric not in baseline or not isinstance(stats, dict):
+            continue
+        before = baseline[metric]['median']
+        after = stats['median']
+        change = (after - before) / before if before else 0
+        print(f"{metric:40s} {before:10.2f} -> {after:10.2f} ({change:+.0%})")
+        if change > tolerance:
+            regressions.append((metric, before, after))
+    return regressions
+
+
+def finish(name, results, args):
+    """Shared tail of every benchmark: write, compare, and set the exit code.
+
+    Baselines live in benchmarks/baselines/<name>.json. The Qt benchmarks
+    (load, startup, cards, feed_view, memory) need PyQt6, so their
+    baselines are stored by running them with --update-baseline where it
+    is installed.
+    """
+    path = write_results(name, results, args.output)
+    print(f"Results written to {path}")
+
+    baseline_path = args.baseline or os.path.join(REPO_ROOT, "benchmarks", "baselines", f"{name}.json")
+    if args.update_baseline:
+        write_results(name, results, baseline_path)
+        print(f"Baseline updated at {baseline_path}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline_path, args.tolerance)
+    for metric, before, after in regressions:
+        print(f"REGRESSION: {metric} {before:.2f} -> {after:.2f}")
+    return 1 if regressions else 0
+
+
+def add_common_arguments(parser):
+    parser.add_argument('--output', help="Where to write the JSON results")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the new baseline")
@@ -0,0 +1,140 @@
+"""Card construction benchmark: themed cards vs. per-widget stylesheets.
+
+Builds batches of VideoFrame, RedditPostFrame and CommentFrame cards
+offscreen under the application theme and times construction through the
+first layout and paint, when Qt resolves their style. For comparison, the
+same cards are built again with the per-widget stylesheet strings the
+cards used to set on themselves re-applied, which is what every card cost
+before the theme:
+
+    python -m benchmarks.cards_benchmark --cards 200 --runs 10
+
+Results go to benchmarks/results/cards.json and are compared with
+benchmarks/baselines/cards.json when it exists.
+"""
+import argparse
+import os
+import sys
+import time
+
+from .bench_utils import add_common_arguments, finish, summarize
+
+CARD_FRAME = """
+    QFrame { border: 1px solid #666666; margin: 8px; padding: 12px; border-radius: 8px; background-color: #404040; }
+    QFrame:hover { border: 2px solid #0078d4; background-color: #454545; }
+"""
+
+# Stylesheets the widgets set on themselves before the theme, by object name
+LEGACY_STYLES = {
+    'videoCard': CARD_FRAME,
+    'postCard': CARD_FRAME,
+    'thumbnailBox': "QFrame { border: 1px solid #555555; border-radius: 6px; background-color: #333333; "
+                    "margin: 0px; padding: 0px; }",
+    'cardTitle': "color: #ffffff; margin: 0px;",
+    'cardStats': "color: #999999; font-size: 10px; margin: 0px;",
+    'cardText': "color: #cccccc; font-size: 10px; margin: 0px;",
+    'postType': "color: #0078d4; font-size: 9px; margin: 0px;",
+    'commentMeta': "color: #0078d4; font-size: 10px; font-weight: bold;",
+    'commentBody': "color: #ffffff; font-size: 11px; margin: 5px 0px;",
+}
+LEGACY_THUMBNAIL_STYLES = {
+    False: "border: none; background: transparent;",
+    True: "border: none; background-color: #555555; color: #999999; font-size: 11px;",
+}
+LEGACY_POST_TEXT_STYLE = "color: #cccccc; font-size: 10px; margin-top: 5px;"
+LEGACY_COMMENT_STYLES = {
+    False: "QFrame { border: 1px solid #555555; margin: 8px; padding: 10px; border-radius: 6px; "
+           "background-color: #404040; }",
+    True: "QFrame { border-left: 3px solid #0078d4; margin: 5px 5px 5px 30px; padding: 8px; "
+          "border-radius: 4px; background-color: #383838; }",
+}
+
+
+def sample_items(count):
+    videos = [{'id': f"v{i}", 'title': f"Video {i}", 'description': "Description " * 20,
+               'published_at': 'Jan 01, 2025', 'view_count': i * 1000} for i in range(count)]
+    posts = [{'id': f"p{i}", 'title': f"Post {i}", 'author': 'user', 'subreddit': 'popular',
+              'score_formatted': '1.2K', 'comments_formatted': '34', 'created_formatted': 'Jan 01, 2025 at 12:00',
+              'selftext': "Text " * 50, 'is_self': i % 2 == 0, 'domain': 'example.com'} for i in range(count)]
+    comments = [{'id': f"c{i}", 'author': 'user', 'score': i, 'created_formatted': 'Jan 01, 2025 at 12:00',
+                 'body': "Body " * 30, 'is_submitter': i % 5 == 0} for i in range(count)]
+    return videos, posts, comments
+
+
+def apply_legacy_styles(card):
+    """Give a themed card the per-widget stylesheets it used to set"""
+    from PyQt6.QtWidgets import QWidget
+    if card.objectName() == 'commentCard':
+        card.setStyleSheet(LEGACY_COMMENT_STYLES[bool(card.property('reply'))])
+    else:
+        card.setStyleSheet(LEGACY_STYLES[card.objectName()])
+    for child in card.findChildren(QWidget):
+        name = child.objectName()
+        if name == 'thumbnail':
+            sheet = LEGACY_THUMBNAIL_STYLES[bool(child.property('missing'))]
+        elif name == 'cardText' and card.objectName() == 'postCard':
+            sheet = LEGACY_POST_TEXT_STYLE
+        else:
+            sheet = LEGACY_STYLES.get(name)
+        if sheet:
+            child.setStyleSheet(sheet)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=200, help="Cards per batch")
+    parser.add_argument('--runs', type=int, default=10)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication, QVBoxLayout, QWidget
+    from app.ui.reddit.reddit_post_viewer import CommentFrame
+    from app.ui.reddit.reddit_widgets import RedditPostFrame
+    from app.ui.theme import apply_theme
+    from app.ui.youtube.youtube_widgets import VideoFrame
+
+    app = QApplication(sys.argv[:1])
+    apply_theme(app)
+    videos, posts, comments = sample_items(args.cards)
+    kinds = {
+        'video': lambda: [VideoFrame(video) for video in videos],
+        'post': lambda: [RedditPostFrame(post) for post in posts],
+        'comment': lambda: [CommentFrame(comment, is_reply=i % 3 == 2) for i, comment in enumerate(comments)],
+    }
+
+    def build(make_cards, legacy):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        container.resize(1000, 800)
+        container.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        for card in make_cards():
+            if legacy:
+                apply_legacy_styles(card)
+            layout.addWidget(card)
+        # Style, layout and paint happen once control returns to the event loop
+        app.processEvents()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        container.deleteLater()
+        app.processEvents()
+        return elapsed
+
+    results = {}
+    for kind, make_cards in kinds.items():
+        themed = summarize([build(make_cards, False) for _ in range(args.runs)])
+        legacy = summarize([build(make_cards, True) for _ in range(args.runs)])
+        results[f"{kind}_cards_ms"] = themed
+        results[f"{kind}_cards_per_widget_styles_ms"] = legacy
+        print(f"{args.cards} {kind} cards: {themed['median']:.1f} ms themed, "
+              f"{legacy['median']:.1f} ms with per-widget stylesheets")
+
+    app.quit()
+    return finish('cards', results, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Feed sort/filter benchmark: moving existing cards vs. rebuilding them.
+
+Shows a feed of generated Reddit posts offscreen, then switches through
+every sort order and a few filters the way the feed controls do, timing
+each switch through the next layout and paint. For comparison, the same
+switches are timed again by clearing the feed and building its cards anew
+in the new order, which is what a refetch-style re-sort costs:
+
+    python -m benchmarks.feed_view_benchmark --posts 2000 --runs 5
+
+Results go to benchmarks/results/feed_view.json and are compared with
+benchmarks/baselines/feed_view.json when it exists.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from .bench_utils import add_common_arguments, finish, summarize
+from app.logic.feed_view import POST_FILTERS, POST_SORTS, FeedView
+from app.logic.normalize import Post
+
+SUBREDDITS = ("python", "rust", "golang", "programming", "linux")
+
+
+def sample_posts(count, rng):
+    return [Post(id=f"p{i}", title=f"Post {i}", author='user', subreddit=rng.choice(SUBREDDITS),
+                 score=rng.randrange(50000), upvote_ratio=rng.random(), num_comments=rng.randrange(3000),
+                 created_utc=1.7e9 + rng.randrange(10 ** 6), selftext="Text " * 20, is_self=i % 2 == 0,
+                 domain='example.com', nsfw=i % 17 == 0, url='', permalink='')
+            for i in range(count)]
+
+
+def switches():
+    """(sort, filters) pairs the user might click through"""
+    for sort in POST_SORTS:
+        yield sort, {}
+    yield 'score', {'subreddit': 'python'}
+    yield 'newest', {'nsfw': False, 'post_type': 'text'}
+    yield 'comments', {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=2000, help="Cards in the feed")
+    parser.add_argument('--runs', type=int, default=5)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication, QVBoxLayout, QWidget
+    from app.ui.reddit.reddit_widgets import RedditPostFrame
+    from app.ui.shared.feed_updates import arrange_cards, clear_layout
+    from app.ui.theme import apply_theme
+
+    app = QApplication(sys.argv[:1])
+    apply_theme(app)
+    posts = sample_posts(args.posts, random.Random(0))
+    view = FeedView(POST_SORTS, POST_FILTERS)
+    view.set_items(posts)
+
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    container.resize(1000, 800)
+    container.show()
+    frames = {}
+    for post in posts:
+        frames[post['id']] = RedditPostFrame(post)
+        layout.addWidget(frames[post['id']])
+    layout.addStretch()
+    app.processEvents()
+
+    def arrange(ids):
+        arrange_cards(layout, ids, frames)
+
+    def rebuild(ids):
+        clear_layout(layout)
+        frames.clear()
+        for item_id in ids:
+            frames[item_id] = RedditPostFrame(view.items[item_id])
+            layout.addWidget(frames[item_id])
+        layout.addStretch()
+
+    samples = {'arrange': [], 'rebuild': []}
+    for name, switch in (('arrange', arrange), ('rebuild', rebuild)):
+        for _ in range(args.runs):
+            for sort, filters in switches():
+                start = time.perf_counter()
+                switch(view.visible_ids(sort, filters))
+                # Layout and paint happen once control returns to the event loop
+                app.processEvents()
+                samples[name].append((time.perf_counter() - start) * 1000)
+
+    results = {f"switch_{name}_ms": summarize(values) for name, values in samples.items()}
+    arranged, rebuilt = results['switch_arrange_ms'], results['switch_rebuild_ms']
+    print(f"{args.posts} cards: {arranged['median']:.1f} ms moving cards, "
+          f"{rebuilt['median']:.1f} ms rebuilding them (p95 {arranged['p95']:.1f} vs {rebuilt['p95']:.1f} ms)")
+
+    container.deleteLater()
+    app.processEvents()
+    app.quit()
+    return finish('feed_view', results, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""End-to-end load benchmark: the real workers against the local stand-in API.
+
+For every feed size and simulated latency, a fresh interpreter in an empty
+data folder runs YouTubeWorker, RedditWorker and CommentWorker flows:
+
+    cold   no cache, full network load (including thumbnails for YouTube)
+    warm   cache still fresh, served from disk
+    stale  cache expired: cached items first, then the refresh
+
+and records time to first item, time to finished, and how long the
+thumbnail downloads took:
+
+    python -m benchmarks.load_benchmark --sizes 10 100 1000 10000 --latencies 0 0.05 --runs 3
+
+Results go to benchmarks/results/load.json and are compared with
+benchmarks/baselines/load.json when it exists.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from .bench_utils import REPO_ROOT, add_common_arguments, finish, summarize
+
+CHANNEL_URL = "https://www.youtube.com/@standin0"
+SUBREDDIT = 'popular'
+WORKER_TIMEOUT_MS = 10 * 60 * 1000
+
+
+def time_worker(worker):
+    """Run `worker` to completion on the fetch pool and time its signals"""
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    times = {}
+    start = time.perf_counter()
+
+    def mark(name):
+        times.setdefault(name, (time.perf_counter() - start) * 1000)
+
+    def on_cached(items):
+        if items:
+            mark('first_item_ms')
+
+    def on_progress(message):
+        if message.startswith('Downloading'):
+            mark('thumbnails_started')
+
+    def on_finished(*result):
+        mark('first_item_ms')
+        mark('load_ms')
+        loop.quit()
+
+    def on_error(message):
+        times['error'] = message
+        loop.quit()
+
+    if hasattr(worker, 'cached'):
+        worker.cached.connect(on_cached)
+    worker.progress.connect(on_progress)
+    worker.finished.connect(on_finished)
+    worker.error.connect(on_error)
+    QTimer.singleShot(WORKER_TIMEOUT_MS, loop.quit)
+    worker.start()
+    loop.exec()
+
+    if 'error' in times or 'load_ms' not in times:
+        raise RuntimeError(f"{type(worker).__name__} failed: {times.get('error', 'timed out')}")
+    started = times.pop('thumbnails_started', None)
+    if started is not None:
+        times['thumbnails_ms'] = times['load_ms'] - started
+    return times
+
+
+def expire_cache(path):
+    """Make every entry of a cache file stale"""
+    with open(path, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    for entry in cache.values():
+        entry['timestamp'] = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+
+def measure_once(size):
+    """Runs inside the child process and prints one JSON sample"""
+    from PyQt6.QtCore import QCoreApplication
+    from app.logic.cache_store import REDDIT_CACHE_FILE, YOUTUBE_CACHE_FILE
+    from app.logic.reddit_handler import RedditWorker
+    from app.logic.youtube_handler import YouTubeWorker
+    from app.ui.reddit.reddit_post_viewer import CommentWorker
+
+    app = QCoreApplication(sys.argv[:1])
+    sample = {}
+
+    def record(flow, times):
+        for name, value in times.items():
+            sample[f"{flow}_{name}"] = value
+
+    for phase in ('cold', 'warm', 'stale'):
+        if phase == 'stale':
+            expire_cache(YOUTUBE_CACHE_FILE)
+        record(f"youtube_{phase}", time_worker(YouTubeWorker(CHANNEL_URL, max_videos=size)))
+
+    for phase in ('cold', 'warm', 'stale'):
+        if phase == 'stale':
+            expire_cache(REDDIT_CACHE_FILE)
+        record(f"reddit_{phase}", time_worker(RedditWorker(SUBREDDIT, limit=size)))
+
+    record('comments_cold', time_worker(CommentWorker({'id': 'p0x0'})))
+    app.quit()
+    print(json.dumps(sample))
+
+
+def child_environment(base_url):
+    from app.standin import standin_environment
+
+    env = dict(os.environ)
+    env.update(standin_environment(base_url))
+    env.update({
+        'YOUTUBE_KEY': 'standin',
+        'FETCH_TRANSPORT': 'live',
+        'QT_QPA_PLATFORM': 'offscreen',
+        'PYTHONPATH': REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    })
+    return env
+
+
+def run_scenario(size, latency, runs):
+    """Samples of one feed size / latency pair, each in a fresh interpreter"""
+    from app.standin import Fixtures, start_standin
+
+    server = start_standin(Fixtures.synthetic(channels=1, videos=size, subreddits=1, posts=size),
+                           latency=latency)
+    samples = []
+    try:
+        for i in range(runs):
+            with tempfile.TemporaryDirectory() as data_dir:
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.load_benchmark', '--child', '--sizes', str(size)],
+                    cwd=data_dir, env=child_environment(server.base_url),
+                    capture_output=True, text=True, check=True
+                ).stdout
+            sample = json.loads(output.strip().splitlines()[-1])
+            samples.append(sample)
+            print(f"{size} items, {latency * 1000:.0f} ms latency, run {i + 1}/{runs}: "
+                  f"YouTube cold {sample['youtube_cold_load_ms']:.0f} ms, "
+                  f"Reddit cold {sample['reddit_cold_load_ms']:.0f} ms")
+    finally:
+        server.shutdown()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--latencies', type=float, nargs='+', default=[0.0, 0.05],
+                        help="Seconds of simulated latency per request")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once(args.sizes[0])
+        return 0
+
+    # The stand-in serves thumbnails from the repo's youtube_data/
+    os.chdir(REPO_ROOT)
+    results = {}
+    for size in args.sizes:
+        for latency in args.latencies:
+            samples = run_scenario(size, latency, args.runs)
+            for metric in samples[0]:
+                results[f"{metric}[{size}@{latency * 1000:.0f}ms]"] = summarize([s[metric] for s in samples])
+    return finish('load', results, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
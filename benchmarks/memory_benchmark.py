@@ -0,0 +1,223 @@
+"""Memory benchmark: reload the feeds hundreds of times and check nothing piles up.
+
+Builds the YouTube tab, the Reddit tab and the post viewer offscreen and
+pushes fresh results through them the way a long session refreshes: via
+IN_FLIGHT subscriptions to workers on the fetch pool, alternating between
+in-place updates, full rebuilds and empty results. No network is used; the
+workers hand back generated feeds as the Video, Post and Comment records
+the real workers build.
+
+    python -m benchmarks.memory_benchmark --reloads 300
+
+After a warm-up, process RSS, live widgets, live QObjects under the tabs
+and live workers must stay flat, otherwise the run fails. RSS is read with
+psutil when installed, else from /proc. Timings go to
+benchmarks/results/memory.json and are compared with
+benchmarks/baselines/memory.json when it exists.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+from .bench_utils import add_common_arguments, finish, summarize
+from app.logic.normalize import MISSING, Comment, Post, Video
+
+WAIT_TIMEOUT = 10
+
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def make_videos(reload, count, thumbnail_path):
+    return [Video(
+        id=f"v{i}",
+        title=f"Video {i}",
+        description="Description " * 20,
+        published_at='Jan 01, 2025',
+        view_count=reload * 1000 + i,
+        thumbnail_path=thumbnail_path
+    ) for i in range(count)]
+
+
+def make_posts(reload, count):
+    return [Post(
+        id=f"p{i}",
+        title=f"Post {i}",
+        author=f"user{i}",
+        subreddit='popular',
+        score=reload * 10 + i,
+        num_comments=i,
+        created_utc=1735732800,
+        selftext="Text " * 50,
+        is_self=i % 2 == 0,
+        domain='example.com'
+    ) for i in range(count)]
+
+
+def make_thread(reload, count):
+    details = Post(
+        id='p0', title=f"Post {reload}", subreddit='popular', author='user', score=reload, num_comments=count,
+        created_utc=1735732800, selftext="Text " * 50, is_self=True, url=''
+    )
+
+    def comment(comment_id, replies=MISSING):
+        return Comment(id=comment_id, author='user', score=1, created_utc=1735732800, body="Body " * 30,
+                       replies=replies)
+
+    comments = [comment(f"c{i}", [comment(f"r{i}x{j}") for j in range(2)]) for i in range(count)]
+    return details, comments
+
+
+def run(args):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtCore import QCoreApplication, QEvent, QObject, pyqtSignal
+    from PyQt6.QtGui import QColor, QPixmap
+    from PyQt6.QtWidgets import QApplication
+    from app.logic.workers import IN_FLIGHT, CancellableWorker
+    from app.ui.gui import RedditTab
+    from app.ui.reddit.reddit_post_viewer import RedditPostViewer
+    from app.ui.theme import apply_theme
+    from app.ui.youtube.youtube_widgets import YouTubeTab
+
+    class FeedWorker(CancellableWorker):
+        """Reports a prepared feed straight away, like a warm cache"""
+        progress = pyqtSignal(str)
+        cached = pyqtSignal(list)
+        finished = pyqtSignal(list)
+        error = pyqtSignal(str)
+
+        def __init__(self, items):
+            super().__init__()
+            self.items = items
+
+        def run(self):
+            self.finished.emit(self.items)
+
+    class ThreadWorker(CancellableWorker):
+        progress = pyqtSignal(str)
+        finished = pyqtSignal(object, list)
+        error = pyqtSignal(str)
+
+        def __init__(self, thread):
+            super().__init__()
+            self.thread = thread
+
+        def run(self):
+            self.finished.emit(*self.thread)
+
+    app = QApplication(sys.argv[:1])
+    apply_theme(app)
+    youtube_tab, reddit_tab, viewer = YouTubeTab(), RedditTab(), RedditPostViewer()
+    for widget in (youtube_tab, reddit_tab, viewer):
+        widget.resize(1000, 800)
+        widget.show()
+
+    thumbnail_folder = tempfile.mkdtemp()
+    thumbnail_path = os.path.join(thumbnail_folder, 'thumbnail.jpg')
+    pixmap = QPixmap(480, 360)
+    pixmap.fill(QColor('#0078d4'))
+    pixmap.save(thumbnail_path)
+
+    def settle(owner):
+        """Wait for the owner's worker to report back, then run deferred deletes"""
+        deadline = time.perf_counter() + WAIT_TIMEOUT
+        while owner.subscription is not None and time.perf_counter() < deadline:
+            app.processEvents()
+        if owner.subscription is not None:
+            raise RuntimeError(f"{type(owner).__name__} did not let go of its worker")
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+    def reload_once(reload):
+        # Every tenth reload comes back empty, the one after rebuilds from scratch
+        empty = reload % 10 == 9
+        videos = [] if empty else make_videos(reload, args.items, thumbnail_path)
+        posts = [] if empty else make_posts(reload, args.items)
+
+        youtube_tab.subscription = IN_FLIGHT.subscribe(
+            'memory_youtube', lambda: FeedWorker(videos), progress=youtube_tab.update_status,
+            cached=youtube_tab.on_videos_cached, finished=youtube_tab.on_videos_loaded, error=youtube_tab.on_error
+        )
+        settle(youtube_tab)
+
+        reddit_tab.subscription = IN_FLIGHT.subscribe(
+            'memory_reddit', lambda: FeedWorker(posts), progress=reddit_tab.update_status,
+            cached=reddit_tab.on_posts_cached, finished=reddit_tab.on_posts_loaded, error=reddit_tab.on_error
+        )
+        settle(reddit_tab)
+
+        viewer.clear()
+        viewer.subscription = IN_FLIGHT.subscribe(
+            'memory_comments', lambda: ThreadWorker(make_thread(reload, args.comments)),
+            progress=viewer.update_status, finished=viewer.on_post_loaded, error=viewer.on_error
+        )
+        settle(viewer)
+
+    def live_counts():
+        gc.collect()
+        return {
+            'rss_mb': rss_mb(),
+            'widgets': len(QApplication.allWidgets()),
+            'qobjects': sum(len(widget.findChildren(QObject)) for widget in (youtube_tab, reddit_tab, viewer)),
+            'workers': sum(1 for obj in gc.get_objects() if isinstance(obj, CancellableWorker))
+        }
+
+    reload_ms = []
+    warmup = max(1, args.reloads // 5)
+    checkpoints = []
+    for reload in range(args.reloads):
+        start = time.perf_counter()
+        reload_once(reload)
+        reload_ms.append((time.perf_counter() - start) * 1000)
+        # Compare states at the same point of the ten-reload cycle
+        if reload >= warmup and reload % 10 == 0:
+            checkpoints.append(live_counts())
+            print(f"Reload {reload}: {checkpoints[-1]['rss_mb']:.1f} MB RSS, "
+                  f"{checkpoints[-1]['widgets']} widgets, {checkpoints[-1]['workers']} workers")
+
+    app.quit()
+    if len(checkpoints) < 2:
+        return summarize(reload_ms), None
+    first, last = checkpoints[0], checkpoints[-1]
+    return summarize(reload_ms), {name: last[name] - first[name] for name in first}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reloads', type=int, default=300)
+    parser.add_argument('--items', type=int, default=50, help="Videos and posts per reload")
+    parser.add_argument('--comments', type=int, default=20, help="Top comments per thread")
+    parser.add_argument('--max-rss-growth', type=float, default=10.0, metavar='MB',
+                        help="Allowed RSS growth after the warm-up (default 10 MB)")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    reload_stats, growth = run(args)
+    if growth is None:
+        print("Too few reloads to compare, use --reloads 50 or more")
+        return 2
+
+    print(f"After warm-up: RSS {growth['rss_mb']:+.1f} MB, widgets {growth['widgets']:+d}, "
+          f"QObjects {growth['qobjects']:+d}, workers {growth['workers']:+d}")
+    results = {'reload_ms': reload_stats, **{f"{name}_growth": value for name, value in growth.items()}}
+    code = finish('memory', results, args)
+
+    leaks = [name for name in ('widgets', 'qobjects', 'workers') if growth[name] > 0]
+    if growth['rss_mb'] > args.max_rss_growth:
+        leaks.append('rss_mb')
+    if leaks:
+        print(f"LEAK: kept growing across reloads: {', '.join(leaks)}")
+        code = 1
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
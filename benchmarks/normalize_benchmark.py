@@ -0,0 +1,139 @@
+"""Micro-benchmark of response normalization on large pages.
+
+Times the bulk normalizers and date formatting in app.logic.normalize on
+synthetic pages, next to the straightforward per-item versions they
+replaced, the conversions to and from the cache format, and the memory
+held by a page of post records next to the same posts as plain dicts:
+
+    python -m benchmarks.normalize_benchmark --items 10000 --runs 20
+
+Results go to benchmarks/results/normalize.json and are compared with
+benchmarks/baselines/normalize.json when it exists.
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .bench_utils import add_common_arguments, finish, summarize
+from app.logic import normalize
+
+
+def reference_format_timestamp(timestamp):
+    try:
+        return datetime.fromtimestamp(timestamp).strftime('%b %d, %Y at %H:%M')
+    except Exception:
+        return "Unknown date"
+
+
+def reference_format_date(date_string):
+    try:
+        return datetime.fromisoformat(date_string.replace('Z', '+00:00')).strftime('%b %d, %Y')
+    except Exception:
+        return date_string
+
+
+def playlist_page(count, rng, now):
+    return [{
+        'snippet': {
+            'title': f"Video {i}",
+            'description': "Description " * 40,
+            'publishedAt': datetime.fromtimestamp(now - rng.randrange(0, 86400 * 365 * 3), timezone.utc)
+                                   .strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'thumbnails': {'high': {'url': f"https://i.ytimg.com/vi/v{i}/hqdefault.jpg"}},
+            'channelTitle': "Channel"
+        },
+        'contentDetails': {'videoId': f"v{i}"}
+    } for i in range(count)]
+
+
+def listing_page(count, rng, now):
+    return [{'kind': 't3', 'data': {
+        'id': f"p{i}", 'title': f"Post {i}", 'author': f"user{i % 100}", 'subreddit': 'popular',
+        'score': rng.randrange(0, 200000), 'upvote_ratio': 0.9, 'num_comments': rng.randrange(0, 20000),
+        'created_utc': now - rng.randrange(0, 86400), 'url': f"https://example.com/{i}",
+        'permalink': f"/r/popular/comments/p{i}/", 'selftext': "Text " * 200, 'is_self': i % 2 == 0,
+        'domain': 'example.com', 'thumbnail': 'self' if i % 2 == 0 else f"https://b.thumbs.redditmedia.com/{i}.jpg",
+        'over_18': False
+    }} for i in range(count)]
+
+
+def clear_memos():
+    """Every run starts cold, like a freshly started process"""
+    normalize.format_minute.cache_clear()
+    normalize.format_date.cache_clear()
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        clear_memos()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def allocated_kb(build):
+    """Memory still held by what `build` returns"""
+    tracemalloc.start()
+    try:
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=20)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = time.time()
+    videos = playlist_page(args.items, rng, now)
+    posts = listing_page(args.items, rng, now)
+    timestamps = [child['data']['created_utc'] for child in posts]
+    dates = [item['snippet']['publishedAt'] for item in videos]
+    records = normalize.posts_from_listing(posts)
+    cached = normalize.list_to_cache(records)
+
+    cases = {
+        'videos_from_playlist_page_ms': lambda: normalize.videos_from_playlist_page(videos),
+        'posts_from_listing_ms': lambda: normalize.posts_from_listing(posts),
+        'format_timestamp_ms': lambda: [normalize.format_timestamp(t) for t in timestamps],
+        'format_date_ms': lambda: [normalize.format_date(d) for d in dates],
+        'posts_to_cache_ms': lambda: normalize.list_to_cache(records),
+        'posts_from_cache_ms': lambda: normalize.Post.list_from_cache(cached),
+    }
+    references = {
+        'format_timestamp_ms': lambda: [reference_format_timestamp(t) for t in timestamps],
+        'format_date_ms': lambda: [reference_format_date(d) for d in dates],
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = timed(fn, args.runs)
+        line = f"{name:32s} {results[name]['median']:8.2f} ms for {args.items} items"
+        if name in references:
+            before = timed(references[name], args.runs)['median']
+            line += f" (per-item strftime: {before:.2f} ms)"
+        print(line)
+
+    # Both layouts share the same field values, only the containers differ
+    results['post_records_kb'] = allocated_kb(lambda: normalize.Post.list_from_cache(cached))
+    results['post_dicts_kb'] = allocated_kb(lambda: [dict(post) for post in cached])
+    print(f"{args.items} posts hold {results['post_records_kb']:.0f} KB as records, "
+          f"{results['post_dicts_kb']:.0f} KB as dicts")
+
+    return finish('normalize', results, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
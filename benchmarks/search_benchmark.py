@@ -0,0 +1,96 @@
+"""Search benchmark: search-as-you-type queries against a large full-text index.
+
+Fills a fresh index in a temporary folder with generated videos, posts and
+comments, then times every prefix of a few queries the way the search
+boxes send them while the user types:
+
+    python -m benchmarks.search_benchmark --items 300000 --runs 5
+
+A query slower than --max-ms at the 95th percentile fails the run. Results
+go to benchmarks/results/search.json and are compared with
+benchmarks/baselines/search.json when it exists.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from .bench_utils import add_common_arguments, finish, summarize
+from app.logic.normalize import Comment, Post, Video
+from app.logic.search_index import SearchIndex
+
+WORDS = ("python release notes rust golang async await benchmark memory cache index search query widget "
+         "thread worker reddit youtube channel video post comment score upvote stream live music game "
+         "science history space rocket climate energy solar battery phone laptop camera review").split()
+
+QUERIES = ("python rel", "rocket sci", "battery review", "zzz")
+
+BATCH = 5000
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)) + f" {rng.randrange(10 ** 6):x}"
+
+
+def fill(index, items, rng):
+    """A tenth videos, a fifth posts and the rest comments, spread over the posts"""
+    videos, posts = max(1, items // 10), max(1, items // 5)
+    comments = items - videos - posts
+    for start in range(0, videos, BATCH):
+        index.add_videos([Video(id=f"v{i}", title=sentence(rng, 6), description=sentence(rng, 30))
+                          for i in range(start, min(videos, start + BATCH))], 'channel')
+    for start in range(0, posts, BATCH):
+        index.add_posts([Post(id=f"p{i}", title=sentence(rng, 8), selftext=sentence(rng, 40), subreddit='popular',
+                              score=i, num_comments=0, created_utc=0, is_self=True)
+                         for i in range(start, min(posts, start + BATCH))])
+    for i in range(posts):
+        count = comments // posts + (i < comments % posts)
+        index.add_comments(f"p{i}", [Comment(id=f"p{i}c{j}", body=sentence(rng, 25)) for j in range(count)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=300000, help="Videos, posts and comments in the index")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=50.0, help="Allowed p95 per query (default 50 ms)")
+    parser.add_argument('--no-fts', action='store_true', help="Measure the LIKE fallback instead")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    index = SearchIndex(os.path.join(folder, 'index.sqlite3'), fill_from_caches=False)
+    if args.no_fts:
+        index.fts = False
+    start = time.perf_counter()
+    fill(index, args.items, random.Random(0))
+    build_seconds = time.perf_counter() - start
+    print(f"Indexed {index.count()} items in {build_seconds:.1f} s ({'FTS5' if index.fts else 'LIKE'})")
+
+    samples = {'videos': [], 'posts': []}
+    for _ in range(args.runs):
+        for query in QUERIES:
+            # Every keystroke after the first two characters sends a query
+            for end in range(2, len(query) + 1):
+                for name, search in (('videos', index.search_videos), ('posts', index.search_posts)):
+                    start = time.perf_counter()
+                    search(query[:end])
+                    samples[name].append((time.perf_counter() - start) * 1000)
+
+    results = {f"search_{name}_ms": summarize(values) for name, values in samples.items()}
+    results['index_items_per_s'] = args.items / build_seconds
+    for name in samples:
+        stats = results[f"search_{name}_ms"]
+        print(f"search_{name}: median {stats['median']:.2f} ms, p95 {stats['p95']:.2f} ms, max {stats['max']:.2f} ms")
+
+    code = finish('search', results, args)
+    slow = [name for name in samples if results[f"search_{name}_ms"]['p95'] > args.max_ms]
+    if slow:
+        print(f"TOO SLOW: {', '.join(slow)} searches over {args.max_ms:.0f} ms at p95")
+        code = 1
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Cold start benchmark: import time, window construction and first paint.
+
+Each run happens in a fresh interpreter so imports are really cold:
+
+    python -m benchmarks.startup_benchmark --runs 5
+
+Results go to benchmarks/results/startup.json and are compared with
+benchmarks/baselines/startup.json when it exists. The run also fails if a
+heavy network library gets imported before the first paint.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from .bench_utils import REPO_ROOT, add_common_arguments, finish, summarize
+
+# Libraries that must not be loaded until a network fetch is needed
+LAZY_MODULES = ['praw', 'requests', 'dotenv', 'aiohttp']
+
+
+def measure_once():
+    """Runs inside the child process and prints one JSON sample"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+
+    from PyQt6.QtWidgets import QApplication
+    qt_imported = time.perf_counter()
+
+    from app.ui.gui import MainWindow
+    from app.ui.theme import apply_theme
+    gui_imported = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    apply_theme(app)
+    window = MainWindow()
+    window.show()
+    window_built = time.perf_counter()
+
+    deadline = time.perf_counter() + 10
+    while not window.first_paint_done and time.perf_counter() < deadline:
+        app.processEvents()
+    painted = time.perf_counter()
+
+    print(json.dumps({
+        'import_qt_ms': (qt_imported - start) * 1000,
+        'import_gui_ms': (gui_imported - qt_imported) * 1000,
+        'build_window_ms': (window_built - gui_imported) * 1000,
+        'time_to_content_ms': window.time_to_content_ms,
+        'first_paint_ms': (painted - start) * 1000,
+        'eager_modules': [name for name in LAZY_MODULES if name in sys.modules]
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once()
+        return 0
+
+    samples = []
+    eager_modules = set()
+    for i in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.startup_benchmark', '--child'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        eager_modules.update(sample.pop('eager_modules'))
+        samples.append(sample)
+        print(f"Run {i + 1}/{args.runs}: first paint in {sample['first_paint_ms']:.0f} ms")
+
+    results = {metric: summarize([s[metric] for s in samples]) for metric in samples[0]}
+    code = finish('startup', results, args)
+
+    if eager_modules:
+        print(f"REGRESSION: imported before first paint: {', '.join(sorted(eager_modules))}")
+        code = 1
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
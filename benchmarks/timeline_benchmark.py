@@ -0,0 +1,85 @@
+"""Timeline benchmark: opening and scrolling a merged timeline over many sources.
+
+Builds channels and subreddits with a cached first page each and further
+pages behind a fetcher that only counts its calls, then times the first
+step of the timeline (what opening the tab waits for) and each following
+scroll step. The pages fetched show how little of the sources is pulled:
+
+    python -m benchmarks.timeline_benchmark --sources 500 --steps 20
+
+Results go to benchmarks/results/timeline.json and are compared with
+benchmarks/baselines/timeline.json when it exists.
+"""
+import argparse
+import random
+import sys
+import time
+
+from .bench_utils import add_common_arguments, finish, summarize
+from app.logic.normalize import Post, Video
+from app.logic.timeline import TIMELINE_STEP, PagedSource, Timeline, post_fullname
+
+NOW = 1.75e9
+
+
+def make_source(index, rng, cached, pages, page_size):
+    """A channel (even index) or subreddit with `pages` pages, the first of them cached"""
+    is_channel = index % 2 == 0
+    gap = rng.uniform(600, 86400)
+    start = NOW - rng.uniform(0, 86400)
+    items = []
+    for i in range(pages * page_size):
+        created = start - i * gap
+        if is_channel:
+            items.append(Video(id=f"s{index}v{i}", title=f"Video {i}", published_utc=created))
+        else:
+            items.append(Post(id=f"s{index}p{i}", title=f"Post {i}", subreddit=f"sub{index}", created_utc=created))
+
+    def fetch_page(token):
+        if isinstance(token, str):
+            token = next(i + 1 for i, item in enumerate(items) if post_fullname(item) == token)
+        start = token or 0
+        end = start + page_size
+        return items[start:end], end if end < len(items) else None
+
+    return PagedSource(f"source {index}", items[:cached], fetch_page, None if is_channel else post_fullname)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sources', type=int, default=500)
+    parser.add_argument('--steps', type=int, default=20, help="Scroll steps after opening")
+    parser.add_argument('--pages', type=int, default=10, help="Pages each source has")
+    parser.add_argument('--runs', type=int, default=5)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    open_ms, step_ms, pages_fetched = [], [], []
+    for run in range(args.runs):
+        rng = random.Random(run)
+        sources = [make_source(i, rng, 20, args.pages, 50) for i in range(args.sources)]
+        timeline = Timeline(lambda: sources)
+
+        start = time.perf_counter()
+        timeline.next_items(TIMELINE_STEP)
+        open_ms.append((time.perf_counter() - start) * 1000)
+        for _ in range(args.steps):
+            start = time.perf_counter()
+            timeline.next_items(TIMELINE_STEP)
+            step_ms.append((time.perf_counter() - start) * 1000)
+        pages_fetched.append(timeline.pages_fetched())
+
+    results = {
+        'open_ms': summarize(open_ms),
+        'step_ms': summarize(step_ms),
+        'pages_fetched': summarize(pages_fetched),
+    }
+    print(f"{args.sources} sources: opened in {results['open_ms']['median']:.1f} ms, "
+          f"{results['step_ms']['median']:.2f} ms per step of {TIMELINE_STEP}, "
+          f"{results['pages_fetched']['median']:.0f} of {args.sources * args.pages} pages fetched "
+          f"after {args.steps} steps")
+    return finish('timeline', results, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,52 +1,17 @@
 import sys
 from PyQt6.QtWidgets import QApplication
+from app.logic.metrics import write_on_exit
 from app.ui.gui import MainWindow
+from app.ui.shared.stall_monitor import start_from_environment
+from app.ui.theme import apply_theme
 
 def main():
     app = QApplication(sys.argv)
+    write_on_exit()
+    start_from_environment()
     
     # Set enhanced dark theme
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #1e1e1e;
-            color: #ffffff;
-        }
-        QWidget {
-            background-color: #1e1e1e;
-            color: #ffffff;
-            font-family: 'Segoe UI', Arial, sans-serif;
-        }
-        QLabel {
-            color: #ffffff;
-        }
-        QMessageBox {
-            background-color: #2b2b2b;
-            color: #ffffff;
-            border: 1px solid #555555;
-            border-radius: 8px;
-        }
-        QMessageBox QPushButton {
-            min-width: 80px;
-            background-color: #0078d4;
-            color: #ffffff;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-weight: bold;
-        }
-        QMessageBox QPushButton:hover {
-            background-color: #106ebe;
-        }
-        /* Text selection styling */
-        QLabel:selection {
-            background-color: #0078d4;
-            color: #ffffff;
-        }
-        QTextEdit:selection {
-            background-color: #0078d4;
-            color: #ffffff;
-        }
-    """)
+    apply_theme(app)
     
     window = MainWindow()
     window.show()
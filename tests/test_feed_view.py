@@ -0,0 +1,65 @@
+from app.logic.feed_view import (AS_LOADED, POST_FILTERS, POST_SORTS, VIDEO_FILTERS, VIDEO_SORTS, FeedView,
+                                 item_time, published_key)
+from app.logic.normalize import Post, Video, iso_timestamp
+
+
+def post(post_id, score, num_comments, subreddit='python', nsfw=False, is_self=True):
+    return Post(id=post_id, title=post_id, subreddit=subreddit, score=score, num_comments=num_comments,
+                created_utc=score * 10, upvote_ratio=0.9, nsfw=nsfw, is_self=is_self,
+                domain=f"self.{subreddit}" if is_self else 'example.com')
+
+
+def test_sorts_keep_feed_order_for_ties_and_are_computed_once():
+    view = FeedView(POST_SORTS, POST_FILTERS)
+    view.set_items([post('a', 5, 1), post('b', 9, 1), post('c', 5, 7)])
+
+    assert view.visible_ids() == ['a', 'b', 'c']
+    assert view.visible_ids('score') == ['b', 'a', 'c']
+    assert view.visible_ids('comments') == ['c', 'a', 'b']
+    assert view.order('score') is view.order('score')
+
+    view.set_items([post('d', 1, 1)])
+    assert view.visible_ids('score') == ['d']
+
+
+def test_filters_combine_and_list_the_values_present():
+    view = FeedView(POST_SORTS, POST_FILTERS)
+    view.set_items([post('a', 1, 0, 'python'), post('b', 2, 0, 'rust', nsfw=True),
+                    post('c', 3, 0, 'Python', is_self=False), post('d', 4, 0, 'python')])
+
+    assert view.values('subreddit') == ['python', 'Python', 'rust']
+    assert view.visible_ids('score', {'subreddit': 'python'}) == ['d', 'a']
+    assert view.visible_ids(AS_LOADED, {'nsfw': False, 'post_type': 'link'}) == ['c']
+    assert view.visible_ids(AS_LOADED, {'nsfw': None, 'domain': 'nowhere'}) == []
+
+
+def test_videos_sort_by_views_and_display_date():
+    assert published_key('Jan 02, 2025') == (2025, 1, 2)
+    assert published_key('2025-01-02T00:00:00Z') == published_key(None) == (0, 0, 0)
+
+    view = FeedView(VIDEO_SORTS, VIDEO_FILTERS)
+    view.set_items([Video(id='new', published_at='Feb 01, 2025', view_count=10, title='b'),
+                    Video(id='old', published_at='Dec 31, 2024', view_count=500, title='A'),
+                    Video(id='odd', published_at='Mar 01, 2024', title='c')])
+    assert view.visible_ids('views') == ['old', 'new', 'odd']
+    assert view.visible_ids('oldest') == ['odd', 'old', 'new']
+    assert view.visible_ids('title') == ['old', 'new', 'odd']
+
+
+def test_item_time_of_videos_posts_and_old_cached_videos():
+    assert item_time(Video(id='v', published_utc=100.0)) == 100.0
+    assert item_time(Post(id='p', created_utc=50)) == 50
+    assert item_time(Video(id='v', published_at='Jan 02, 1970')) == 86400
+    assert item_time(Video(id='v')) == 0
+    assert iso_timestamp('1970-01-01T00:01:00Z') == 60.0
+
+
+def test_oldest_first_orders_uploads_within_a_day():
+    view = FeedView(VIDEO_SORTS, VIDEO_FILTERS)
+    # Newest first, as the uploads playlist lists them
+    view.set_items([
+        Video(id='evening', published_at='Jan 02, 2025', published_utc=iso_timestamp('2025-01-02T20:00:00Z')),
+        Video(id='morning', published_at='Jan 02, 2025', published_utc=iso_timestamp('2025-01-02T08:00:00Z')),
+        Video(id='cached', published_at='Jan 01, 2025'),
+    ])
+    assert view.visible_ids('oldest') == ['cached', 'morning', 'evening']
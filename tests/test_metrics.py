@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from app.logic.fetch_engine import FetchEngine
+from app.logic.metrics import METRICS, Metrics
+
+
+def test_spans_requests_and_cache_lookups():
+    metrics = Metrics()
+    with metrics.span('stage'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.span('stage'):
+            raise ValueError()
+    metrics.count_request('example.com', 100)
+    metrics.count_request('example.com', 50)
+    metrics.count_cache('feed', 'hit')
+    metrics.count_cache('feed', 'miss')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['spans']['stage']['count'] == 2
+    assert snapshot['spans']['stage']['errors'] == 1
+    assert snapshot['hosts']['example.com'] == {'requests': 2, 'bytes': 150}
+    assert snapshot['caches']['feed']['hit_ratio'] == 0.5
+
+    text = metrics.to_prometheus()
+    assert 'app_span_seconds_count{span="stage"} 2' in text
+    assert 'app_http_response_bytes_total{host="example.com"} 150' in text
+    assert 'app_cache_lookups_total{cache="feed",result="miss"} 1' in text
+
+
+def test_write_picks_format_by_extension(tmp_path):
+    metrics = Metrics()
+    metrics.count_request('example.com', 1)
+    metrics.write(str(tmp_path / 'metrics.json'))
+    metrics.write(str(tmp_path / 'metrics.prom'))
+    assert json.loads((tmp_path / 'metrics.json').read_text())['hosts']['example.com']['requests'] == 1
+    assert (tmp_path / 'metrics.prom').read_text().startswith('# HELP')
+
+
+class ListingTransport:
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def request(self, url, params=None):
+        children = [{'kind': 't3', 'data': {
+            'id': f"p{i}", 'title': 't', 'subreddit': 'popular', 'score': 1, 'num_comments': 0,
+            'created_utc': 0, 'url': 'u', 'permalink': 'p', 'is_self': True
+        }} for i in range(3)]
+        return 200, 'OK', {}, json.dumps({'data': {'children': children, 'after': None}}).encode('utf-8')
+
+
+def test_engine_records_listing_pages_and_traffic():
+    METRICS.reset()
+    engine = FetchEngine(transport=ListingTransport(), reddit_api='http://reddit.test')
+    posts = asyncio.run(engine.reddit_listing('popular', limit=3))
+
+    snapshot = METRICS.snapshot()
+    assert len(posts) == 3
+    assert snapshot['spans']['reddit.listing_page']['count'] == 1
+    assert snapshot['hosts']['reddit.test']['requests'] == 1
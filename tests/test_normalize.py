@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+from app.logic import normalize
+
+
+def test_format_timestamp_matches_strftime():
+    for timestamp in (0, 59.9, 1757494610.0, 1757494679.5, 2000000000):
+        expected = datetime.fromtimestamp(timestamp).strftime('%b %d, %Y at %H:%M')
+        assert normalize.format_timestamp(timestamp) == expected
+    assert normalize.format_timestamp(None) == "Unknown date"
+
+
+def test_format_date_fast_path_and_fallback():
+    assert normalize.format_date('2025-09-10T11:56:00Z') == 'Sep 10, 2025'
+    assert normalize.format_date('2024-02-03') == 'Feb 03, 2024'
+    assert normalize.format_date('2024-02-30T00:00:00Z') == '2024-02-30T00:00:00Z'
+    assert normalize.format_date('not a date') == 'not a date'
+
+
+def test_bulk_normalizers_match_single_items():
+    item = {
+        'snippet': {'title': 'Video', 'description': 'd' * 300, 'publishedAt': '2025-01-02T03:04:05Z',
+                    'thumbnails': {'high': {'url': 'https://i.ytimg.com/x.jpg'}}, 'channelTitle': 'Channel'},
+        'contentDetails': {'videoId': 'abc'}
+    }
+    [video] = normalize.videos_from_playlist_page([item])
+    assert video == normalize.video_from_playlist_item(item)
+    assert video['description'] == 'd' * 200 + '...'
+    assert video['published_at'] == 'Jan 02, 2025'
+
+    post = {'id': 'p', 'title': 't', 'subreddit': 's', 'score': 12345, 'num_comments': 7,
+            'created_utc': datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp(), 'url': 'u',
+            'permalink': '/r/s/p', 'is_self': True, 'thumbnail': 'self'}
+    [processed] = normalize.posts_from_listing([{'kind': 't3', 'data': post}])
+    assert processed == normalize.post_from_json(post)
+    assert processed['score_formatted'] == '12.3K'
+    assert 'thumbnail' not in processed
+
+
+def test_records_read_like_dicts_and_round_trip_the_cache_format():
+    post = normalize.post_from_json({
+        'id': 'p', 'title': 't', 'subreddit': 's', 'score': 1500, 'num_comments': 2, 'created_utc': 0,
+        'url': 'u', 'permalink': '/r/s/p', 'is_self': False, 'thumbnail': 'https://i.redd.it/x.jpg'
+    })
+    assert not hasattr(post, '__dict__')
+    assert post['score_formatted'] == '1.5K' and post['post_type'] == 'link'
+    assert post.get('created_formatted') == normalize.format_timestamp(0)
+
+    # Display strings follow the stored fields
+    post['score'] = 12
+    assert post['score_formatted'] == '12'
+
+    cached = post.to_cache()
+    assert cached['thumbnail'] == 'https://i.redd.it/x.jpg' and cached['score_formatted'] == '12'
+    assert normalize.Post.from_cache(cached) == post
+    assert normalize.Post.from_cache(post) is post
+
+    details = normalize.post_details_from_json(dict(cached, selftext='full text'))
+    assert 'permalink' not in details and 'thumbnail' not in details
+    assert details.get('thumbnail') is None
+
+
+def test_comment_replies_convert_with_their_comment():
+    [comment] = normalize.comment_tree_from_json([{'kind': 't1', 'data': {
+        'id': 'c', 'author': 'op', 'body': 'b', 'score': 3, 'created_utc': 60,
+        'replies': {'data': {'children': [{'kind': 't1', 'data': {'id': 'r', 'author': 'x', 'body': 'r'}}]}}
+    }}], submitter='op')
+    assert comment['is_submitter'] and isinstance(comment['replies'][0], normalize.Comment)
+
+    cached = comment.to_cache()
+    assert cached['replies'][0] == {'id': 'r', 'author': 'x', 'body': 'r', 'score': 0, 'created_utc': 0,
+                                    'is_submitter': False, 'gilded': 0,
+                                    'created_formatted': normalize.format_timestamp(0)}
+    restored = normalize.Comment.from_cache(cached)
+    assert restored == comment and 'replies' not in restored['replies'][0]
+
+
+def test_format_duration():
+    assert normalize.format_duration('PT1H2M3S') == '1:02:03'
+    assert normalize.format_duration('PT4M5S') == '4:05'
+    assert normalize.format_duration('PT45S') == '0:45'
+    assert normalize.format_duration('P1DT2H') == '26:00:00'
+    assert normalize.format_duration('') == ''
+    assert normalize.format_duration('soon') == ''
+
+
+def test_video_details_leave_hidden_counts_missing():
+    details = normalize.video_details_from_json({
+        'id': 'abc',
+        'snippet': {'title': 'Video', 'description': 'd' * 300, 'publishedAt': '2025-01-02T03:04:05Z',
+                    'channelTitle': 'Channel', 'tags': ['python']},
+        'contentDetails': {'duration': 'PT1H2M3S'},
+        'statistics': {'viewCount': '1200', 'commentCount': '7'}
+    })
+    assert details['description'] == 'd' * 300
+    assert details['duration_formatted'] == '1:02:03'
+    assert details['view_count'] == 1200 and details['comment_count'] == 7
+    assert 'like_count' not in details and details.get('like_count') is None
+    assert normalize.VideoDetails.from_cache(details.to_cache()) == details
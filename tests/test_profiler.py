@@ -0,0 +1,35 @@
+import threading
+import time
+
+from app.logic.profiler import OPERATIONS, SamplingProfiler
+
+
+def spin_in_operation(stop):
+    with OPERATIONS.tag("YouTube load channel test"):
+        while not stop.is_set():
+            sum(range(1000))
+
+
+def test_samples_are_folded_under_their_operation(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=spin_in_operation, args=(stop,), name="worker")
+    worker.start()
+    profiler = SamplingProfiler(interval=0.002).start()
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    path = tmp_path / 'profile.folded'
+    profiler.write(str(path))
+    lines = path.read_text().splitlines()
+    assert profiler.samples > 0
+    tagged = [line for line in lines if line.startswith("YouTube load channel test;worker;")]
+    assert tagged and all('spin_in_operation' in line for line in tagged)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+
+def test_concurrent_tags_on_one_thread():
+    with OPERATIONS.tag("a"), OPERATIONS.tag("b"):
+        assert OPERATIONS.describe(threading.get_ident()) == "a + b"
+    assert OPERATIONS.describe(threading.get_ident()) is None
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+from app.logic.cache_store import update_post_counts
+from app.logic.fetch_engine import FetchEngine
+from app.logic.normalize import Post
+
+
+class InfoTransport:
+    """Answers /api/info with a score of 10 per post, leaving out 'p7' as if deleted"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def request(self, url, params=None):
+        names = params['id'].split(',')
+        self.calls.append(len(names))
+        children = [{'kind': 't3', 'data': {'id': name[3:], 'title': 't', 'score': 10, 'num_comments': 2,
+                                            'upvote_ratio': 0.5}}
+                    for name in names if name != 't3_p7']
+        return 200, 'OK', {}, json.dumps({'data': {'children': children}}).encode('utf-8')
+
+
+def test_counts_are_fetched_in_batches_of_100():
+    transport = InfoTransport()
+    engine = FetchEngine(transport=transport, reddit_api='http://reddit.test')
+    counts = asyncio.run(engine.reddit_counts([f"p{i}" for i in range(250)]))
+
+    assert transport.calls == [100, 100, 50]
+    assert len(counts) == 249 and 'p7' not in counts
+    assert counts['p0'] == {'score': 10, 'num_comments': 2, 'upvote_ratio': 0.5}
+
+
+def test_only_changed_counts_are_written_to_the_cache():
+    posts = [Post(id=f"p{i}", title=f"Post {i}", subreddit='python', score=10, num_comments=2, upvote_ratio=0.5,
+                  created_utc=0).to_cache() for i in range(3)]
+    cache = {'python': {'last_fetch': posts, 'timestamp': 100}}
+    counts = {'p0': {'score': 10, 'num_comments': 2, 'upvote_ratio': 0.5},
+              'p1': {'score': 1500, 'num_comments': 3, 'upvote_ratio': 0.9}}
+
+    changed = update_post_counts(cache, 'python', counts)
+
+    assert list(changed) == ['p1'] and changed['p1']['score_formatted'] == '1.5K'
+    assert posts[1]['score'] == 1500 and posts[1]['score_formatted'] == '1.5K' and posts[1]['title'] == 'Post 1'
+    assert posts[2]['score'] == 10
+    assert cache['python']['timestamp'] == 100
+    assert update_post_counts(cache, 'rust', counts) == {}
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+
+from app.logic.normalize import Post
+from app.logic.reddit_handler import counts_key
+from app.ui import gui
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class Subscription:
+    def is_active(self):
+        return False
+
+    def close_if_finished(self):
+        return True
+
+
+@pytest.fixture
+def reddit_tab(qt_app, monkeypatch):
+    subscribed = []
+
+    def subscribe(key, factory, **slots):
+        subscribed.append(key)
+        return Subscription()
+
+    monkeypatch.setattr(gui.IN_FLIGHT, 'subscribe', subscribe)
+    tab = gui.RedditTab()
+    tab.counts_timer.stop()
+    tab.add_post_frames([Post(id='p0', title='Post', subreddit='python', score=1, num_comments=0)])
+    yield tab, subscribed
+    tab.deleteLater()
+
+
+def test_counts_refresh_only_runs_while_the_tab_is_shown(qt_app, reddit_tab):
+    tab, subscribed = reddit_tab
+    tab.refresh_counts()
+    assert subscribed == []
+
+    tab.show()
+    qt_app.processEvents()
+    tab.refresh_counts()
+    assert subscribed == [counts_key()]
+
+    tab.hide()
+    tab.refresh_counts()
+    assert subscribed == [counts_key()]
+
+
+def test_failed_counts_refreshes_are_reported_once_per_streak(reddit_tab):
+    tab, _ = reddit_tab
+    tab.on_counts_error("offline")
+    assert tab.status_label.text() == "❌ offline"
+
+    tab.status_label.setText("Loaded")
+    tab.on_counts_error("still offline")
+    assert tab.status_label.text() == "Loaded"
+
+    tab.on_counts_refreshed({})
+    tab.on_counts_error("offline again")
+    assert tab.status_label.text() == "❌ offline again"
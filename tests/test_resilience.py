@@ -0,0 +1,60 @@
+import pytest
+
+from app.logic.resilience import CircuitBreaker
+from app.logic.scheduler import job_context
+
+
+class Cancelled(Exception):
+    pass
+
+
+class FakeJob:
+    priority = 0
+
+    def __init__(self):
+        self.cancelled = False
+
+    def is_cancelled(self):
+        return self.cancelled
+
+
+def open_breaker():
+    breaker = CircuitBreaker('test', failure_threshold=1, cooldown=0)
+    breaker.record_failure(0.1, ValueError("broken"))
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_cancelled_trial_call_does_not_leave_breaker_half_open():
+    breaker = open_breaker()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    job = FakeJob()
+
+    def superseded():
+        job.cancelled = True
+        raise Cancelled()
+
+    with job_context(job), pytest.raises(Cancelled):
+        breaker.call(superseded)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.failures == 1
+    assert breaker.allow()
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_call_reopens_breaker():
+    breaker = open_breaker()
+    assert breaker.allow()
+
+    def still_broken():
+        raise ValueError("still broken")
+
+    with pytest.raises(ValueError):
+        breaker.call(still_broken)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.failures == 2
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from app.logic.scheduler import BACKGROUND, USER, RequestScheduler, TokenBucket, job_context
+
+
+def test_token_bucket_refills_and_trusts_server_limits():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    bucket.updated = 100.0
+    assert bucket.delay(100.0) == 0
+    bucket.take()
+    bucket.take()
+    assert bucket.delay(100.0) == 0.5
+    assert bucket.delay(100.5) == 0
+    assert bucket.tokens == 1
+
+    # Reddit says the quota is used up for the next 30 seconds
+    bucket.apply_server_limits(remaining=0, reset=30, now=100.5)
+    assert bucket.delay(101.0) == 29.5
+    assert bucket.delay(131.0) == 0
+
+
+def test_waiting_user_requests_go_before_background_ones():
+    scheduler = RequestScheduler(limits={'api.test': (20.0, 1)})
+    scheduler.acquire('api.test')
+    order = []
+
+    def request(name, priority):
+        scheduler.acquire('api.test', priority)
+        order.append(name)
+
+    def start(name, priority, waiting):
+        thread = threading.Thread(target=request, args=(name, priority))
+        thread.start()
+        # Queued before the next one is started
+        while len(scheduler.queues['api.test']) < waiting:
+            time.sleep(0.001)
+        return thread
+
+    threads = [start('prefetch', BACKGROUND, 1), start('refresh', BACKGROUND, 2), start('click', USER, 3)]
+    for thread in threads:
+        thread.join(5)
+    assert order == ['click', 'prefetch', 'refresh']
+
+
+def test_priority_upgrades_apply_while_waiting():
+    # Waiters look for upgrades every poll, so the next token must take longer than that
+    scheduler = RequestScheduler(limits={'api.test': (4.0, 1)})
+    scheduler.POLL_INTERVAL = 0.05
+    scheduler.acquire('api.test')
+    order = []
+
+    class Job:
+        priority = BACKGROUND
+
+        def raise_if_cancelled(self):
+            pass
+
+    job = Job()
+
+    def background_request():
+        scheduler.acquire('api.test', BACKGROUND)
+        order.append('background')
+
+    def job_request():
+        with job_context(job):
+            scheduler.acquire('api.test')
+        order.append('upgraded')
+
+    threads = []
+    for target in (background_request, job_request):
+        threads.append(threading.Thread(target=target))
+        threads[-1].start()
+        while len(scheduler.queues['api.test']) < len(threads):
+            time.sleep(0.001)
+    # The user is now waiting on the job's load, as when RedditTab.load_posts is clicked
+    job.priority = USER
+    for thread in threads:
+        thread.join(5)
+    assert order == ['upgraded', 'background']
@@ -0,0 +1,51 @@
+import pytest
+
+from app.logic.normalize import Comment, Post, Video
+from app.logic.search_index import SearchIndex, fts_query, query_terms
+
+
+def post(post_id, title, selftext=''):
+    return Post(id=post_id, title=title, subreddit='python', selftext=selftext, score=10, num_comments=1,
+                created_utc=0, is_self=True)
+
+
+@pytest.fixture(params=[None, False], ids=['fts5', 'like'])
+def index(request, tmp_path):
+    index = SearchIndex(str(tmp_path / 'index.sqlite3'), fill_from_caches=False)
+    index.fts = request.param
+    yield index
+    index.close()
+
+
+def test_query_terms_skip_a_letter_still_being_typed():
+    assert query_terms("Python r") == ['python']
+    assert query_terms("python r ") == ['python', 'r']
+    assert fts_query(['python', 'r']) == '"python"* "r"'
+    assert query_terms(' "; ') == []
+
+
+def test_prefix_search_over_videos_and_posts(index):
+    index.add_videos([Video(id='v1', title='Python release notes', description='What changed'),
+                      Video(id='v2', title='Cooking', description='Snake recipes')], 'channel')
+    index.add_posts([post('p1', 'Rust or Go?'), post('p2', 'Python packaging tips', 'pip and wheels')])
+
+    assert [video['id'] for video in index.search_videos('pyth rel')] == ['v1']
+    assert [item['id'] for item in index.search_posts('whe')] == ['p2']
+    assert index.search_posts('python') == [post('p2', 'Python packaging tips', 'pip and wheels')]
+    assert index.search_videos('x') == [] and index.search_posts('nothing here') == []
+
+
+def test_comments_find_their_post_and_updates_replace_old_text(index):
+    index.add_posts([post('p1', 'Rust or Go?'), post('p2', 'Weekly thread')])
+    index.add_comments('p1', [Comment(id='c1', body='Go has goroutines',
+                                      replies=[Comment(id='r1', body='So does Kotlin, sort of')])])
+    index.add_comments('p2', [Comment(id='c2', body='Kotlin coroutines')])
+
+    # Newest first, one result per post however many of its comments match
+    assert [item['id'] for item in index.search_posts('kotlin')] == ['p2', 'p1']
+    assert [item['id'] for item in index.search_posts('gorout')] == ['p1']
+
+    index.add_posts([post('p2', 'Weekly thread', 'rules'), post('p1', 'Zig')])
+    assert index.search_posts('rust') == []
+    assert index.search_posts('zig')[0]['title'] == 'Zig'
+    assert index.count() == 5
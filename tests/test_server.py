@@ -0,0 +1,82 @@
+import gzip
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from app import server
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """The feed API on a free port over a comments cache and thumbnail folder in tmp_path"""
+    comments_file = tmp_path / 'comments.json'
+    thread = {'post': {'id': 'p1', 'title': 'Post'}, 'comments': [{'id': f"c{i}", 'body': "Comment " * 20}
+                                                                  for i in range(20)]}
+    comments_file.write_text(json.dumps({'p1': thread}))
+    (tmp_path / 'abc.jpg').write_bytes(b'jpeg')
+    monkeypatch.setattr(server, 'COMMENTS_CACHE_FILE', str(comments_file))
+    monkeypatch.setattr(server, 'YOUTUBE_FOLDER', str(tmp_path))
+
+    handler = type('TestHandler', (server.FeedRequestHandler,), {'store': server.FeedStore(),
+                                                                  'log_message': lambda *args: None})
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def request(path, method='GET', **headers):
+        connection = http.client.HTTPConnection('127.0.0.1', httpd.server_port, timeout=5)
+        connection.request(method, path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    yield request, thread, comments_file
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_etag_answers_304_and_gzip_has_its_own_etag(api):
+    request, thread, _ = api
+    response, body = request('/api/comments/p1')
+    assert response.status == 200 and json.loads(body) == thread
+    etag = response.getheader('ETag')
+
+    response, body = request('/api/comments/p1', **{'If-None-Match': etag})
+    assert response.status == 304 and body == b''
+
+    response, body = request('/api/comments/p1', **{'Accept-Encoding': 'gzip, deflate'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert response.getheader('Vary') == 'Accept-Encoding'
+    assert json.loads(gzip.decompress(body)) == thread
+    gzip_etag = response.getheader('ETag')
+    assert gzip_etag != etag
+
+    response, _ = request('/api/comments/p1', **{'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    assert response.status == 304
+
+
+def test_changed_cache_file_gets_a_new_etag(api):
+    request, thread, comments_file = api
+    etag = request('/api/comments/p1')[0].getheader('ETag')
+    thread['post']['title'] = 'Edited'
+    comments_file.write_text(json.dumps({'p1': thread}, indent=1))
+
+    response, body = request('/api/comments/p1', **{'If-None-Match': etag})
+    assert response.status == 200 and json.loads(body)['post']['title'] == 'Edited'
+
+
+def test_thumbnails_head_and_errors(api):
+    request, _, _ = api
+    response, body = request('/thumbnails/abc.jpg')
+    assert response.status == 200 and body == b'jpeg'
+    response, body = request('/thumbnails/abc.jpg', 'HEAD')
+    assert response.status == 200 and body == b'' and response.getheader('Content-Length') == '4'
+    response, _ = request('/thumbnails/abc.jpg', **{'If-None-Match': response.getheader('ETag')})
+    assert response.status == 304
+
+    assert request('/thumbnails/..%2Fcomments.jpg')[0].status == 404
+    assert request('/api/comments/missing')[0].status == 404
+    assert request('/api/comments/p1', 'POST')[0].status == 405
@@ -0,0 +1,42 @@
+import time
+
+from app.logic.stall_watchdog import STALL_BUCKETS_MS, StallWatchdog
+
+
+def busy_handler(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_stall_is_recorded_with_stack_and_action(tmp_path):
+    log = tmp_path / 'stalls.jsonl'
+    watchdog = StallWatchdog(threshold=0.05, log_path=str(log))
+    watchdog.start()
+    try:
+        watchdog.set_action("click 'Load'")
+        watchdog.beat()
+        busy_handler(0.2)
+        watchdog.beat()
+    finally:
+        watchdog.stop()
+
+    counts = watchdog.histogram["click 'Load'"]
+    assert sum(counts) == 1
+    assert counts[STALL_BUCKETS_MS.index(250)] == 1
+    [entry] = watchdog.recent
+    assert any('busy_handler' in line for line in entry['stack'])
+    assert 'busy_handler' in log.read_text()
+    assert "click 'Load'" in watchdog.report()
+
+
+def test_no_stall_while_beating():
+    watchdog = StallWatchdog(threshold=0.1)
+    watchdog.start()
+    try:
+        for _ in range(10):
+            watchdog.beat()
+            time.sleep(0.01)
+    finally:
+        watchdog.stop()
+    assert watchdog.histogram == {}
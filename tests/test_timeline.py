@@ -0,0 +1,86 @@
+import pytest
+
+from app.logic.normalize import Post, Video
+from app.logic.scheduler import job_context
+from app.logic.timeline import PagedSource, Timeline, post_fullname
+
+
+def video(video_id, published):
+    return Video(id=video_id, title=video_id, published_utc=published)
+
+
+def post(post_id, created):
+    return Post(id=post_id, title=post_id, subreddit='python', created_utc=created)
+
+
+def pages(listing, page_size, calls):
+    """fetch_page over `listing` with numeric tokens, or a post's fullname as `after`"""
+    def fetch_page(token):
+        calls.append(token)
+        if isinstance(token, str):
+            names = [post_fullname(item) for item in listing]
+            token = names.index(token) + 1 if token in names else len(listing)
+        start = token or 0
+        end = start + page_size
+        return listing[start:end], end if end < len(listing) else None
+    return fetch_page
+
+
+def test_merge_only_fetches_pages_it_reaches():
+    video_calls, post_calls = [], []
+    videos = [video(f"v{i}", 1000 - i * 10) for i in range(20)]
+    posts = [post(f"p{i}", 1005 - i * 10) for i in range(20)]
+    sources = [
+        PagedSource('channel', videos[:3], pages(videos, 5, video_calls)),
+        PagedSource('r/python', posts[:3], pages(posts, 5, post_calls), resume=post_fullname),
+    ]
+    timeline = Timeline(lambda: sources)
+
+    first = timeline.next_items(6)
+    assert [item['id'] for item in first] == ['p0', 'v0', 'p1', 'v1', 'p2', 'v2']
+    # Taking a source's last cached item makes the merge read its next one
+    assert video_calls == [] and post_calls == ['t3_p2']
+
+    more = timeline.next_items(10)
+    assert [item['id'] for item in more] == ['p3', 'v3', 'p4', 'v4', 'p5', 'v5', 'p6', 'v6', 'p7', 'v7']
+    # The channel pages from the top and skips what the cache had; the subreddit resumes after it
+    assert video_calls == [None, 5]
+    assert post_calls == ['t3_p2', 8]
+
+    rest = timeline.next_items(100)
+    assert len(rest) == 24 and timeline.exhausted
+    assert timeline.pages_fetched() == 8
+
+
+def test_lost_resume_point_and_failing_sources():
+    calls = []
+    posts = [post(f"p{i}", 100 - i) for i in range(4)]
+
+    def broken(token):
+        raise ConnectionError("offline")
+
+    sources = [
+        PagedSource('r/python', [post('gone', 99.5)], pages(posts, 10, calls), resume=post_fullname),
+        PagedSource('channel', [video('v0', 99.9)], broken),
+    ]
+    timeline = Timeline(lambda: sources)
+
+    assert [item['id'] for item in timeline.next_items(10)] == ['v0', 'gone', 'p1', 'p2', 'p3']
+    assert calls == ['t3_gone', None]
+    assert timeline.failed_sources() == ['channel']
+
+
+class CancelledJob:
+    def is_cancelled(self):
+        return True
+
+
+def test_cancelled_read_is_not_a_failing_source():
+    def cancelled(token):
+        raise RuntimeError("cancelled")
+
+    timeline = Timeline(lambda: [PagedSource('channel', [video('v0', 10)], cancelled)])
+    with job_context(CancelledJob()):
+        with pytest.raises(RuntimeError):
+            timeline.next_items(5)
+    assert timeline.failed_sources() == []
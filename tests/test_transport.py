@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+from app.logic.fetch_engine import FetchEngine
+from app.logic.transport import Cassette, CassetteMiss, RecordingTransport, ReplayTransport, request_key
+
+
+def listing(*post_ids):
+    children = [{'kind': 't3', 'data': {
+        'id': post_id, 'title': post_id, 'subreddit': 'python', 'score': 1, 'num_comments': 0,
+        'created_utc': 0, 'url': 'u', 'permalink': 'p', 'is_self': True
+    }} for post_id in post_ids]
+    return json.dumps({'data': {'children': children, 'after': None}}).encode('utf-8')
+
+
+def test_request_keys_sort_params_and_leave_out_the_api_key():
+    assert request_key('get', 'https://api.test/videos', {'part': 'snippet', 'id': 'a', 'key': 'secret'}) == \
+        'GET https://api.test/videos?id=a&part=snippet'
+    assert request_key('GET', 'https://api.test/videos') == 'GET https://api.test/videos'
+
+
+def test_cassette_survives_a_reload_and_steps_through_repeats(tmp_path):
+    path = str(tmp_path / 'cassettes' / 'run.json')
+    cassette = Cassette(path)
+    cassette.record('GET a', 200, 'OK', {'Content-Type': 'application/json', 'Set-Cookie': 'x'}, b'first')
+    cassette.record('GET a', 200, 'OK', {}, b'second')
+    cassette.record('GET thumb', 200, 'OK', {}, b'\xff\xd8\xff')
+
+    replayed = Cassette(path)
+    assert replayed.play('GET a') == (200, 'OK', {'Content-Type': 'application/json'}, b'first')
+    assert replayed.play('GET a')[3] == b'second'
+    # Past the recorded repeats the last response keeps being returned
+    assert replayed.play('GET a')[3] == b'second'
+    assert replayed.play('GET thumb')[3] == b'\xff\xd8\xff'
+    with pytest.raises(CassetteMiss):
+        replayed.play('GET b')
+
+
+def test_engine_runs_offline_from_a_cassette(tmp_path):
+    path = str(tmp_path / 'run.json')
+    cassette = Cassette(path)
+    url = 'http://reddit.test/r/python/hot.json'
+    cassette.record(request_key('GET', url, {'limit': 2}), 200, 'OK', {}, listing('p1', 'p2'))
+
+    engine = FetchEngine(transport=ReplayTransport(Cassette(path)), reddit_api='http://reddit.test')
+    posts = asyncio.run(engine.reddit_listing('python', limit=2))
+    assert [post['id'] for post in posts] == ['p1', 'p2']
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(engine.reddit_listing('rust', limit=2))
+
+
+def test_recorded_standin_session_replays_identically(tmp_path):
+    pytest.importorskip('aiohttp')
+    from app.standin import Fixtures, start_standin
+
+    standin = start_standin(Fixtures.synthetic(videos=5, posts=5))
+    path = str(tmp_path / 'run.json')
+
+    async def session(transport):
+        engine = FetchEngine(api_key='key', transport=transport, youtube_api=f"{standin.base_url}/youtube/v3",
+                             reddit_api=standin.base_url)
+        try:
+            posts = await engine.reddit_listing('popular', limit=5)
+            details = await engine.video_details(['v0x0', 'v0x1'])
+            return [post.to_cache() for post in posts], {key: value.to_cache() for key, value in details.items()}
+        finally:
+            await engine.close()
+
+    try:
+        recorded = asyncio.run(session(RecordingTransport(Cassette(path))))
+    finally:
+        standin.shutdown()
+    # The stand-in is gone, so this can only come from the cassette
+    assert asyncio.run(session(ReplayTransport(Cassette(path)))) == recorded
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from app.logic.fetch_engine import BatchedLookup, FetchEngine
+
+
+class VideosTransport:
+    """Answers videos calls with every requested ID except 'gone', recording the IDs of each call"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def request(self, url, params=None):
+        ids = params['id'].split(',')
+        self.calls.append(ids)
+        items = [{
+            'id': video_id,
+            'snippet': {'title': video_id, 'description': 'Full text', 'publishedAt': '2025-01-02T03:04:05Z'},
+            'contentDetails': {'duration': 'PT4M5S'},
+            'statistics': {'viewCount': '100', 'likeCount': '4'}
+        } for video_id in ids if video_id != 'gone']
+        return 200, 'OK', {}, json.dumps({'items': items}).encode('utf-8')
+
+
+def test_concurrent_lookups_share_one_call():
+    transport = VideosTransport()
+    engine = FetchEngine(api_key='key', transport=transport, youtube_api='http://youtube.test')
+
+    async def open_video_and_prefetch():
+        return await asyncio.gather(engine.video_details(['a']), engine.video_details(['a', 'b', 'gone']))
+
+    opened, prefetched = asyncio.run(open_video_and_prefetch())
+    assert transport.calls == [['a', 'b', 'gone']]
+    assert opened['a']['duration_formatted'] == '4:05'
+    assert prefetched['b']['like_count'] == 4 and 'comment_count' not in prefetched['b']
+    assert prefetched['gone'] is None
+
+
+def test_batches_split_at_batch_size_and_errors_reach_every_caller():
+    calls = []
+
+    async def fetch_batch(ids):
+        calls.append(len(ids))
+        if 'bad' in ids:
+            raise ConnectionError("offline")
+        return {item_id: item_id.upper() for item_id in ids}
+
+    async def lookups():
+        lookup = BatchedLookup(fetch_batch, 50, 0.01)
+        results = await lookup.get([f"v{i}" for i in range(120)])
+        assert results['v119'] == 'V119'
+        failing = [lookup.get(['bad', 'x']), lookup.get(['x'])]
+        return await asyncio.gather(*failing, return_exceptions=True)
+
+    errors = asyncio.run(lookups())
+    assert calls == [50, 50, 20, 2]
+    assert all(isinstance(error, ConnectionError) for error in errors)
+
+
+def test_cancelled_batch_does_not_leave_lookups_waiting():
+    calls = []
+
+    async def fetch_batch(ids):
+        calls.append(ids)
+        return {item_id: item_id.upper() for item_id in ids}
+
+    async def lookups():
+        lookup = BatchedLookup(fetch_batch, 50, 0)
+        first = asyncio.ensure_future(lookup.get(['a']))
+        while not lookup.tasks:
+            await asyncio.sleep(0)
+        # Cancelled before it even starts, as when the loop shuts down
+        [batch] = lookup.tasks
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert lookup.pending == {} and lookup.tasks == set()
+        return await asyncio.wait_for(lookup.get(['a']), 1)
+
+    assert asyncio.run(lookups()) == {'a': 'A'}
+    assert calls == [['a']]